@@ -0,0 +1,71 @@
+from time import sleep
+import io
+import timeit
+
+from vertx import Node
+from vertx.access_log import AccessLog, StreamWriter
+
+
+class Endpoint(Node):
+
+    def handle(self, request, response):
+        response.status = 200
+        response.body = b'Hello World'
+        return response
+
+
+class Disk(io.StringIO):
+
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+
+    def flush(self):
+        if self.latency:
+            sleep(self.latency)
+        self.seek(0)
+        self.truncate()
+
+
+class SyncLog(Node):
+
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+
+    def handle(self, request, response):
+        self.stream.write('{} "{} {}" {}\n'.format(request.ip, request.env['REQUEST_METHOD'], request.url, request.user_agent))
+        self.stream.flush()
+        return response
+
+
+def start_response(status, headers):
+    pass
+
+
+def main():
+    env = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': '/', 'QUERY_STRING': '', 'SERVER_NAME': 'localhost', 'SERVER_PORT': '80',
+        'wsgi.url_scheme': 'http', 'REMOTE_ADDR': '127.0.0.1', 'HTTP_HOST': 'localhost', 'HTTP_USER_AGENT': 'bench',
+    }
+    number = 20000
+    for latency in (0, 0.0002):
+        for name in ('none', 'sync', 'AccessLog'):
+            if name == 'none':
+                root = Endpoint()
+            elif name == 'sync':
+                root = SyncLog(Disk(latency))
+                root.link(Endpoint())
+            else:
+                root = AccessLog(StreamWriter(Disk(latency)))
+                root.link(Endpoint())
+            seconds = timeit.timeit(lambda: root(env, start_response), number=number)
+            extra = ''
+            if name == 'AccessLog':
+                root.close()
+                extra = ' ({} written, {} dropped)'.format(root.written, root.dropped)
+            print('{:>4}us flush {:>10}: {:8.2f} us/request{}'.format(int(latency * 1e6), name, seconds / number * 1e6, extra))
+
+
+if __name__ == '__main__':
+    main()
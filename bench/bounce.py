@@ -0,0 +1,54 @@
+import timeit
+
+from vertx import Node
+
+
+class RaiseAuth(Node):
+
+    def handle(self, request, response):
+        response.status = 401
+        raise response
+
+
+class HaltAuth(Node):
+
+    def handle(self, request, response):
+        response.status = 401
+        return response.halt()
+
+
+class Endpoint(Node):
+
+    def handle(self, request, response):
+        response.status = 200
+        return response
+
+
+def build(auth, depth):
+    root = Node()
+    parent = root
+    for _ in range(depth):
+        node = Node()
+        parent.link(node)
+        parent = node
+    parent.link(auth)
+    auth.link(Endpoint())
+    return root
+
+
+def start_response(status, headers):
+    pass
+
+
+def main():
+    env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/'}
+    number = 20000
+    for depth in (0, 10, 50):
+        for name, auth in (('raise', RaiseAuth), ('halt', HaltAuth)):
+            root = build(auth(), depth)
+            seconds = timeit.timeit(lambda: root(env, start_response), number=number)
+            print('depth {:>3} {:>5}: {:8.2f} us/request'.format(depth, name, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import json
+import time
+
+from vertx import Request, Response
+from vertx.compress import Compress, brotli
+
+
+def payload():
+    rows = [{'id': index, 'name': 'product {}'.format(index), 'price': index * 1.5, 'tags': ['a', 'b']} for index in range(20000)]
+    return json.dumps(rows).encode('utf-8')
+
+
+def main():
+    body = payload()
+    encodings = ('gzip', 'deflate', 'br') if brotli else ('gzip', 'deflate')
+    print('payload: {} bytes'.format(len(body)))
+    for encoding in encodings:
+        for level in (1, 6, 9):
+            node = Compress(level=level)
+            request = Request({'HTTP_ACCEPT_ENCODING': encoding})
+            repeat = 5
+            started = time.process_time()
+            for _ in range(repeat):
+                response = Response()
+                response.status = 200
+                response.headers['Content-Type'] = 'application/json'
+                response.body = body
+                response = node.handle(request, response)
+            cpu = (time.process_time() - started) / repeat
+            saved = 1 - len(response.body) / len(body)
+            print('{:>8} level {}: {:7.2f} ms cpu, {:5.1f}% saved'.format(encoding, level, cpu * 1000, saved * 100))
+
+
+if __name__ == '__main__':
+    main()
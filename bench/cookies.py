@@ -0,0 +1,37 @@
+from datetime import datetime
+from http.cookies import SimpleCookie
+from http.client import responses
+import timeit
+
+from vertx import Response
+
+
+def old_set_cookie(key, value, expires):
+    cookie = SimpleCookie({key: value}).get(key).OutputString()
+    return cookie + '; Expires=' + expires.strftime('%a, %d %b %Y %T') + ' GMT; HttpOnly; SameSite=Strict'
+
+
+def old_status(status):
+    return str(status) + ' ' + responses.get(status, '')
+
+
+def main():
+    number = 50000
+    expires = datetime(2030, 1, 1, 12, 0, 0)
+    response = Response()
+    response.status = 200
+    cases = (
+        ('status line (old)', lambda: old_status(200)),
+        ('status line', response._wsgi_status),
+        ('set_cookie (old)', lambda: old_set_cookie('session', 'abc123', expires)),
+        ('set_cookie', lambda: Response().set_cookie('session', 'abc123', expires=expires)),
+        ('set_signed_cookie', lambda: Response().set_signed_cookie('session', 'user:42', 'secret', expires=expires)),
+        ('unset_cookie', lambda: Response().unset_cookie('session')),
+    )
+    for name, case in cases:
+        seconds = timeit.timeit(case, number=number)
+        print('{:>18}: {:8.2f} us/call'.format(name, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from wsgiref.util import FileWrapper
+
+from vertx import Response
+
+
+class SendfileWrapper(FileWrapper):
+
+    def sendfile(self, fd):
+        offset = 0
+        while True:
+            sent = os.sendfile(fd, self.filelike.fileno(), offset, self.blksize)
+            if not sent:
+                break
+            offset += sent
+        self.close()
+
+
+def run(mode, path):
+    response = Response()
+    response.file(path)
+    started = time.perf_counter()
+    total = 0
+    with open(os.devnull, 'wb') as sink:
+        if mode == 'sendfile':
+            body = response.wsgi(lambda status, headers: None, {'wsgi.file_wrapper': SendfileWrapper})
+            body.sendfile(sink.fileno())
+            total = os.stat(path).st_size
+        else:
+            env = {'wsgi.file_wrapper': FileWrapper} if mode == 'file_wrapper' else {}
+            for chunk in response.wsgi(lambda status, headers: None, env):
+                sink.write(chunk)
+                total += len(chunk)
+    seconds = time.perf_counter() - started
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print('{:>12}: {:8.1f} MiB/s, peak rss {:6.1f} MiB'.format(mode, total / seconds / 1024 ** 2, rss))
+
+
+def main(size):
+    with tempfile.NamedTemporaryFile() as tmpfile:
+        tmpfile.truncate(size)
+        for mode in ('generator', 'file_wrapper', 'sendfile'):
+            subprocess.run([sys.executable, '-m', 'bench.file', mode, tmpfile.name], check=True)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        run(sys.argv[1], sys.argv[2])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 2 * 1024 ** 3)
@@ -0,0 +1,48 @@
+import timeit
+
+from vertx import Node, Response
+
+
+def health():
+    response = Response()
+    response.status = 200
+    response.headers['Content-Type'] = 'application/json'
+    response.body = b'{"status": "ok"}'
+    return response
+
+
+HEALTH = health().freeze()
+
+
+class Built(Node):
+
+    def handle(self, request, response):
+        response.status = 200
+        response.headers['Content-Type'] = 'application/json'
+        response.body = b'{"status": "ok"}'
+        return response
+
+
+class Frozen(Node):
+
+    def handle(self, request, response):
+        return HEALTH
+
+
+def start_response(status, headers):
+    pass
+
+
+def main():
+    env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/health'}
+    number = 50000
+    for name, node in (('built', Built()), ('frozen', Frozen())):
+        seconds = timeit.timeit(lambda: node(env, start_response), number=number)
+        print('{:>6}: {:8.2f} us/request'.format(name, seconds / number * 1e6))
+    for name, response in (('built', health()), ('frozen', HEALTH)):
+        seconds = timeit.timeit(lambda: response.wsgi(start_response), number=number)
+        print('{:>6} wsgi(): {:8.2f} us/call'.format(name, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
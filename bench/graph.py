@@ -0,0 +1,31 @@
+from collections import deque
+import timeit
+
+from vertx import Node
+
+
+def build(count, fan_out):
+    root = Node()
+    parents = deque([root])
+    created = 1
+    while created < count:
+        parent = parents.popleft()
+        for index in range(min(fan_out, count - created)):
+            child = Node()
+            parent.link(child)
+            parents.append(child)
+            created += 1
+    return root
+
+
+def main():
+    for count in (100, 1000, 10000, 50000):
+        for fan_out in (2, 10):
+            seconds = timeit.timeit(lambda: build(count, fan_out).compile(), number=1)
+            summary = build(count, fan_out).compile().graph.summary()
+            print('{:>6} nodes, fan-out {:>2}, depth {:>2}: {:8.2f} ms boot, {:8.2f} ms analysis'.format(
+                summary['nodes'], summary['fan_out'], summary['depth'], seconds * 1e3, summary['seconds'] * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import timeit
+
+from vertx import Request, Response
+from vertx.case_insensitive_dict import CaseInsensitiveDict
+
+ENV = {'HTTP_X_HEADER_{}'.format(index): 'value {}'.format(index) for index in range(40)}
+ENV.update({
+    'REQUEST_METHOD': 'GET',
+    'PATH_INFO': '/',
+    'HTTP_HOST': 'localhost:8000',
+    'HTTP_ACCEPT': 'text/html',
+    'HTTP_AUTHORIZATION': 'Bearer abc',
+    'HTTP_USER_AGENT': 'bench',
+})
+
+
+def scanned_headers(env):
+    headers = CaseInsensitiveDict()
+    for key, value in env.items():
+        if key.startswith('HTTP_'):
+            headers[key[5:].lower().replace('_', '-')] = value
+    return headers
+
+
+def old_request():
+    headers = scanned_headers(ENV)
+    return headers['Authorization'], headers['Accept'], headers['Host']
+
+
+def new_request():
+    headers = Request(ENV).headers
+    return headers['Authorization'], headers['Accept'], headers['Host']
+
+
+def old_response():
+    headers = CaseInsensitiveDict()
+    for index in range(10):
+        headers['X-Header-{}'.format(index)] = 'value'
+    return list(headers.items())
+
+
+def new_response():
+    response = Response()
+    for index in range(10):
+        response.headers['X-Header-{}'.format(index)] = 'value'
+    return response._wsgi_headers()
+
+
+def main():
+    number = 20000
+    for name, function in (('request (scan)', old_request), ('request (environ)', new_request),
+                           ('response (dict)', old_response), ('response (headers)', new_response)):
+        seconds = timeit.timeit(function, number=number)
+        print('{:>20}: {:8.2f} us/op'.format(name, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
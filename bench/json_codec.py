@@ -0,0 +1,55 @@
+import json
+import time
+
+from vertx import Response
+from vertx import json_codec
+
+
+def payload(size):
+    row = {'id': 1, 'name': 'product', 'price': 9.99, 'tags': ['a', 'b', 'c']}
+    count = max(size // len(json.dumps(row)), 1)
+    return [dict(row, id=index) for index in range(count)]
+
+
+def best(function, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def old_response(data):
+    response = Response()
+    response.body = json.dumps(data)
+    return response
+
+
+def new_response(data):
+    return Response().json(data)
+
+
+def stream_response(data):
+    return b''.join(Response().json_stream(iter(data)).chunks())
+
+
+def main():
+    print('codec: {}'.format('orjson' if json_codec.orjson else 'json'))
+    for label, size in (('1 KB', 1024), ('100 KB', 100 * 1024), ('1 MB', 1024 ** 2), ('10 MB', 10 * 1024 ** 2), ('50 MB', 50 * 1024 ** 2)):
+        data = payload(size)
+        encoded = json.dumps(data).encode('utf-8')
+        repeat = 3 if size > 1024 ** 2 else 50
+        timings = (
+            best(lambda: old_response(data), repeat),
+            best(lambda: new_response(data), repeat),
+            best(lambda: stream_response(data), repeat),
+            best(lambda: json.loads(encoded), repeat),
+            best(lambda: json_codec.loads(encoded), repeat),
+        )
+        print('{:>6}: dumps+body {:9.3f} ms, json() {:9.3f} ms, json_stream() {:9.3f} ms, '
+              'json.loads {:9.3f} ms, codec loads {:9.3f} ms'.format(label, *[timing * 1000 for timing in timings]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+from time import perf_counter
+import gc
+import tracemalloc
+
+from vertx import Node
+
+
+class Hello(Node):
+
+    def handle(self, request, response):
+        response.status = 200
+        response.headers['Content-Type'] = 'text/plain'
+        response.body = b'Hello World'
+        return response
+
+
+class Pooled(Hello):
+
+    pool_size = 16
+
+
+class Bounce(Node):
+
+    def handle(self, request, response):
+        response.status = 401
+        raise response
+
+
+class PooledBounce(Bounce):
+
+    pool_size = 16
+
+
+def start_response(status, headers):
+    pass
+
+
+class GcTimer(object):
+
+    def __init__(self):
+        self.collections = 0
+        self.seconds = 0.0
+        self._start = None
+
+    def __call__(self, phase, info):
+        if phase == 'start':
+            self._start = perf_counter()
+        elif self._start is not None:
+            self.collections += 1
+            self.seconds += perf_counter() - self._start
+
+
+def main():
+    env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/', 'SERVER_NAME': 'localhost', 'SERVER_PORT': '80'}
+    number = 200000
+    for name, app in (('hello', Hello()), ('hello pooled', Pooled()), ('bounce', Bounce()), ('bounce pooled', PooledBounce())):
+        app(env, start_response)
+        timer = GcTimer()
+        gc.collect()
+        gc.callbacks.append(timer)
+        try:
+            start = perf_counter()
+            for _ in range(number):
+                app(env, start_response)
+            seconds = perf_counter() - start
+        finally:
+            gc.callbacks.remove(timer)
+        tracemalloc.start()
+        peak = 0
+        for _ in range(1000):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            app(env, start_response)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+        tracemalloc.stop()
+        print('{:>13}: {:6.2f} us/request, {:5} peak bytes/request, {:5} gc runs, {:7.2f} ms in gc'.format(
+            name, seconds / number * 1e6, peak, timer.collections, timer.seconds * 1e3))
+
+
+if __name__ == '__main__':
+    main()
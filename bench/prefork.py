@@ -0,0 +1,50 @@
+import gc
+import os
+
+from vertx import Node
+from vertx.prefork import warm_up, memory, format_memory
+
+
+class Endpoint(Node):
+
+    def handle(self, request, response):
+        response.status = 200
+        return response
+
+
+def build(count):
+    root = Node()
+    for index in range(count):
+        endpoint = Endpoint()
+        endpoint.http_method = 'get'
+        endpoint.http_path = '/items/{}'.format(index)
+        endpoint.payload = [str(index) * 10 for _ in range(20)]
+        root.link(endpoint)
+    return root
+
+
+def child(app):
+    before = memory().get('private_dirty', 0)
+    for index in range(0, 20000, 97):
+        for chunk in app({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/items/{}'.format(index)}, lambda status, headers: None):
+            pass
+    gc.collect()
+    after = memory().get('private_dirty', 0)
+    print('  worker private dirty grew by {:.1f}MB'.format((after - before) / 1024 ** 2))
+    os._exit(0)
+
+
+def main():
+    for freeze in (False, True):
+        app = build(20000)
+        report = warm_up(app, freeze=freeze)
+        print('freeze={}: warm up {:.1f}ms, {}'.format(freeze, report['seconds'] * 1e3, format_memory(report['memory'])))
+        pid = os.fork()
+        if pid == 0:
+            child(app)
+        os.waitpid(pid, 0)
+        gc.unfreeze()
+
+
+if __name__ == '__main__':
+    main()
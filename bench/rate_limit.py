@@ -0,0 +1,19 @@
+import timeit
+
+from vertx import Request
+from vertx.rate_limit import RateLimit, SharedTable
+
+
+def main():
+    number = 100000
+    table = SharedTable()
+    seconds = timeit.timeit(lambda: table.take('203.0.113.1', 1e9, 1e9), number=number)
+    print('{:>22}: {:8.2f} us/op'.format('SharedTable.take', seconds / number * 1e6))
+    limit = RateLimit(1e9, table=table)
+    request = Request({'REMOTE_ADDR': '203.0.113.1'})
+    seconds = timeit.timeit(lambda: limit.submit(request), number=number)
+    print('{:>22}: {:8.2f} us/op'.format('RateLimit.submit', seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
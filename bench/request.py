@@ -0,0 +1,36 @@
+import timeit
+
+from vertx import Request
+
+ENV = {
+    'REQUEST_METHOD': 'GET',
+    'PATH_INFO': '/dashboard/products',
+    'QUERY_STRING': 'page=1&order=price',
+    'HTTP_HOST': 'localhost:8000',
+    'HTTP_X_FORWARDED_FOR': '203.0.113.195, 70.41.3.18',
+    'REMOTE_ADDR': '127.0.0.1',
+    'wsgi.url_scheme': 'http',
+}
+
+
+def construct():
+    return Request(ENV)
+
+
+def access():
+    request = Request(ENV)
+    for _ in range(5):
+        request.url
+        request.base_url
+        request.ip
+
+
+def main():
+    number = 100000
+    for name, function in (('construct', construct), ('5x url/base_url/ip', access)):
+        seconds = timeit.timeit(function, number=number)
+        print('{:>20}: {:8.3f} us/op'.format(name, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import timeit
+
+from vertx import Node
+
+
+class Endpoint(Node):
+
+    def handle(self, request, response):
+        response.status = 200
+        return response
+
+
+def build(count):
+    root = Node()
+    for index in range(count):
+        endpoint = Endpoint()
+        endpoint.http_method = 'get'
+        endpoint.http_path = '/items/{}'.format(index) if index % 2 else '/items/{}/{{id}}'.format(index)
+        root.link(endpoint)
+    return root
+
+
+def start_response(status, headers):
+    pass
+
+
+def main():
+    for count in (1, 10, 100, 300, 1000):
+        root = build(count)
+        env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/items/{}'.format(count - 1 if count > 1 else 0)}
+        number = 5000
+        seconds = timeit.timeit(lambda: root(env, start_response), number=number)
+        print('{:>5} nodes: {:8.2f} us/request'.format(count, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+from tempfile import TemporaryDirectory
+import os
+import timeit
+
+from vertx import Node
+from vertx.static import StaticFiles
+
+
+class FileNode(Node):
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+
+    def handle(self, request, response):
+        response.file(os.path.join(self.directory, request.env['PATH_INFO'][1:]), request=request)
+        return response
+
+
+def start_response(status, headers):
+    pass
+
+
+def consume(app, env):
+    for chunk in app(dict(env), start_response):
+        pass
+
+
+def main():
+    number = 20000
+    with TemporaryDirectory() as directory:
+        for name, size in (('small.css', 4 * 1024), ('large.bin', 1024 ** 2)):
+            with open(os.path.join(directory, name), 'wb') as f:
+                f.write(os.urandom(size))
+            env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/' + name}
+            for label, app in (('Response.file', FileNode(directory)), ('StaticFiles', StaticFiles(directory))):
+                seconds = timeit.timeit(lambda: consume(app, env), number=number)
+                print('{:>10} {:>14}: {:8.2f} us/request'.format(name, label, seconds / number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
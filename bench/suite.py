@@ -0,0 +1,243 @@
+from tempfile import NamedTemporaryFile
+from time import perf_counter_ns
+import argparse
+import json
+import os
+import platform
+import sys
+import tracemalloc
+
+from vertx import Node
+
+
+class Hello(Node):
+
+    def handle(self, request, response):
+        response.status = 200
+        response.headers['Content-Type'] = 'text/plain'
+        response.body = b'Hello World'
+        return response
+
+
+class Pass(Node):
+    pass
+
+
+class Route(Node):
+
+    def __init__(self, index):
+        super().__init__()
+        self.http_method = 'get'
+        self.http_path = '/items/{}/{{id}}'.format(index)
+
+    def handle(self, request, response):
+        response.status = 200
+        response.body = request.params['id']
+        return response
+
+
+class Headers(Node):
+
+    def handle(self, request, response):
+        for name in ('Accept', 'Accept-Language', 'User-Agent', 'X-Request-Id', 'X-Missing'):
+            request.headers.get(name)
+        request.ip
+        request.url
+        response.status = 200
+        for index in range(10):
+            response.headers['X-Header-{}'.format(index)] = str(index)
+        return response
+
+
+class Cookies(Node):
+
+    def handle(self, request, response):
+        response.status = 200
+        response.body = request.cookies.get('session', '')
+        response.set_cookie('seen', '1')
+        return response
+
+
+class File(Node):
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    def handle(self, request, response):
+        response.file(self.path, request=request)
+        return response
+
+
+class Auth(Node):
+
+    def handle(self, request, response):
+        response.status = 401
+        raise response
+
+
+def environ(path='/', **headers):
+    env = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '8000',
+        'REMOTE_ADDR': '127.0.0.1',
+        'wsgi.url_scheme': 'http',
+    }
+    for name, value in headers.items():
+        env['HTTP_' + name.upper()] = value
+    return env
+
+
+def chain(depth, leaf):
+    root = parent = Node()
+    for _ in range(depth):
+        node = Pass()
+        parent.link(node)
+        parent = node
+    parent.link(leaf)
+    return root
+
+
+def wide(width):
+    root = Node()
+    for index in range(width):
+        root.link(Route(index))
+    return root
+
+
+def bounces(count):
+    root = Node()
+    for _ in range(count):
+        auth = Auth()
+        auth.link(Hello())
+        root.link(auth)
+    return root
+
+
+def scenarios(file_path):
+    return {
+        'hello': (Hello(), environ()),
+        'deep': (chain(50, Hello()), environ()),
+        'wide': (wide(500), environ('/items/499/7')),
+        'headers': (Headers(), environ(
+            '/dashboard', accept='text/html', accept_language='en-US,en;q=0.9', user_agent='Mozilla/5.0',
+            x_request_id='abc', x_forwarded_for='203.0.113.195, 70.41.3.18', host='example.com')),
+        'cookies': (Cookies(), environ(cookie='; '.join('c{}=value{}'.format(i, i) for i in range(20)) + '; session=abc')),
+        'file': (File(file_path), environ('/file')),
+        'bounce': (bounces(20), environ()),
+    }
+
+
+def start_response(status, headers, exc_info=None):
+    pass
+
+
+def call(app, env):
+    body = app(dict(env), start_response)
+    for chunk in body:
+        pass
+    close = getattr(body, 'close', None)
+    if close is not None:
+        close()
+
+
+def measure(app, env, number, warmup):
+    for _ in range(warmup):
+        call(app, env)
+    timings = []
+    for _ in range(number):
+        start = perf_counter_ns()
+        call(app, env)
+        timings.append(perf_counter_ns() - start)
+    timings.sort()
+    total = sum(timings)
+    tracemalloc.start()
+    try:
+        peak = 0
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(min(number, 1000)):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            call(app, env)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return {
+        'ops_per_sec': number / (total / 1e9),
+        'mean_us': total / number / 1e3,
+        'p50_us': percentile(timings, 50) / 1e3,
+        'p90_us': percentile(timings, 90) / 1e3,
+        'p99_us': percentile(timings, 99) / 1e3,
+        'peak_bytes': peak,
+        'retained_bytes': retained,
+    }
+
+
+def percentile(timings, value):
+    return timings[min(len(timings) - 1, len(timings) * value // 100)]
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            continue
+        change = (result['ops_per_sec'] - base['ops_per_sec']) / base['ops_per_sec'] * 100
+        result['change_percent'] = change
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+def report(results):
+    print('{:>10} {:>12} {:>9} {:>9} {:>9} {:>11} {:>10} {:>8}'.format(
+        'scenario', 'ops/sec', 'p50 us', 'p90 us', 'p99 us', 'peak bytes', 'retained', 'change'))
+    for name, result in results.items():
+        change = result.get('change_percent')
+        print('{:>10} {:>12.0f} {:>9.2f} {:>9.2f} {:>9.2f} {:>11} {:>10} {:>8}'.format(
+            name, result['ops_per_sec'], result['p50_us'], result['p90_us'], result['p99_us'],
+            result['peak_bytes'], result['retained_bytes'], '' if change is None else '{:+.1f}%'.format(change)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='run/bench', description='Benchmark the full wsgi request lifecycle.')
+    parser.add_argument('scenarios', nargs='*', help='scenarios to run (default: all)')
+    parser.add_argument('-n', '--number', type=int, default=5000, help='measured requests per scenario')
+    parser.add_argument('--warmup', type=int, default=500, help='unmeasured requests per scenario')
+    parser.add_argument('--save', metavar='FILE', help='write results as a json baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare results with a json baseline')
+    parser.add_argument('--threshold', type=float, default=10.0, help='ops/sec drop (percent) counted as a regression')
+    args = parser.parse_args(argv)
+    with NamedTemporaryFile(suffix='.bin') as f:
+        f.write(os.urandom(4 * 1024 ** 2))
+        f.flush()
+        available = scenarios(f.name)
+        names = args.scenarios or list(available)
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            parser.error('unknown scenarios: ' + ', '.join(unknown))
+        results = {}
+        for name in names:
+            app, env = available[name]
+            results[name] = measure(app, env, args.number, args.warmup)
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+    report(results)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(), 'number': args.number, 'results': results}, f, indent=2)
+    if regressions:
+        print('regressions: ' + ', '.join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+from tempfile import TemporaryDirectory
+from threading import Event
+from unittest import TestCase
+import asyncio
+import io
+import json
+import os
+import socket
+
+from vertx import Node, Request, Response
+from vertx.access_log import AccessLog, SyslogWriter
+
+
+ENV = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': '/users', 'QUERY_STRING': 'page=2', 'SERVER_PROTOCOL': 'HTTP/1.1',
+    'REMOTE_ADDR': '203.0.113.7', 'HTTP_USER_AGENT': 'curl/8.0', 'HTTP_REFERER': 'http://example.com/',
+}
+
+
+class Collector(object):
+
+    def __init__(self):
+        self.lines = []
+
+    def write_lines(self, lines):
+        self.lines.extend(lines)
+
+
+class Ok(Node):
+
+    def handle(self, request, response):
+        response.status = 200
+        response.body = 'hello'
+        return response
+
+
+def logged(format='common', node=None, env=ENV, **kwargs):
+    collector = Collector()
+    log = AccessLog(collector, format, **kwargs)
+    log.link(node or Ok())
+    try:
+        log.submit(Request(dict(env)))
+    except Response:
+        pass
+    log.close()
+    return log, collector.lines
+
+
+class AccessLogTestCase(TestCase):
+
+    def test_common_format(self):
+        log, lines = logged()
+        self.assertRegex(lines[0], r'^203\.0\.113\.7 - - \[\d\d/\w{3}/\d{4}:\d\d:\d\d:\d\d \+0000\] "GET /users\?page=2 HTTP/1\.1" 200 5$')
+
+    def test_combined_format(self):
+        log, lines = logged('combined')
+        self.assertTrue(lines[0].endswith(' 200 5 "http://example.com/" "curl/8.0"'))
+
+    def test_json_format_includes_duration(self):
+        log, lines = logged('json')
+        record = json.loads(lines[0])
+        self.assertEqual(record['status'], 200)
+        self.assertEqual(record['bytes'], 5)
+        self.assertEqual(record['path'], '/users')
+        self.assertGreaterEqual(record['duration_ms'], 0)
+
+    def test_bounced_responses_are_logged_and_reraised(self):
+        class Forbidden(Node):
+            def handle(self, request, response):
+                response.status = 403
+                raise response
+        log, lines = logged(node=Forbidden())
+        self.assertIn('" 403 0', lines[0])
+
+    def test_errors_are_logged_as_500(self):
+        class Broken(Node):
+            def handle(self, request, response):
+                raise ValueError('boom')
+        collector = Collector()
+        log = AccessLog(collector)
+        log.link(Broken())
+        with self.assertRaises(ValueError):
+            log.submit(Request(dict(ENV)))
+        log.close()
+        self.assertIn('" 500 -', collector.lines[0])
+
+    def test_streamed_bodies_have_unknown_size(self):
+        class Stream(Node):
+            def handle(self, request, response):
+                response.status = 200
+                response.body = iter([b'a'])
+                return response
+        log, lines = logged(node=Stream())
+        self.assertTrue(lines[0].endswith('" 200 -'))
+
+    def test_full_queue_drops_and_counts(self):
+        started, release = Event(), Event()
+        class Slow(Collector):
+            def write_lines(self, lines):
+                started.set()
+                release.wait(5)
+                super().write_lines(lines)
+        writer = Slow()
+        log = AccessLog(writer, max_queue=2, batch_size=1)
+        log.link(Ok())
+        log.submit(Request(dict(ENV)))
+        started.wait(5)
+        for _ in range(5):
+            log.submit(Request(dict(ENV)))
+        self.assertEqual(log.dropped, 3)
+        release.set()
+        log.close()
+        self.assertEqual(len(writer.lines), 3)
+        self.assertEqual(log.written, 3)
+
+    def test_sampling(self):
+        collector = Collector()
+        log = AccessLog(collector, sample=0.0)
+        log.submit(Request(dict(ENV)))
+        self.assertIsNone(log._thread)
+        self.assertEqual(collector.lines, [])
+
+    def test_writer_errors_are_counted(self):
+        class Failing(object):
+            def write_lines(self, lines):
+                raise OSError('disk full')
+        log = AccessLog(Failing())
+        log.submit(Request(dict(ENV)))
+        log.close()
+        self.assertEqual(log.errors, 1)
+
+    def test_file_and_stream_outputs(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'access.log')
+            log = AccessLog(path)
+            log.submit(Request(dict(ENV)))
+            log.close()
+            self.assertTrue(log.writer.stream.closed)
+            with open(path) as f:
+                self.assertIn('"GET /users?page=2 HTTP/1.1" 404 0', f.read())
+        stream = io.StringIO()
+        log = AccessLog(stream)
+        log.submit(Request(dict(ENV)))
+        log.close()
+        self.assertEqual(stream.getvalue().count('\n'), 1)
+
+    def test_async_entry_point(self):
+        collector = Collector()
+        log = AccessLog(collector)
+        log.link(Ok())
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+        async def send(message):
+            pass
+        scope = {'type': 'http', 'method': 'GET', 'path': '/async', 'headers': [], 'client': ('198.51.100.1', 1234)}
+        asyncio.run(log.asgi(scope, receive, send))
+        log.close()
+        self.assertIn('"GET /async', collector.lines[0])
+        self.assertIn('" 200 5', collector.lines[0])
+
+    def test_syslog_writer_sends_datagrams(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(server.close)
+        server.bind(('127.0.0.1', 0))
+        server.settimeout(5)
+        writer = SyslogWriter(server.getsockname())
+        self.addCleanup(writer.close)
+        writer.write_lines(['a', 'b'])
+        self.assertEqual(server.recv(1024), b'<134>vertx: a')
+        self.assertEqual(server.recv(1024), b'<134>vertx: b')
+
+    def test_close_closes_the_writer(self):
+        writer = SyslogWriter(('127.0.0.1', 9))
+        log = AccessLog(writer)
+        log.close()
+        self.assertEqual(writer.socket.fileno(), -1)
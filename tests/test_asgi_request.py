@@ -0,0 +1,126 @@
+from unittest import TestCase
+import asyncio
+
+from vertx import AsgiRequest, Response
+from vertx.exceptions import BodyNotRead
+
+
+def mock_scope():
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': 'POST',
+        'scheme': 'https',
+        'path': '/dashboard/products',
+        'root_path': '',
+        'query_string': b'page=1&order=price',
+        'headers': [
+            (b'host', b'myserver.com:8080'),
+            (b'content-type', b'application/json'),
+            (b'x-forwarded-for', b'203.0.113.195'),
+            (b'accept', b'text/html'),
+            (b'accept', b'application/json'),
+        ],
+        'client': ('127.0.0.1', 54130),
+        'server': ('127.0.0.1', 8000),
+    }
+
+
+def mock_receive(*chunks):
+    messages = [{'type': 'http.request', 'body': chunk, 'more_body': True} for chunk in chunks]
+    messages.append({'type': 'http.request', 'body': b'', 'more_body': False})
+    messages = iter(messages)
+    async def receive():
+        return next(messages)
+    return receive
+
+
+class AsgiRequestTestCase(TestCase):
+
+    def test_request_properties_come_from_the_scope(self):
+        request = AsgiRequest(mock_scope(), mock_receive())
+        self.assertEqual(request.method, 'POST')
+        self.assertEqual(request.url, 'https://myserver.com:8080/dashboard/products?page=1&order=price')
+        self.assertEqual(request.query, {'page': '1', 'order': 'price'})
+        self.assertEqual(request.ip, '203.0.113.195')
+
+    def test_headers_come_from_the_scope(self):
+        request = AsgiRequest(mock_scope(), mock_receive())
+        self.assertEqual(request.headers['Host'], 'myserver.com:8080')
+        self.assertEqual(request.env['CONTENT_TYPE'], 'application/json')
+
+    def test_repeated_headers_are_joined(self):
+        request = AsgiRequest(mock_scope(), mock_receive())
+        self.assertEqual(request.headers['accept'], 'text/html,application/json')
+
+    def test_repeated_cookie_headers_are_joined_as_cookie_pairs(self):
+        scope = mock_scope()
+        scope['headers'] = [(b'cookie', b'a=1'), (b'cookie', b'b=2')]
+        request = AsgiRequest(scope, mock_receive())
+        self.assertEqual(request.cookies, {'a': '1', 'b': '2'})
+
+    def test_body_must_be_read_before_access(self):
+        request = AsgiRequest(mock_scope(), mock_receive(b'hello'))
+        with self.assertRaises(BodyNotRead):
+            request.body
+
+    def test_read_joins_body_chunks(self):
+        request = AsgiRequest(mock_scope(), mock_receive(b'hello ', b'world'))
+        self.assertEqual(asyncio.run(request.read()), b'hello world')
+        self.assertEqual(request.body, b'hello world')
+
+    def test_stream_yields_body_chunks(self):
+        request = AsgiRequest(mock_scope(), mock_receive(b'hello ', b'world'))
+        async def collect():
+            return [chunk async for chunk in request.stream()]
+        self.assertEqual(asyncio.run(collect()), [b'hello ', b'world', b''])
+
+    def test_stream_takes_the_same_arguments_as_the_wsgi_stream(self):
+        request = AsgiRequest(mock_scope(), mock_receive(b'hello ', b'world'))
+        async def collect():
+            return [chunk async for chunk in request.stream(4)]
+        self.assertEqual(b''.join(asyncio.run(collect())), b'hello world')
+
+    def test_read_accepts_a_per_request_body_limit(self):
+        request = AsgiRequest(mock_scope(), mock_receive(b'hello ', b'world'))
+        with self.assertRaises(Response) as context:
+            asyncio.run(request.read(max_body_size=10))
+        self.assertEqual(context.exception.status, 413)
+
+    def test_form_is_parsed_after_the_body_is_read(self):
+        scope = mock_scope()
+        scope['headers'] = [(b'content-type', b'application/x-www-form-urlencoded')]
+        request = AsgiRequest(scope, mock_receive(b'name=jo', b'&tag=a&tag=b'))
+        asyncio.run(request.read())
+        self.assertEqual(request.form['name'], 'jo')
+        self.assertEqual(request.form.get_all('tag'), ['a', 'b'])
+
+    def test_files_are_parsed_after_the_body_is_read(self):
+        scope = mock_scope()
+        scope['headers'] = [(b'content-type', b'multipart/form-data; boundary=xyz')]
+        body = (
+            b'--xyz\r\nContent-Disposition: form-data; name="title"\r\n\r\nhello\r\n'
+            b'--xyz\r\nContent-Disposition: form-data; name="upload"; filename="a.txt"\r\n'
+            b'Content-Type: text/plain\r\n\r\nfile body\r\n--xyz--\r\n'
+        )
+        request = AsgiRequest(scope, mock_receive(body))
+        asyncio.run(request.read())
+        self.assertEqual(request.form['title'], 'hello')
+        upload = request.files['upload']
+        self.addCleanup(upload.close)
+        self.assertEqual(upload.filename, 'a.txt')
+        self.assertEqual(upload.read(), b'file body')
+
+    def test_spool_works_after_the_body_is_read(self):
+        request = AsgiRequest(mock_scope(), mock_receive(b'hello ', b'world'))
+        asyncio.run(request.read())
+        spool = request.spool()
+        self.addCleanup(spool.close)
+        self.assertEqual(spool.read(), b'hello world')
+
+    def test_form_requires_the_body_to_be_read_first(self):
+        scope = mock_scope()
+        scope['headers'] = [(b'content-type', b'application/x-www-form-urlencoded')]
+        request = AsgiRequest(scope, mock_receive(b'name=jo'))
+        with self.assertRaises(BodyNotRead):
+            request.form
@@ -0,0 +1,254 @@
+from tempfile import TemporaryDirectory
+from threading import Thread, Event, Lock
+import time
+from unittest import TestCase
+from unittest.mock import patch
+import asyncio
+
+from vertx import Node, Request, Response
+from vertx.cache import Cache, MemoryBackend, FileBackend
+
+
+class Expensive(Node):
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def handle(self, request, response):
+        self.calls += 1
+        response.status = 200
+        response.headers['Content-Type'] = 'text/plain'
+        response.body = 'result {}'.format(self.calls)
+        return response
+
+
+def env(path='/report', query='', method='GET', **headers):
+    return {'REQUEST_METHOD': method, 'PATH_INFO': path, 'QUERY_STRING': query, **headers}
+
+
+def build(**kwargs):
+    root, cache, expensive = Node(), Cache(**kwargs), Expensive()
+    root.link(cache)
+    cache.link(expensive)
+    return root, cache, expensive
+
+
+class CacheTestCase(TestCase):
+
+    def test_miss_runs_sub_nodes_and_hit_reuses_the_response(self):
+        root, cache, expensive = build()
+        first = root.submit(Request(env()))
+        second = root.submit(Request(env()))
+        self.assertEqual(expensive.calls, 1)
+        self.assertEqual(second.body, b'result 1')
+        self.assertEqual(second.headers['Content-Type'], 'text/plain')
+        self.assertIsNot(first, second)
+
+    def test_hit_is_raised_as_a_bounce(self):
+        root, cache, expensive = build()
+        root.submit(Request(env()))
+        with self.assertRaises(Response) as context:
+            cache.submit(Request(env()))
+        self.assertEqual(context.exception.body, b'result 1')
+
+    def test_cache_can_be_the_wsgi_root(self):
+        cache = Cache()
+        cache.link(Expensive())
+        cache(env(), lambda status, headers: None)
+        body = cache(env(), lambda status, headers: None)
+        self.assertEqual(body, (b'result 1',))
+
+    def test_key_includes_path_query_and_vary_headers(self):
+        root, cache, expensive = build(vary=['Accept-Language'])
+        root.submit(Request(env()))
+        root.submit(Request(env(query='page=2')))
+        root.submit(Request(env(path='/other')))
+        root.submit(Request(env(HTTP_ACCEPT_LANGUAGE='pt-BR')))
+        root.submit(Request(env(HTTP_ACCEPT_LANGUAGE='pt-BR')))
+        self.assertEqual(expensive.calls, 4)
+
+    def test_key_includes_the_host(self):
+        root, cache, expensive = build()
+        root.submit(Request(env(HTTP_HOST='a.example.com')))
+        root.submit(Request(env(HTTP_HOST='b.example.com')))
+        self.assertEqual(expensive.calls, 2)
+
+    def test_responses_varying_on_headers_outside_the_key_are_not_cached(self):
+        root, cache, expensive = build()
+        vary = Node()
+        vary.handle = lambda request, response: response.headers.add('Vary', 'Accept-Encoding') or response
+        expensive.link(vary)
+        root.submit(Request(env()))
+        root.submit(Request(env()))
+        self.assertEqual(expensive.calls, 2)
+
+    def test_responses_varying_on_key_headers_are_cached(self):
+        root, cache, expensive = build(vary=['Accept-Encoding'])
+        vary = Node()
+        vary.handle = lambda request, response: response.headers.add('Vary', 'accept-encoding') or response
+        expensive.link(vary)
+        root.submit(Request(env()))
+        root.submit(Request(env()))
+        self.assertEqual(expensive.calls, 1)
+
+    def test_unsafe_methods_are_not_cached(self):
+        root, cache, expensive = build()
+        root.submit(Request(env(method='POST')))
+        root.submit(Request(env(method='POST')))
+        self.assertEqual(expensive.calls, 2)
+
+    def test_responses_with_cookies_or_no_store_are_not_cached(self):
+        root, cache, expensive = build()
+        cookie = Node()
+        cookie.handle = lambda request, response: response.set_cookie('a', 'b') or response
+        expensive.link(cookie)
+        root.submit(Request(env()))
+        root.submit(Request(env()))
+        self.assertEqual(expensive.calls, 2)
+
+    def test_uncacheable_statuses_are_not_cached(self):
+        root, cache, expensive = build()
+        missing = Node()
+        missing.handle = lambda request, response: setattr(response, 'status', 404) or response
+        expensive.link(missing)
+        root.submit(Request(env()))
+        root.submit(Request(env()))
+        self.assertEqual(expensive.calls, 2)
+
+    def test_concurrent_misses_compute_once(self):
+        started, release = Event(), Event()
+        class Slow(Expensive):
+            def handle(self, request, response):
+                started.set()
+                release.wait(5)
+                return super().handle(request, response)
+        root, cache, slow = Node(), Cache(), Slow()
+        root.link(cache)
+        cache.link(slow)
+        bodies = []
+        threads = [Thread(target=lambda: bodies.append(root.submit(Request(env())).body)) for _ in range(4)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(slow.calls, 1)
+        self.assertEqual(bodies, [b'result 1'] * 4)
+
+    def test_concurrent_async_misses_compute_once(self):
+        class Slow(Expensive):
+            async def handle(self, request, response):
+                await asyncio.sleep(0.01)
+                return super().handle(request, response)
+        root, cache, slow = Node(), Cache(), Slow()
+        root.link(cache)
+        cache.link(slow)
+        async def run():
+            return await asyncio.gather(*[root.submit_async(Request(env())) for _ in range(4)])
+        responses = asyncio.run(run())
+        self.assertEqual(slow.calls, 1)
+        self.assertEqual([response.body for response in responses], [b'result 1'] * 4)
+
+    def test_concurrent_uncacheable_misses_run_in_parallel(self):
+        lock, active, peaks = Lock(), [0], []
+        class Private(Expensive):
+            def handle(self, request, response):
+                with lock:
+                    active[0] += 1
+                    peaks.append(active[0])
+                time.sleep(0.05)
+                with lock:
+                    active[0] -= 1
+                response = super().handle(request, response)
+                response.headers['Cache-Control'] = 'private'
+                return response
+        root, cache, private = Node(), Cache(), Private()
+        root.link(cache)
+        cache.link(private)
+        threads = [Thread(target=lambda: root.submit(Request(env()))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(private.calls, 4)
+        self.assertGreater(max(peaks), 1)
+        self.assertEqual(cache._pending, {})
+
+    def test_concurrent_uncacheable_async_misses_run_in_parallel(self):
+        active, peaks = [0], []
+        class Private(Expensive):
+            async def handle(self, request, response):
+                active[0] += 1
+                peaks.append(active[0])
+                await asyncio.sleep(0.01)
+                active[0] -= 1
+                response = super().handle(request, response)
+                response.headers['Cache-Control'] = 'private'
+                return response
+        root, cache, private = Node(), Cache(), Private()
+        root.link(cache)
+        cache.link(private)
+        async def run():
+            return await asyncio.gather(*[root.submit_async(Request(env())) for _ in range(4)])
+        asyncio.run(run())
+        self.assertEqual(private.calls, 4)
+        self.assertEqual(peaks, [1, 1, 2, 3])
+        self.assertEqual(cache._async_pending, {})
+
+
+class MemoryBackendTestCase(TestCase):
+
+    def test_get_and_set(self):
+        backend = MemoryBackend()
+        backend.set('a', (200, [], b'a'), 60)
+        self.assertEqual(backend.get('a'), (200, [], b'a'))
+        self.assertIsNone(backend.get('b'))
+
+    def test_expired_entries_are_dropped(self):
+        backend = MemoryBackend()
+        with patch('vertx.cache.time', return_value=1000):
+            backend.set('a', (200, [], b'a'), 60)
+        with patch('vertx.cache.time', return_value=1061):
+            self.assertIsNone(backend.get('a'))
+        self.assertEqual(backend.size, 0)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        backend = MemoryBackend(max_entries=2)
+        backend.set('a', (200, [], b'a'), 60)
+        backend.set('b', (200, [], b'b'), 60)
+        backend.get('a')
+        backend.set('c', (200, [], b'c'), 60)
+        self.assertIsNotNone(backend.get('a'))
+        self.assertIsNone(backend.get('b'))
+
+    def test_byte_size_limit_evicts_entries(self):
+        backend = MemoryBackend(max_bytes=10)
+        backend.set('a', (200, [], b'123456'), 60)
+        backend.set('b', (200, [], b'123456'), 60)
+        self.assertIsNone(backend.get('a'))
+        self.assertEqual(backend.size, 6)
+
+    def test_entries_larger_than_the_limit_are_skipped(self):
+        backend = MemoryBackend(max_bytes=4)
+        backend.set('a', (200, [], b'123456'), 60)
+        self.assertIsNone(backend.get('a'))
+
+
+class FileBackendTestCase(TestCase):
+
+    def test_entries_are_shared_between_backends_on_the_same_directory(self):
+        with TemporaryDirectory() as directory:
+            FileBackend(directory).set(('GET', '/'), (200, [('A', 'b')], b'a'), 60)
+            self.assertEqual(FileBackend(directory).get(('GET', '/')), (200, [('A', 'b')], b'a'))
+
+    def test_expired_entries_are_removed(self):
+        with TemporaryDirectory() as directory:
+            backend = FileBackend(directory)
+            with patch('vertx.cache.time', return_value=1000):
+                backend.set('a', (200, [], b'a'), 60)
+            with patch('vertx.cache.time', return_value=1061):
+                self.assertIsNone(backend.get('a'))
+            self.assertIsNone(backend.get('a'))
@@ -0,0 +1,147 @@
+from tempfile import NamedTemporaryFile
+from unittest import TestCase
+from unittest.mock import Mock, patch
+import asyncio
+import gzip
+import zlib
+
+from vertx import Request, Response
+from vertx.compress import Compress
+
+
+def compress_response(response, accept_encoding='gzip, deflate', **kwargs):
+    request = Request({'HTTP_ACCEPT_ENCODING': accept_encoding})
+    return Compress(**kwargs).handle(request, response)
+
+
+def text_response(body=b'hello world ' * 100, content_type='text/plain'):
+    response = Response()
+    response.status = 200
+    response.headers['Content-Type'] = content_type
+    response.body = body
+    return response
+
+
+class CompressTestCase(TestCase):
+
+    def test_bytes_body_is_gzipped(self):
+        response = compress_response(text_response())
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['Content-Length'], str(len(response.body)))
+        self.assertEqual(gzip.decompress(response.body), b'hello world ' * 100)
+
+    def test_deflate_is_used_when_gzip_is_not_accepted(self):
+        response = compress_response(text_response(), 'deflate, gzip;q=0')
+        self.assertEqual(response.headers['Content-Encoding'], 'deflate')
+        self.assertEqual(zlib.decompress(response.body), b'hello world ' * 100)
+
+    def test_wildcard_accept_encoding(self):
+        response = compress_response(text_response(), '*')
+        self.assertIn(response.headers['Content-Encoding'], ('br', 'gzip'))
+
+    def test_vary_is_set(self):
+        response = text_response()
+        response.headers['Vary'] = 'Cookie'
+        response = compress_response(response)
+        self.assertEqual(response.headers['Vary'], 'Cookie, Accept-Encoding')
+
+    def test_vary_is_set_even_if_client_does_not_accept_compression(self):
+        response = compress_response(text_response(), '')
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_small_bodies_are_not_compressed(self):
+        response = compress_response(text_response(b'hello'))
+        self.assertEqual(response.body, b'hello')
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_minimum_size_is_configurable(self):
+        response = compress_response(text_response(b'hello'), minimum_size=1)
+        self.assertEqual(gzip.decompress(response.body), b'hello')
+
+    def test_already_compressed_types_are_not_compressed(self):
+        response = compress_response(text_response(content_type='image/png'))
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_svg_is_compressed(self):
+        response = compress_response(text_response(content_type='image/svg+xml'))
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+
+    def test_already_encoded_responses_are_not_compressed(self):
+        response = text_response()
+        response.headers['Content-Encoding'] = 'identity'
+        response = compress_response(response)
+        self.assertEqual(response.body, b'hello world ' * 100)
+
+    def test_not_modified_responses_are_not_compressed(self):
+        response = text_response()
+        response.status = 304
+        response = compress_response(response)
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_empty_bodies_are_not_compressed(self):
+        response = text_response(b'')
+        response.headers['Content-Length'] = '1200'
+        response = compress_response(response)
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(response.headers['Content-Length'], '1200')
+
+    def test_head_requests_are_not_compressed(self):
+        request = Request({'REQUEST_METHOD': 'HEAD', 'HTTP_ACCEPT_ENCODING': 'gzip'})
+        response = Compress().handle(request, text_response())
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_streamed_body_is_compressed_incrementally(self):
+        response = text_response(iter([b'hello ', b'world']))
+        response.headers['Content-Length'] = '11'
+        response = compress_response(response, minimum_size=1)
+        self.assertNotIn('Content-Length', response.headers)
+        self.assertEqual(gzip.decompress(b''.join(response.wsgi(Mock()))), b'hello world')
+
+    def test_file_body_is_compressed_incrementally(self):
+        with NamedTemporaryFile(suffix='.txt') as tmpfile:
+            tmpfile.write(b'hello world ' * 100)
+            tmpfile.flush()
+            response = Response()
+            response.file(tmpfile.name)
+            response.file_chunk_size = 16
+            etag = response.headers['ETag']
+            response = compress_response(response)
+            body = b''.join(response.wsgi(Mock(), {'wsgi.file_wrapper': Mock()}))
+        self.assertEqual(gzip.decompress(body), b'hello world ' * 100)
+        self.assertEqual(response.headers['ETag'], 'W/' + etag)
+        self.assertNotIn('Accept-Ranges', response.headers)
+
+    def test_async_streamed_body_is_compressed(self):
+        async def rows():
+            yield 'hello '
+            yield b'world'
+        response = compress_response(text_response(rows()), minimum_size=1)
+        messages = []
+        async def send(message):
+            messages.append(message)
+        asyncio.run(response.asgi(send))
+        self.assertEqual(gzip.decompress(b''.join(message['body'] for message in messages[1:])), b'hello world')
+
+    def test_brotli_is_preferred_when_installed(self):
+        brotli = Mock()
+        brotli.Compressor.return_value.process.return_value = b'br'
+        brotli.Compressor.return_value.finish.return_value = b'!'
+        with patch('vertx.compress.brotli', brotli):
+            response = compress_response(text_response(), 'gzip, br')
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+        self.assertEqual(response.body, b'br!')
+
+    def test_frozen_responses_are_compressed_once_per_encoding(self):
+        compress = Compress()
+        frozen = text_response().freeze()
+        request = Request({'HTTP_ACCEPT_ENCODING': 'gzip'})
+        first = compress.handle(request, frozen)
+        second = compress.handle(request, frozen)
+        self.assertIs(first, second)
+        self.assertTrue(first.frozen)
+        self.assertEqual(first.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(first.body), frozen.body)
+        identity = compress.handle(Request({'HTTP_ACCEPT_ENCODING': 'identity'}), frozen)
+        self.assertNotIn('Content-Encoding', identity.headers)
+        self.assertEqual(identity.headers['Vary'], 'Accept-Encoding')
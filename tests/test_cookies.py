@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+from http.cookies import CookieError
+from unittest import TestCase
+
+from vertx import Request, Response
+from vertx.cookies import serialize, format_expires, sign, unsign
+
+
+class SerializeTestCase(TestCase):
+
+    def test_safe_values_skip_simple_cookie(self):
+        self.assertEqual(serialize('token', 'abc-123.XYZ'), 'token=abc-123.XYZ')
+
+    def test_values_are_converted_to_strings(self):
+        self.assertEqual(serialize('count', 42), 'count=42')
+
+    def test_unsafe_values_are_quoted(self):
+        self.assertEqual(serialize('token', 'a b'), 'token="a b"')
+        self.assertEqual(serialize('token', ''), 'token=""')
+
+    def test_reserved_and_illegal_keys_are_rejected(self):
+        with self.assertRaises(CookieError):
+            serialize('path', 'abc')
+        with self.assertRaises(CookieError):
+            serialize('to ken', 'abc')
+
+
+class ExpiresTestCase(TestCase):
+
+    def test_expires_format_does_not_depend_on_locale(self):
+        self.assertEqual(format_expires(datetime(2017, 4, 9, 10, 35, 54)), 'Sun, 09 Apr 2017 10:35:54 GMT')
+        self.assertEqual(format_expires(datetime(1970, 1, 1)), 'Thu, 01 Jan 1970 00:00:00 GMT')
+
+    def test_matches_strftime_for_a_range_of_dates(self):
+        start = datetime(2020, 1, 1, 12, 30, 5)
+        for days in range(0, 400, 7):
+            date = start + timedelta(days=days)
+            self.assertEqual(format_expires(date), date.strftime('%a, %d %b %Y %H:%M:%S GMT'))
+
+
+class SignTestCase(TestCase):
+
+    def test_signed_values_round_trip(self):
+        self.assertEqual(unsign(sign('user:42 é', 'secret'), 'secret'), 'user:42 é')
+
+    def test_signed_values_are_cookie_safe(self):
+        self.assertEqual(serialize('session', sign('a;b c', 'secret')).count('"'), 0)
+
+    def test_wrong_secret_or_tampering_is_rejected(self):
+        signed = sign('user:42', 'secret')
+        self.assertIsNone(unsign(signed, 'other'))
+        self.assertIsNone(unsign('x' + signed, 'secret'))
+        self.assertIsNone(unsign('garbage', 'secret'))
+
+    def test_max_age(self):
+        signed = sign('user:42', 'secret', timestamp=1000)
+        self.assertIsNone(unsign(signed, 'secret', max_age=60))
+        self.assertEqual(unsign(signed, 'secret'), 'user:42')
+
+    def test_signed_cookies_on_request_and_response(self):
+        response = Response()
+        response.set_signed_cookie('session', 'user:42', 'secret', http_only=False, same_site=False)
+        request = Request({'HTTP_COOKIE': response.cookies[0]})
+        self.assertEqual(request.signed_cookie('session', 'secret', max_age=60), 'user:42')
+        self.assertIsNone(request.signed_cookie('session', 'other'))
+        self.assertIsNone(request.signed_cookie('missing', 'secret'))
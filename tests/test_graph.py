@@ -0,0 +1,113 @@
+from unittest import TestCase
+
+from vertx import Node
+from vertx.exceptions import BadLink
+from vertx.graph import Graph, reachable
+
+
+def route(method=None, path=None):
+    node = Node()
+    node.http_method = method
+    node.http_path = path
+    return node
+
+
+class Endpoint(Node):
+
+    def __init__(self, body):
+        super().__init__()
+        self.body = body
+
+    def handle(self, request, response):
+        response.status = 200
+        response.body = self.body
+        return response
+
+
+class GraphTestCase(TestCase):
+
+    def test_summary_reports_size_depth_and_fan_out(self):
+        root, a, b, c = Node(), Node(), Node(), route('get', '/c')
+        root.link(a)
+        root.link(b)
+        a.link(c)
+        b.link(c)
+        summary = Graph(root).summary()
+        self.assertEqual(summary['nodes'], 4)
+        self.assertEqual(summary['edges'], 4)
+        self.assertEqual(summary['depth'], 3)
+        self.assertEqual(summary['fan_out'], 2)
+        self.assertEqual(summary['routes'], 1)
+
+    def test_cycles_are_detected(self):
+        a, b, c = Node(), Node(), Node()
+        a.link(b)
+        b.link(c)
+        c.link(b)
+        with self.assertRaises(BadLink) as context:
+            Graph(a)
+        self.assertEqual(str(context.exception), 'A node link must not form a path to itself.')
+
+    def test_shared_sub_nodes_are_not_cycles(self):
+        root, a, b, shared = Node(), Node(), Node(), Node()
+        root.link(a)
+        root.link(b)
+        a.link(shared)
+        b.link(shared)
+        self.assertEqual(len(Graph(root).nodes), 4)
+
+    def test_deep_graphs_do_not_hit_the_recursion_limit(self):
+        root = node = Node()
+        for index in range(5000):
+            child = Node()
+            node.link(child)
+            node = child
+        self.assertEqual(root.compile().graph.depth, 5001)
+
+    def test_reachable_routes(self):
+        self.assertTrue(reachable(route('get', '/users/{id}'), route('get', '/users/me')))
+        self.assertTrue(reachable(route(path='/users'), route('post')))
+        self.assertFalse(reachable(route('get'), route('post', '/users')))
+        self.assertTrue(reachable(route('get'), route('head')))
+        self.assertFalse(reachable(route('get', '/users'), route('get', '/posts')))
+        self.assertFalse(reachable(route('get', '/users/{id}'), route('get', '/users')))
+        self.assertFalse(reachable(route(path='/users/{id}'), route(path='/users/')))
+
+    def test_unreachable_links_are_pruned_on_compile(self):
+        root, users, posts, user = Node(), route('get', '/users/{id}'), route('post', '/posts'), route('get', '/users/me')
+        root.link(users)
+        users.link(posts)
+        users.link(user)
+        root.compile()
+        self.assertEqual(root.graph.unreachable, [(users, posts)])
+        self.assertEqual(users.nodes, [user])
+        self.assertEqual(root.graph.summary()['nodes'], 3)
+
+    def test_shared_handles_are_reported(self):
+        root, a, b, c = Node(), Endpoint('a'), Endpoint('b'), Node()
+        root.link(a)
+        root.link(b)
+        root.link(c)
+        groups = Graph(root).shared_handles()
+        self.assertEqual(sorted(len(group) for group in groups), [2, 2])
+
+    def test_dedupe_merges_equivalent_leaf_nodes(self):
+        root, a, b, c = Node(), Endpoint('a'), Endpoint('a'), Endpoint('c')
+        root.link(a)
+        root.link(b)
+        root.link(c)
+        graph = Graph(root)
+        self.assertEqual(graph.dedupe(), 1)
+        self.assertEqual(root.nodes, [a, a, c])
+        self.assertEqual(graph.summary()['deduped'], 1)
+
+    def test_compile_dedupes_when_enabled(self):
+        root, a, b = Node(), Endpoint('a'), Endpoint('a')
+        root.dedupe_nodes = True
+        root.link(a)
+        root.link(b)
+        root.compile()
+        self.assertEqual(root.nodes, [a, a])
+        statuses = []
+        root({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/'}, lambda status, headers: statuses.append(status))
+        self.assertEqual(statuses, ['200 OK'])
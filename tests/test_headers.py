@@ -0,0 +1,100 @@
+from unittest import TestCase
+
+from vertx.headers import Headers, EnvironHeaders
+
+
+class HeadersTestCase(TestCase):
+
+    def test_can_be_created_without_arguments(self):
+        self.assertEqual(Headers(), {})
+
+    def test_can_be_created_with_dict_or_key_value_tuples(self):
+        self.assertEqual(Headers({'Foo': 'bar'}), {'Foo': 'bar'})
+        self.assertEqual(Headers((('Foo', 'bar'),)), {'Foo': 'bar'})
+
+    def test_keys_can_be_accessed_insensitively(self):
+        headers = Headers()
+        headers['Content-Type'] = 'text/html'
+        self.assertEqual(headers['content-type'], 'text/html')
+        self.assertIn('CONTENT-TYPE', headers)
+
+    def test_setting_a_key_replaces_every_value(self):
+        headers = Headers()
+        headers.add('Link', 'a')
+        headers.add('link', 'b')
+        headers['LINK'] = 'c'
+        self.assertEqual(headers.list(), [('LINK', 'c')])
+
+    def test_multiple_values(self):
+        headers = Headers()
+        headers.add('Link', 'a')
+        headers.add('Link', 'b')
+        self.assertEqual(headers['link'], 'a')
+        self.assertEqual(headers.get_all('LINK'), ['a', 'b'])
+        self.assertEqual(len(headers), 1)
+
+    def test_list_is_the_wsgi_header_list(self):
+        headers = Headers()
+        headers['Content-Type'] = 'text/html'
+        headers.add('Link', 'a')
+        self.assertEqual(headers.list(), [('Content-Type', 'text/html'), ('Link', 'a')])
+        self.assertIs(headers.list(), headers.list())
+
+    def test_can_delete_key_insensitively(self):
+        headers = Headers({'Foo': 'bar', 'Bar': 'foo'})
+        del headers['foo']
+        self.assertEqual(headers.list(), [('Bar', 'foo')])
+
+    def test_pop_and_get(self):
+        headers = Headers({'Foo': 'bar'})
+        self.assertEqual(headers.get('FOO'), 'bar')
+        self.assertIsNone(headers.get('missing'))
+        self.assertEqual(headers.pop('foo'), 'bar')
+        self.assertEqual(headers.pop('foo', None), None)
+        with self.assertRaises(KeyError):
+            headers.pop('foo')
+
+    def test_original_keys_can_be_iterated(self):
+        headers = Headers({'Foo': 'bar', 'Bar': 'foo'})
+        self.assertEqual(sorted(headers), ['Bar', 'Foo'])
+
+    def test_compares_insensitively_against_other_headers(self):
+        self.assertEqual(Headers({'foo': 'bar'}), Headers({'Foo': 'bar'}))
+
+    def test_compares_sensitively_against_regular_dict(self):
+        self.assertNotEqual(Headers({'foo': 'bar'}), {'Foo': 'bar'})
+
+    def test_has_no_instance_dict(self):
+        with self.assertRaises(AttributeError):
+            Headers().foo = 'bar'
+
+
+class EnvironHeadersTestCase(TestCase):
+
+    def test_reads_straight_from_the_environ(self):
+        env = {'HTTP_X_TOKEN': 'abc'}
+        headers = EnvironHeaders(env)
+        self.assertEqual(headers['x-token'], 'abc')
+        env['HTTP_X_TOKEN'] = 'xyz'
+        self.assertEqual(headers['X-Token'], 'xyz')
+
+    def test_content_headers_are_read_without_http_prefix(self):
+        headers = EnvironHeaders({'CONTENT_TYPE': 'text/plain', 'CONTENT_LENGTH': '5'})
+        self.assertEqual(headers['Content-Type'], 'text/plain')
+        self.assertEqual(headers['content-length'], '5')
+
+    def test_iterates_header_names(self):
+        headers = EnvironHeaders({'HTTP_X_TOKEN': 'abc', 'CONTENT_TYPE': 'text/plain', 'PATH_INFO': '/'})
+        self.assertEqual(sorted(headers), ['content-type', 'x-token'])
+        self.assertEqual(len(headers), 2)
+
+    def test_multiple_values(self):
+        headers = EnvironHeaders({'HTTP_ACCEPT': 'text/html, application/json'})
+        self.assertEqual(headers.get_all('Accept'), ['text/html', 'application/json'])
+        self.assertEqual(headers.get_all('Missing'), [])
+
+    def test_get_and_contains(self):
+        headers = EnvironHeaders({'HTTP_X_TOKEN': 'abc'})
+        self.assertEqual(headers.get('X-TOKEN'), 'abc')
+        self.assertIsNone(headers.get('missing'))
+        self.assertIn('x-token', headers)
@@ -0,0 +1,128 @@
+from unittest import TestCase
+from unittest.mock import Mock
+import asyncio
+
+from vertx import Node, Request
+from vertx.instrumentation import Instrumentation, Registry, Metrics
+
+
+class Ok(Node):
+
+    def handle(self, request, response):
+        return response
+
+
+class Bounce(Node):
+
+    def handle(self, request, response):
+        raise response
+
+
+class Halt(Node):
+
+    def handle(self, request, response):
+        return response.halt()
+
+
+class Fail(Node):
+
+    def handle(self, request, response):
+        raise ValueError('failed')
+
+
+class InstrumentationTestCase(TestCase):
+
+    def test_plans_are_not_wrapped_by_default(self):
+        node = Ok()
+        self.assertEqual(node.plan('GET', '/')[0][0], node.handle)
+
+    def test_records_calls_through_the_sink(self):
+        root, a = Ok(), Bounce()
+        root.link(a)
+        sink = Mock()
+        root.instrument(Instrumentation(sink))
+        root.submit(Request({}))
+        outcomes = [(call[0][0], call[0][2]) for call in sink.call_args_list]
+        self.assertEqual(outcomes, [('Ok', 'return'), ('Bounce', 'bounce')])
+
+    def test_records_halts_as_bounces(self):
+        node = Halt()
+        sink = Mock()
+        node.instrument(Instrumentation(sink))
+        node.submit(Request({}))
+        self.assertEqual(sink.call_args[0][2], 'bounce')
+
+    def test_records_exceptions(self):
+        node = Fail()
+        sink = Mock()
+        node.instrument(Instrumentation(sink))
+        with self.assertRaises(ValueError):
+            node.submit(Request({}))
+        self.assertEqual(sink.call_args[0][2], 'error')
+
+    def test_instrumenting_a_compiled_graph_replaces_its_plans(self):
+        root = Ok().compile()
+        root.submit(Request({}))
+        sink = Mock()
+        root.instrument(Instrumentation(sink))
+        root.submit(Request({}))
+        self.assertEqual(sink.call_count, 1)
+        root.instrument(None)
+        root.submit(Request({}))
+        self.assertEqual(sink.call_count, 1)
+
+    def test_trace_lists_visited_nodes_on_the_request(self):
+        root, a, b = Ok(), Bounce(), Ok()
+        root.link(a)
+        a.link(b)
+        root.instrument(Instrumentation(Mock(), trace=True))
+        request = Request({})
+        root.submit(request)
+        self.assertEqual([(name, outcome) for name, seconds, outcome in request.env['vertx.trace']], [
+            ('Ok', 'return'), ('Bounce', 'bounce'),
+        ])
+
+    def test_async_handles_are_timed(self):
+        class Async(Node):
+            async def handle(self, request, response):
+                return response
+        node = Async()
+        sink = Mock()
+        node.instrument(Instrumentation(sink))
+        asyncio.run(node.submit_async(Request({})))
+        self.assertEqual(sink.call_args[0][:1] + sink.call_args[0][2:], ('Async', 'return'))
+
+
+class RegistryTestCase(TestCase):
+
+    def test_aggregates_per_node(self):
+        registry = Registry()
+        registry('Ok', 0.002, 'return')
+        registry('Ok', 0.2, 'bounce')
+        registry('Ok', 0.3, 'error')
+        stats = registry.stats['Ok']
+        self.assertEqual((stats.calls, stats.bounces, stats.errors), (3, 1, 1))
+        self.assertAlmostEqual(stats.seconds, 0.502)
+
+    def test_renders_prometheus_text_format(self):
+        registry = Registry()
+        registry('Ok', 0.002, 'return')
+        text = registry.render()
+        self.assertIn('vertx_node_calls_total{node="Ok"} 1\n', text)
+        self.assertIn('vertx_node_seconds_bucket{node="Ok",le="0.001"} 0\n', text)
+        self.assertIn('vertx_node_seconds_bucket{node="Ok",le="0.005"} 1\n', text)
+        self.assertIn('vertx_node_seconds_bucket{node="Ok",le="+Inf"} 1\n', text)
+        self.assertIn('vertx_node_seconds_count{node="Ok"} 1\n', text)
+
+
+class MetricsTestCase(TestCase):
+
+    def test_metrics_node_serves_the_registry(self):
+        registry = Registry()
+        root = Node()
+        root.link(Metrics(registry))
+        root.instrument(Instrumentation(registry))
+        start_response = Mock()
+        body = root({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/metrics'}, start_response)
+        self.assertEqual(start_response.call_args[0][0], '200 OK')
+        self.assertIn(b'vertx_node_calls_total{node="Node"} 1', body[0])
@@ -0,0 +1,29 @@
+from unittest import TestCase
+from unittest.mock import patch
+import json
+
+from vertx import json_codec
+
+
+class JsonCodecTestCase(TestCase):
+
+    def test_dumps_returns_compact_utf8_bytes(self):
+        self.assertEqual(json_codec.std_dumps({'name': 'João', 'tags': [1, 2]}), '{"name":"João","tags":[1,2]}'.encode('utf-8'))
+
+    def test_default_codec_roundtrips(self):
+        data = {'a': [1, 2.5, None, True], 'b': 'ç'}
+        self.assertEqual(json_codec.loads(json_codec.dumps(data)), data)
+
+    def test_codec_can_be_swapped(self):
+        with patch.multiple(json_codec, dumps=json_codec.dumps, loads=json_codec.loads):
+            json_codec.use(dumps=lambda value: b'dumped', loads=lambda data: 'loaded')
+            self.assertEqual(json_codec.dumps({}), b'dumped')
+            self.assertEqual(json_codec.loads(b'{}'), 'loaded')
+
+    def test_iter_array_streams_a_json_array(self):
+        chunks = list(json_codec.iter_array(({'id': index} for index in range(100)), chunk_size=64))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(json.loads(b''.join(chunks)), [{'id': index} for index in range(100)])
+
+    def test_iter_array_of_nothing(self):
+        self.assertEqual(b''.join(json_codec.iter_array([])), b'[]')
@@ -0,0 +1,34 @@
+from unittest import TestCase
+
+from vertx.multi_dict import MultiDict
+
+
+class MultiDictTestCase(TestCase):
+
+    def test_behaves_as_a_dict_with_the_last_value(self):
+        data = MultiDict([('a', '1'), ('b', '2'), ('a', '3')])
+        self.assertEqual(data, {'a': '3', 'b': '2'})
+        self.assertEqual(data['a'], '3')
+
+    def test_keeps_every_value(self):
+        data = MultiDict([('a', '1'), ('b', '2'), ('a', '3')])
+        self.assertEqual(data.get_all('a'), ['1', '3'])
+        self.assertEqual(data.get_all('missing'), [])
+        self.assertEqual(data.lists(), [('a', ['1', '3']), ('b', ['2'])])
+
+    def test_setting_a_key_replaces_every_value(self):
+        data = MultiDict([('a', '1'), ('a', '2')])
+        data['a'] = '3'
+        self.assertEqual(data.get_all('a'), ['3'])
+
+    def test_add_appends_a_value(self):
+        data = MultiDict()
+        data.add('a', '1')
+        data.add('a', '2')
+        self.assertEqual(data.get_all('a'), ['1', '2'])
+
+    def test_delete_removes_every_value(self):
+        data = MultiDict([('a', '1'), ('a', '2')])
+        del data['a']
+        self.assertEqual(data, {})
+        self.assertEqual(data.get_all('a'), [])
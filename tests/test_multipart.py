@@ -0,0 +1,99 @@
+from unittest import TestCase
+import os
+import tempfile
+
+from vertx.multipart import MultipartParser, MultipartError, MultipartLimit, parse_header
+
+
+BODY = (
+    b'preamble\r\n'
+    b'--xyz\r\n'
+    b'Content-Disposition: form-data; name="title"\r\n'
+    b'\r\n'
+    b'hello\r\nworld\r\n'
+    b'--xyz\r\n'
+    b'Content-Disposition: form-data; name="tag"\r\n'
+    b'\r\n'
+    b'a\r\n'
+    b'--xyz\r\n'
+    b'Content-Disposition: form-data; name="tag"\r\n'
+    b'\r\n'
+    b'b\r\n'
+    b'--xyz\r\n'
+    b'Content-Disposition: form-data; name="upload"; filename="notes.txt"\r\n'
+    b'Content-Type: text/plain\r\n'
+    b'\r\n'
+    b'file --xy contents\r\n'
+    b'--xyz--\r\n'
+)
+
+
+def split(data, size):
+    return [data[index:index + size] for index in range(0, len(data), size)]
+
+
+class MultipartParserTestCase(TestCase):
+
+    def parse(self, chunks, boundary='xyz'):
+        parser = MultipartParser(boundary)
+        self.addCleanup(parser.close)
+        return parser.parse(chunks)
+
+    def test_parses_fields_and_files(self):
+        form, files = self.parse([BODY])
+        self.assertEqual(form, {'title': 'hello\r\nworld', 'tag': 'b'})
+        self.assertEqual(form.get_all('tag'), ['a', 'b'])
+        upload = files['upload']
+        self.assertEqual((upload.filename, upload.content_type, upload.size), ('notes.txt', 'text/plain', 18))
+        self.assertEqual(upload.read(), b'file --xy contents')
+
+    def test_parses_any_chunking(self):
+        for size in (1, 2, 3, 7, 16):
+            form, files = self.parse(split(BODY, size))
+            self.assertEqual(form.get_all('tag'), ['a', 'b'])
+            self.assertEqual(files['upload'].read(), b'file --xy contents')
+
+    def test_repeated_file_fields_are_all_rewound(self):
+        body = (
+            b'--xyz\r\nContent-Disposition: form-data; name="f"; filename="a.txt"\r\n\r\nfirst\r\n'
+            b'--xyz\r\nContent-Disposition: form-data; name="f"; filename="b.txt"\r\n\r\nsecond\r\n'
+            b'--xyz--\r\n'
+        )
+        form, files = self.parse([body])
+        self.assertEqual([file.read() for file in files.get_all('f')], [b'first', b'second'])
+
+    def test_uploaded_file_can_be_saved(self):
+        form, files = self.parse([BODY])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'notes.txt')
+            files['upload'].save(path)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b'file --xy contents')
+
+    def test_truncated_body_is_an_error(self):
+        with self.assertRaises(MultipartError):
+            MultipartParser('xyz').parse([BODY[:-10]])
+
+    def test_field_count_is_limited(self):
+        with self.assertRaises(MultipartLimit):
+            MultipartParser('xyz', max_fields=3).parse([BODY])
+
+    def test_failed_parse_closes_uploaded_files(self):
+        parser = MultipartParser('xyz')
+        with self.assertRaises(MultipartError):
+            parser.parse([BODY[:-10]])
+        self.assertTrue(parser._part.file.closed)
+
+    def test_field_memory_is_limited(self):
+        with self.assertRaises(MultipartLimit):
+            MultipartParser('xyz', max_memory_size=5).parse([BODY])
+
+
+class ParseHeaderTestCase(TestCase):
+
+    def test_parses_value_and_params(self):
+        self.assertEqual(parse_header('multipart/form-data; boundary=abc'), ('multipart/form-data', {'boundary': 'abc'}))
+
+    def test_quoted_params_may_contain_separators(self):
+        value, params = parse_header('form-data; name="f"; filename="a;b \\"c\\".txt"')
+        self.assertEqual(params, {'name': 'f', 'filename': 'a;b "c".txt'})
@@ -1,5 +1,6 @@
 from unittest import TestCase
-from unittest.mock import Mock
+from unittest.mock import Mock, AsyncMock
+import asyncio
 
 from vertx import Node, Request, Response
 from vertx.exceptions import BadLink, BadHandle
@@ -15,6 +16,94 @@ class WsgiTestCase(TestCase):
         self.assertEqual(body, (b'',))
 
 
+class AsgiTestCase(TestCase):
+
+    def call_asgi(self, node, method='GET', path='/'):
+        scope = {'type': 'http', 'method': method, 'path': path, 'headers': []}
+        messages = []
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        async def send(message):
+            messages.append(message)
+        asyncio.run(node.asgi(scope, receive, send))
+        return messages
+
+    def test_node_is_an_asgi_app(self):
+        messages = self.call_asgi(Node())
+        self.assertEqual(messages, [
+            {'type': 'http.response.start', 'status': 404, 'headers': []},
+            {'type': 'http.response.body', 'body': b''},
+        ])
+
+    def test_async_handles_are_awaited(self):
+        class Hello(Node):
+            async def handle(self, request, response):
+                response.status = 200
+                response.body = 'hello'
+                return response
+        messages = self.call_asgi(Hello())
+        self.assertEqual(messages[0]['status'], 200)
+        self.assertEqual(messages[1]['body'], b'hello')
+
+    def test_async_handles_can_raise_responses(self):
+        root, a, b = Node(), Node(), Node()
+        root.link(a)
+        a.link(b)
+        bounce = Response()
+        bounce.status = 401
+        a.handle = AsyncMock(side_effect=bounce)
+        b.handle = Mock(return_value=Response())
+        messages = self.call_asgi(root)
+        self.assertEqual(messages[0]['status'], 401)
+        self.assertEqual(b.handle.call_count, 0)
+
+    def test_sync_and_async_handles_can_be_mixed(self):
+        root, a = Node(), Node()
+        root.link(a)
+        root.handle = AsyncMock(return_value=Response())
+        a.handle = Mock(return_value=Response())
+        self.call_asgi(root)
+        self.assertEqual(root.handle.await_count, 1)
+        self.assertEqual(a.handle.call_count, 1)
+
+    def test_async_handles_cannot_run_through_wsgi(self):
+        node = Node()
+        node.handle = AsyncMock(return_value=Response())
+        with self.assertRaises(BadHandle) as context:
+            node({}, Mock())
+        self.assertEqual(str(context.exception), 'Async node handles can only run through the asgi entry point.')
+
+    def test_websocket_connections_are_rejected(self):
+        node = Node()
+        node.handle = Mock(return_value=Response())
+        sent = []
+        async def receive():
+            return {'type': 'websocket.connect'}
+        async def send(message):
+            sent.append(message)
+        asyncio.run(node.asgi({'type': 'websocket', 'path': '/'}, receive, send))
+        self.assertEqual(sent, [{'type': 'websocket.close', 'code': 1000}])
+        self.assertEqual(node.handle.call_count, 0)
+
+    def test_unknown_scopes_are_ignored(self):
+        node = Node()
+        node.handle = Mock(return_value=Response())
+        asyncio.run(node.asgi({'type': 'custom'}, AsyncMock(), AsyncMock()))
+        self.assertEqual(node.handle.call_count, 0)
+
+    def test_lifespan_compiles_the_graph(self):
+        node = Node()
+        messages = iter([{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+        sent = []
+        async def receive():
+            return next(messages)
+        async def send(message):
+            sent.append(message)
+        asyncio.run(node.asgi({'type': 'lifespan'}, receive, send))
+        self.assertTrue(node.frozen)
+        self.assertEqual(sent, [{'type': 'lifespan.startup.complete'}, {'type': 'lifespan.shutdown.complete'}])
+
+
 class LinkTestCase(TestCase):
 
     def test_node_can_link_sub_nodes(self):
@@ -35,12 +124,13 @@ class LinkTestCase(TestCase):
             node.link(node)
         self.assertEqual(str(context.exception), 'A node cannot link to itself.')
 
-    def test_link_cannot_form_an_infinite_loop(self):
+    def test_compile_rejects_links_forming_an_infinite_loop(self):
         a, b, c = Node(), Node(), Node()
         a.link(b)
         b.link(c)
+        c.link(a)
         with self.assertRaises(BadLink) as context:
-            c.link(a)
+            a.compile()
         self.assertEqual(str(context.exception), 'A node link must not form a path to itself.')
 
 
@@ -131,6 +221,44 @@ class SubmitTestCase(TestCase):
         self.assertEqual(node.submit.call_count, 0)
 
 
+class HaltTestCase(TestCase):
+
+    def test_halted_response_skips_sub_nodes_but_not_siblings(self):
+        root, a, b, c = Node(), Node(), Node(), Node()
+        root.link(a)
+        a.link(b)
+        root.link(c)
+        a.handle = lambda request, response: response.halt()
+        b.handle = Mock(return_value=Response())
+        c.handle = Mock(side_effect=lambda request, response: response)
+        response = root.submit(Request({}))
+        self.assertEqual(b.handle.call_count, 0)
+        self.assertEqual(c.handle.call_count, 1)
+        self.assertFalse(response.halted)
+
+    def test_halted_response_is_returned_by_submit(self):
+        root, a = Node(), Node()
+        root.link(a)
+        halted = Response()
+        root.handle = Mock(return_value=halted.halt())
+        a.handle = Mock(return_value=Response())
+        response = root.submit(Request({}))
+        self.assertIs(response, halted)
+        self.assertEqual(a.handle.call_count, 0)
+
+    def test_halt_works_through_asgi(self):
+        root, a = Node(), Node()
+        root.link(a)
+        async def handle(request, response):
+            response.status = 401
+            return response.halt()
+        root.handle = handle
+        a.handle = Mock(return_value=Response())
+        response = asyncio.run(root.submit_async(Request({})))
+        self.assertEqual(response.status, 401)
+        self.assertEqual(a.handle.call_count, 0)
+
+
 class HandleTestCase(TestCase):
 
     def test_node_handle_accepts_request_and_response(self):
@@ -139,3 +267,105 @@ class HandleTestCase(TestCase):
         response = Response()
         node_response = node.handle(request, response)
         self.assertIs(node_response, response)
+
+
+class CompileTestCase(TestCase):
+
+    def test_compile_freezes_the_whole_graph(self):
+        root, a, b = Node(), Node(), Node()
+        root.link(a)
+        a.link(b)
+        root.compile()
+        self.assertTrue(root.frozen)
+        self.assertTrue(a.frozen)
+        self.assertTrue(b.frozen)
+
+    def test_wsgi_call_compiles_the_graph(self):
+        root = Node()
+        root({}, Mock())
+        self.assertTrue(root.frozen)
+
+    def test_compiled_node_cannot_link(self):
+        root, a = Node(), Node()
+        root.compile()
+        with self.assertRaises(BadLink) as context:
+            root.link(a)
+        self.assertEqual(str(context.exception), 'A compiled node cannot link to other nodes.')
+
+    def test_plan_is_a_flat_list_of_handles_in_depth_first_order(self):
+        root, a, b, c = Node(), Node(), Node(), Node()
+        root.link(a)
+        a.link(b)
+        root.link(c)
+        plan = root.plan('GET', '/')
+        self.assertEqual([step[0] for step in plan], [root.handle, a.handle, b.handle, c.handle])
+
+    def test_plan_bounce_offsets_skip_the_node_subtree(self):
+        root, a, b, c = Node(), Node(), Node(), Node()
+        root.link(a)
+        a.link(b)
+        root.link(c)
+        plan = root.plan('GET', '/')
+        self.assertEqual([step[3] for step in plan], [4, 3, 3, 4])
+
+    def test_bounce_skips_sub_nodes_but_not_siblings(self):
+        root, a, b, c = Node(), Node(), Node(), Node()
+        root.link(a)
+        a.link(b)
+        root.link(c)
+        a.handle = Mock(side_effect=Response())
+        b.handle = Mock(return_value=Response())
+        c.handle = Mock(return_value=Response())
+        root.submit(Request({}))
+        self.assertEqual(b.handle.call_count, 0)
+        self.assertEqual(c.handle.call_count, 1)
+
+    def test_nodes_overriding_submit_run_as_a_single_step(self):
+        calls = []
+
+        class Custom(Node):
+            def submit(self, request, response=None):
+                calls.append(request)
+                return response
+
+        root, custom, child = Node(), Custom(), Node()
+        root.link(custom)
+        custom.link(child)
+        plan = root.plan('GET', '/')
+        self.assertEqual([step[0] for step in plan], [root.handle, custom.submit])
+        request = Request({})
+        root.compile().submit(request)
+        self.assertEqual(calls, [request])
+
+    def test_nodes_overriding_submit_can_delegate_to_node_submit(self):
+        class Wrapper(Node):
+            def submit(self, request, response=None):
+                return super().submit(request, response)
+
+        root, wrapper, child = Node(), Wrapper(), Node()
+        root.link(wrapper)
+        wrapper.link(child)
+        wrapper.handle = Mock(return_value=Response())
+        child.handle = Mock(return_value=Response())
+        root.submit(Request({}))
+        self.assertEqual(wrapper.handle.call_count, 1)
+        self.assertEqual(child.handle.call_count, 1)
+
+    def test_compiled_node_caches_plans(self):
+        root = Node().compile()
+        root.submit(Request({}))
+        root.submit(Request({}))
+        self.assertEqual(len(root._plans), 1)
+
+    def test_plans_are_cached_per_route_not_per_path(self):
+        root, user = Node(), Node()
+        user.http_method, user.http_path = 'get', '/users/{id}'
+        params = []
+        user.handle = lambda request, response: params.append(request.params) or response
+        root.link(user)
+        root.compile()
+        for path in ('/users/1', '/users/2', '/users/3'):
+            root({'REQUEST_METHOD': 'GET', 'PATH_INFO': path}, lambda status, headers: None)
+        root({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/posts/1'}, lambda status, headers: None)
+        self.assertEqual(params, [{'id': '1'}, {'id': '2'}, {'id': '3'}])
+        self.assertEqual(len(root._plans), 2)
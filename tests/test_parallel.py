@@ -0,0 +1,261 @@
+from io import BytesIO
+from threading import Barrier
+from unittest import TestCase
+from unittest.mock import Mock
+import asyncio
+import time
+
+from vertx import Node, Request, Response, AsgiRequest
+from vertx.cache import Cache
+from vertx.parallel import Parallel
+
+
+def env(method='GET', path='/'):
+    return {'REQUEST_METHOD': method, 'PATH_INFO': path}
+
+
+class Header(Node):
+
+    def __init__(self, name, value, delay=0):
+        super().__init__()
+        self.name = name
+        self.value = value
+        self.delay = delay
+
+    def handle(self, request, response):
+        time.sleep(self.delay)
+        response.headers[self.name] = self.value
+        return response
+
+
+class ParallelTestCase(TestCase):
+
+    def test_children_run_concurrently(self):
+        barrier = Barrier(2, timeout=1)
+        group = Parallel()
+        for name in ('a', 'b'):
+            node = Node()
+            node.handle = lambda request, response: barrier.wait() is not None and response
+            group.link(node)
+        response = group.submit(Request(env()))
+        self.assertIsInstance(response, Response)
+
+    def test_default_merge_collects_changes_from_every_child(self):
+        group = Parallel()
+        group.link(Header('X-A', '1'))
+        group.link(Header('X-B', '2'))
+        body = Node()
+        body.handle = lambda request, response: setattr(response, 'body', 'hello') or response
+        group.link(body)
+        response = group.submit(Request(env()))
+        self.assertEqual(response.headers['X-A'], '1')
+        self.assertEqual(response.headers['X-B'], '2')
+        self.assertEqual(response.body, b'hello')
+
+    def test_children_receive_copies_of_the_response(self):
+        group = Parallel()
+        seen = []
+        group.handle = lambda request, response: setattr(response, 'status', 200) or response
+        for name in ('a', 'b'):
+            node = Node()
+            node.handle = lambda request, response: seen.append(response) or response
+            group.link(node)
+        response = group.submit(Request(env()))
+        self.assertEqual([r.status for r in seen], [200, 200])
+        self.assertNotIn(response, seen)
+        self.assertIsNot(seen[0], seen[1])
+
+    def test_custom_merge_function(self):
+        def merge(response, results):
+            response.body = ','.join(sorted(r.headers['X-Name'] for r in results))
+            return response
+        group = Parallel(merge=merge)
+        group.link(Header('X-Name', 'a'))
+        group.link(Header('X-Name', 'b'))
+        self.assertEqual(group.submit(Request(env())).body, b'a,b')
+
+    def test_child_bounce_is_raised_without_waiting_for_siblings(self):
+        group = Parallel()
+        bounce = Node()
+        bounce.handle = lambda request, response: setattr(response, 'status', 403) or response.halt()
+        group.link(bounce)
+        group.link(Header('X-Slow', '1', delay=0.5))
+        start = time.monotonic()
+        with self.assertRaises(Response) as context:
+            group.submit(Request(env()))
+        self.assertEqual(context.exception.status, 403)
+        self.assertNotIn('X-Slow', context.exception.headers)
+        self.assertLess(time.monotonic() - start, 0.4)
+
+    def test_bounce_in_parallel_group_stops_its_own_subtree_only(self):
+        root, group, after = Node(), Parallel(), Header('X-After', '1')
+        failing = Node()
+        failing.handle = lambda request, response: setattr(response, 'status', 403) or response.halt()
+        group.link(failing)
+        root.link(group)
+        root.link(after)
+        response = root.submit(Request(env()))
+        self.assertEqual(response.status, 403)
+        self.assertEqual(response.headers['X-After'], '1')
+
+    def test_timeout_bounces_with_gateway_timeout(self):
+        group = Parallel(timeout=0.01)
+        group.link(Header('X-Slow', '1', delay=0.2))
+        with self.assertRaises(Response) as context:
+            group.submit(Request(env()))
+        self.assertEqual(context.exception.status, 504)
+
+    def test_child_errors_are_raised_instead_of_timing_out(self):
+        group, broken = Parallel(), Node()
+        broken.handle = Mock(side_effect=ValueError('broken'))
+        group.link(broken)
+        group.link(Header('X-Slow', '1', delay=0.2))
+        with self.assertRaises(ValueError):
+            group.submit(Request(env()))
+
+    def test_children_overriding_submit_run_through_it(self):
+        group, cache, page = Parallel(), Cache(), Header('X-Page', '1')
+        group.handle = lambda request, response: setattr(response, 'status', 200) or response
+        page.handle = Mock(side_effect=page.handle)
+        group.link(cache)
+        cache.link(page)
+        group.submit(Request(env()))
+        with self.assertRaises(Response) as context:
+            group.submit(Request(env()))
+        self.assertEqual(context.exception.headers['X-Page'], '1')
+        self.assertEqual(page.handle.call_count, 1)
+
+    def test_every_child_can_read_the_body(self):
+        group, bodies = Parallel(), []
+        for name in ('a', 'b'):
+            node = Node()
+            node.handle = lambda request, response: bodies.append((request.body, request.form['name'])) or response
+            group.link(node)
+        request = Request(dict(env(), CONTENT_LENGTH='7', CONTENT_TYPE='application/x-www-form-urlencoded', **{'wsgi.input': BytesIO(b'name=jo')}))
+        group.submit(request)
+        self.assertEqual(bodies, [(b'name=jo', 'jo')] * 2)
+
+    def test_children_are_routed(self):
+        group = Parallel()
+        users, posts = Header('X-Users', '1'), Header('X-Posts', '1')
+        users.http_method, users.http_path = 'get', '/users/{id}'
+        posts.http_method, posts.http_path = 'get', '/posts'
+        group.link(users)
+        group.link(posts)
+        response = group.submit(Request(env(path='/users/7')))
+        self.assertEqual(response.headers.to_dict(), {'X-Users': '1'})
+
+    def test_routed_children_get_their_own_params(self):
+        barrier, seen = Barrier(2, timeout=5), {}
+        class Params(Node):
+            def handle(self, request, response):
+                barrier.wait()
+                seen[self.http_path] = request.params
+                return response
+        group, users, sections = Parallel(), Params(), Params()
+        users.http_method, users.http_path = 'get', '/users/{id}'
+        sections.http_method, sections.http_path = 'get', '/{section}/{name}'
+        group.link(users)
+        group.link(sections)
+        request = Request(env(path='/users/7'))
+        group.submit(request)
+        self.assertEqual(seen, {'/users/{id}': {'id': '7'}, '/{section}/{name}': {'section': 'users', 'name': '7'}})
+        self.assertEqual(request.params, {})
+
+    def test_grandchildren_run_in_their_child_branch(self):
+        group, child, grandchild = Parallel(), Header('X-Child', '1'), Header('X-Grandchild', '1')
+        child.link(grandchild)
+        group.link(child)
+        response = group.submit(Request(env()))
+        self.assertEqual(response.headers['X-Grandchild'], '1')
+
+
+class AsyncParallelTestCase(TestCase):
+
+    def call_asgi(self, node):
+        messages = []
+        scope = {'type': 'http', 'method': 'GET', 'path': '/', 'query_string': b'', 'headers': []}
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+        async def send(message):
+            messages.append(message)
+        asyncio.run(node.asgi(scope, receive, send))
+        return messages
+
+    def test_async_children_run_concurrently(self):
+        group = Parallel()
+        started = []
+        class Wait(Node):
+            async def handle(self, request, response):
+                started.append(self)
+                while len(started) < 2:
+                    await asyncio.sleep(0)
+                response.status = 200
+                return response
+        group.link(Wait())
+        group.link(Wait())
+        self.assertEqual(self.call_asgi(group)[0]['status'], 200)
+
+    def test_async_timeout_cancels_children(self):
+        cancelled = []
+        class Slow(Node):
+            async def handle(self, request, response):
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.append(self)
+                    raise
+                return response
+        group = Parallel(timeout=0.01)
+        group.link(Slow())
+        self.assertEqual(self.call_asgi(group)[0]['status'], 504)
+        self.assertEqual(len(cancelled), 1)
+
+    def test_async_child_bounce_is_raised(self):
+        class Forbidden(Node):
+            async def handle(self, request, response):
+                response.status = 403
+                raise response
+        group = Parallel()
+        group.link(Forbidden())
+        group.link(Header('X-Other', '1'))
+        self.assertEqual(self.call_asgi(group)[0]['status'], 403)
+
+    def test_async_child_errors_are_raised_instead_of_timing_out(self):
+        class Broken(Node):
+            async def handle(self, request, response):
+                raise ValueError('broken')
+        class Slow(Node):
+            async def handle(self, request, response):
+                await asyncio.sleep(1)
+                return response
+        group = Parallel()
+        group.link(Broken())
+        group.link(Slow())
+        with self.assertRaises(ValueError):
+            asyncio.run(group.submit_async(Request(env())))
+
+    def test_async_children_overriding_submit_run_through_it(self):
+        group, cache, page = Parallel(), Cache(), Header('X-Page', '1')
+        group.handle = lambda request, response: setattr(response, 'status', 200) or response
+        page.handle = Mock(side_effect=page.handle)
+        group.link(cache)
+        cache.link(page)
+        asyncio.run(group.submit_async(Request(env())))
+        with self.assertRaises(Response) as context:
+            asyncio.run(group.submit_async(Request(env())))
+        self.assertEqual(context.exception.headers['X-Page'], '1')
+        self.assertEqual(page.handle.call_count, 1)
+
+    def test_every_async_child_can_read_the_body(self):
+        group, bodies = Parallel(), []
+        for name in ('a', 'b'):
+            node = Node()
+            node.handle = lambda request, response: bodies.append(request.body) or response
+            group.link(node)
+        messages = iter([{'type': 'http.request', 'body': b'hello', 'more_body': False}])
+        async def receive():
+            return next(messages)
+        scope = {'type': 'http', 'method': 'POST', 'path': '/', 'headers': [(b'content-length', b'5')]}
+        asyncio.run(group.submit_async(AsgiRequest(scope, receive)))
+        self.assertEqual(bodies, [b'hello'] * 2)
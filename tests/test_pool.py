@@ -0,0 +1,89 @@
+from unittest import TestCase
+
+from vertx import Node, Request, Response
+from vertx.pool import Pool
+
+
+ENV = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/'}
+
+
+class App(Node):
+
+    pool_size = 4
+
+    def handle(self, request, response):
+        response.status = 200
+        response.headers['X-Path'] = request.env['PATH_INFO']
+        response.body = request.env['PATH_INFO']
+        return response
+
+
+def call(app, env=ENV):
+    statuses = []
+    body = app(dict(env), lambda status, headers: statuses.append((status, headers)))
+    return statuses[0], b''.join(body)
+
+
+class PoolTestCase(TestCase):
+
+    def test_pooling_is_off_by_default(self):
+        node = Node().compile()
+        self.assertIsNone(node.pool)
+
+    def test_requests_and_responses_are_reused(self):
+        app = App()
+        call(app)
+        call(app)
+        self.assertEqual(app.pool.reused, 1)
+        self.assertEqual(len(app.pool.requests), 1)
+        self.assertEqual(len(app.pool.responses), 1)
+
+    def test_reused_objects_are_reset(self):
+        app, seen = App(), []
+        app.handle = lambda request, response: seen.append((request.params, request._query, response.status, len(response.headers))) or App.handle(app, request, response)
+        call(app, {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/a', 'QUERY_STRING': 'x=1'})
+        self.assertEqual(call(app, {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/b'}), (('200 OK', [('X-Path', '/b')]), b'/b'))
+        self.assertEqual(seen[1], ({}, None, 404, 0))
+
+    def test_headers_handed_to_the_server_are_not_reused(self):
+        app = App()
+        (status, headers), body = call(app, {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/a'})
+        call(app, {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/b'})
+        self.assertEqual(headers, [('X-Path', '/a')])
+
+    def test_objects_kept_by_handlers_are_not_reused(self):
+        app, kept = App(), []
+        app.handle = lambda request, response: kept.append((request, response)) or App.handle(app, request, response)
+        call(app)
+        call(app)
+        self.assertEqual(app.pool.reused, 0)
+        self.assertEqual(app.pool.discarded, 2)
+        self.assertEqual(app.pool.responses, [])
+        self.assertIsNot(kept[0][0], kept[1][0])
+        self.assertEqual(kept[0][1].body, b'/')
+
+    def test_raised_responses_are_reused(self):
+        class Bounce(App):
+            def handle(self, request, response):
+                response.status = 401
+                raise response
+        app = Bounce()
+        call(app)
+        self.assertEqual(len(app.pool.requests), 1)
+        self.assertEqual(len(app.pool.responses), 1)
+        self.assertIsNone(app.pool.responses[0].__traceback__)
+
+    def test_frozen_and_custom_responses_are_not_pooled(self):
+        frozen = Response().freeze()
+        app = App()
+        app.handle = lambda request, response: frozen
+        call(app)
+        self.assertEqual(app.pool.responses, [])
+
+    def test_pool_size_is_bounded(self):
+        pool = Pool(1)
+        for _ in range(3):
+            request, response = Request({}), Response()
+            pool.release(request, response)
+        self.assertEqual(len(pool.requests), 1)
+        self.assertEqual(len(pool.responses), 1)
@@ -0,0 +1,73 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from vertx import Node
+from vertx.prefork import warm_up, warm_plans, memory, when_ready, post_fork, post_worker_init
+
+
+def route(method, path):
+    node = Node()
+    node.http_method = method
+    node.http_path = path
+    return node
+
+
+class WarmUpTestCase(TestCase):
+
+    def test_warm_up_compiles_the_graph_and_freezes_the_heap(self):
+        app = Node()
+        app.link(route('get', '/'))
+        with patch('vertx.prefork.gc.freeze') as freeze:
+            report = warm_up(app)
+        freeze.assert_called_once_with()
+        self.assertTrue(app.frozen)
+        self.assertEqual(report['plans'], 1)
+        self.assertIn('seconds', report)
+
+    def test_warm_up_can_skip_freezing(self):
+        with patch('vertx.prefork.gc.freeze') as freeze:
+            warm_up(Node(), freeze=False)
+        freeze.assert_not_called()
+
+    def test_plans_for_static_routes_are_cached(self):
+        app = Node()
+        app.link(route('get', '/'))
+        app.link(route('post', '/users'))
+        app.link(route('get', '/users/{id}'))
+        app.compile()
+        self.assertEqual(warm_plans(app), 2)
+        self.assertEqual(sorted(method for method, route in app._plans), ['GET', 'POST'])
+
+    def test_routes_with_async_handles_are_skipped(self):
+        class Async(Node):
+            http_path = '/async'
+            async def handle(self, request, response):
+                return response
+        app = Node()
+        app.link(Async())
+        self.assertEqual(warm_plans(app.compile()), 0)
+
+    def test_memory_reports_resident_size(self):
+        usage = memory()
+        self.assertGreater(usage.get('rss', usage.get('max_rss', 0)), 0)
+
+
+class GunicornHooksTestCase(TestCase):
+
+    def test_when_ready_warms_the_preloaded_app(self):
+        app = Node()
+        server = Mock()
+        server.app.wsgi.return_value = app
+        with patch('vertx.prefork.gc.freeze'):
+            when_ready(server)
+        self.assertTrue(app.frozen)
+        self.assertIn('vertx warm up', server.log.info.call_args[0][0])
+
+    def test_workers_report_boot_time_and_memory(self):
+        worker = Mock()
+        post_fork(Mock(), worker)
+        post_worker_init(worker)
+        message, pid, boot, usage = worker.log.info.call_args[0]
+        self.assertIn('booted', message)
+        self.assertGreaterEqual(boot, 0)
+        self.assertIn('MB', usage)
@@ -0,0 +1,119 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+import multiprocessing
+import os
+
+from vertx import Node, Request, Response
+from vertx.rate_limit import RateLimit, SharedTable
+
+
+def request(ip='203.0.113.1', **env):
+    env.setdefault('REMOTE_ADDR', ip)
+    return Request(env)
+
+
+def submit(node, request):
+    try:
+        return node.submit(request)
+    except Response as response:
+        return response
+
+
+class RateLimitTestCase(TestCase):
+
+    def limit(self, *args, **kwargs):
+        limit = RateLimit(*args, **kwargs)
+        self.addCleanup(limit.table.close)
+        return limit
+
+    def test_requests_within_burst_pass_through(self):
+        limit = self.limit(3)
+        for _ in range(3):
+            self.assertEqual(submit(limit, request()).status, 404)
+
+    def test_exceeding_requests_bounce_with_429_and_retry_after(self):
+        limit = self.limit(2, per=60)
+        submit(limit, request())
+        submit(limit, request())
+        response = submit(limit, request())
+        self.assertEqual(response.status, 429)
+        self.assertEqual(response.headers['Retry-After'], '30')
+
+    def test_bounce_skips_sub_nodes(self):
+        limit, endpoint = self.limit(1), Node()
+        visited = []
+        endpoint.handle = lambda request, response: visited.append(1) or response
+        limit.link(endpoint)
+        submit(limit, request())
+        submit(limit, request())
+        self.assertEqual(visited, [1])
+
+    def test_clients_are_limited_separately(self):
+        limit = self.limit(1)
+        self.assertEqual(submit(limit, request('203.0.113.1')).status, 404)
+        self.assertEqual(submit(limit, request('203.0.113.2')).status, 404)
+        self.assertEqual(submit(limit, request('203.0.113.1')).status, 429)
+
+    def test_custom_key_function(self):
+        limit = self.limit(1, key=lambda request: request.headers.get('X-Api-Key'))
+        self.assertEqual(submit(limit, request('1.1.1.1', HTTP_X_API_KEY='a')).status, 404)
+        self.assertEqual(submit(limit, request('2.2.2.2', HTTP_X_API_KEY='a')).status, 429)
+
+    def test_tokens_refill_over_time(self):
+        limit = self.limit(1, per=10)
+        with patch('vertx.rate_limit.time', return_value=1000.0):
+            submit(limit, request())
+            self.assertEqual(submit(limit, request()).status, 429)
+        with patch('vertx.rate_limit.time', return_value=1010.0):
+            self.assertEqual(submit(limit, request()).status, 404)
+
+
+class SharedTableTestCase(TestCase):
+
+    def table(self, *args, **kwargs):
+        table = SharedTable(*args, **kwargs)
+        self.addCleanup(table.close)
+        return table
+
+    def test_tables_on_the_same_path_share_counters(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'limits')
+            a, b = self.table(1024, path), self.table(1024, path)
+            self.assertEqual(a.take('key', 1, 1), 0)
+            self.assertGreater(b.take('key', 1, 1), 0)
+
+    def test_forked_workers_share_counters(self):
+        table = self.table(1024)
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=take, args=(table, 50)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertGreater(table.take('key', 1e-9, 200), 0)
+
+    def test_full_probe_window_evicts_the_oldest_bucket(self):
+        table = self.table(slots=2, probes=2)
+        with patch('vertx.rate_limit.time', side_effect=[1.0, 2.0, 3.0, 4.0]):
+            table.take('a', 1e-9, 1)
+            table.take('b', 1e-9, 1)
+            self.assertEqual(table.take('c', 1e-9, 1), 0)
+            self.assertEqual(table.take('a', 1e-9, 1), 0)
+
+    def test_close_releases_the_map_and_file(self):
+        table = SharedTable(16)
+        table.close()
+        self.assertTrue(table.map.closed)
+        self.assertTrue(table.file.closed)
+
+    def test_clear(self):
+        table = self.table(16)
+        table.take('key', 1e-9, 1)
+        table.clear()
+        self.assertEqual(table.take('key', 1e-9, 1), 0)
+
+
+def take(table, count):
+    for _ in range(count):
+        table.take('key', 1e-9, 200)
@@ -1,8 +1,9 @@
 from unittest import TestCase
+from unittest.mock import patch
 from io import BytesIO
 import copy
 
-from vertx import Request
+from vertx import Request, Response
 
 
 class RequestTestCase(TestCase):
@@ -71,12 +72,185 @@ class RequestTestCase(TestCase):
         request = Request(env)
         self.assertEqual(request.body, b'<h1>Hello World</h1>')
 
+    def test_body_honors_content_length(self):
+        env = mock_env()
+        env['CONTENT_LENGTH'] = '5'
+        env['wsgi.input'].write(b'hello world')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        self.assertEqual(request.body, b'hello')
+
+    def test_stream_yields_body_in_chunks(self):
+        env = mock_env()
+        env['CONTENT_LENGTH'] = '11'
+        env['wsgi.input'].write(b'hello world')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        self.assertEqual(list(request.stream(4)), [b'hell', b'o wo', b'rld'])
+
+    def test_stream_without_content_length_reads_until_the_end(self):
+        env = mock_env()
+        env['wsgi.input'].write(b'hello world')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        self.assertEqual(list(request.stream(6)), [b'hello ', b'world'])
+
+    def test_declared_body_above_max_size_raises_413_before_reading(self):
+        env = mock_env()
+        env['CONTENT_LENGTH'] = '11'
+        env['wsgi.input'].write(b'hello world')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        with patch.object(Request, 'max_body_size', 10), self.assertRaises(Response) as context:
+            request.body
+        self.assertEqual(context.exception.status, 413)
+        self.assertEqual(env['wsgi.input'].tell(), 0)
+
+    def test_undeclared_body_above_max_size_raises_413(self):
+        env = mock_env()
+        env['wsgi.input'].write(b'hello world')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        with self.assertRaises(Response) as context:
+            list(request.stream(4, max_body_size=10))
+        self.assertEqual(context.exception.status, 413)
+
+    def test_invalid_content_length_raises_400(self):
+        env = mock_env()
+        env['CONTENT_LENGTH'] = 'abc'
+        request = Request(env)
+        with self.assertRaises(Response) as context:
+            request.body
+        self.assertEqual(context.exception.status, 400)
+
+    def test_spool_keeps_small_bodies_in_memory(self):
+        env = mock_env()
+        env['wsgi.input'].write(b'hello world')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        spool = request.spool()
+        self.addCleanup(spool.close)
+        self.assertEqual(spool.read(), b'hello world')
+        self.assertFalse(spool._rolled)
+
+    def test_spool_rolls_large_bodies_to_disk(self):
+        env = mock_env()
+        env['wsgi.input'].write(b'hello world')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        spool = request.spool(spool_size=4)
+        self.addCleanup(spool.close)
+        self.assertEqual(spool.read(), b'hello world')
+        self.assertTrue(spool._rolled)
+
+    def test_spool_accepts_a_per_request_body_limit(self):
+        env = mock_env()
+        env['CONTENT_LENGTH'] = '11'
+        env['wsgi.input'].write(b'hello world')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        with self.assertRaises(Response) as context:
+            request.spool(max_body_size=10)
+        self.assertEqual(context.exception.status, 413)
+        self.assertIsNone(request._spool)
+
+    def test_json(self):
+        env = mock_env()
+        env['wsgi.input'].write(b'{"name": "Jo\\u00e3o", "tags": [1, 2]}')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        self.assertEqual(request.json, {'name': 'João', 'tags': [1, 2]})
+        self.assertIs(request.json, request.json)
+
+    def test_json_null_is_cached(self):
+        env = mock_env()
+        env['wsgi.input'].write(b'null')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        self.assertIsNone(request.json)
+        self.assertIsNone(request.json)
+
+    def test_invalid_json_raises_400(self):
+        env = mock_env()
+        env['wsgi.input'].write(b'{invalid')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        with self.assertRaises(Response) as context:
+            request.json
+        self.assertEqual(context.exception.status, 400)
+
     def test_query(self):
         env = mock_env()
         env['QUERY_STRING'] = 'page=1&order=price'
         request = Request(env)
         self.assertEqual(request.query, {'page': '1', 'order': 'price'})
 
+    def test_query_keeps_repeated_keys(self):
+        env = mock_env()
+        env['QUERY_STRING'] = 'tag=a&tag=b&page=1'
+        request = Request(env)
+        self.assertEqual(request.query['tag'], 'b')
+        self.assertEqual(request.query.get_all('tag'), ['a', 'b'])
+
+    def test_query_field_count_is_limited(self):
+        env = mock_env()
+        env['QUERY_STRING'] = 'a=1&b=2&c=3'
+        request = Request(env)
+        with patch.object(Request, 'max_form_fields', 2), self.assertRaises(Response) as context:
+            request.query
+        self.assertEqual(context.exception.status, 400)
+
+    def test_urlencoded_form(self):
+        env = mock_env()
+        env['CONTENT_TYPE'] = 'application/x-www-form-urlencoded; charset=utf-8'
+        env['wsgi.input'].write(b'name=Jo%C3%A3o&tag=a&tag=b')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        self.assertEqual(request.form, {'name': 'João', 'tag': 'b'})
+        self.assertEqual(request.form.get_all('tag'), ['a', 'b'])
+        self.assertEqual(request.files, {})
+
+    def test_urlencoded_form_size_is_limited(self):
+        env = mock_env()
+        env['CONTENT_TYPE'] = 'application/x-www-form-urlencoded'
+        env['wsgi.input'].write(b'name=abcdef')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        with patch.object(Request, 'max_form_memory_size', 5), self.assertRaises(Response) as context:
+            request.form
+        self.assertEqual(context.exception.status, 413)
+
+    def test_multipart_form_and_files(self):
+        env = mock_env()
+        env['CONTENT_TYPE'] = 'multipart/form-data; boundary=xyz'
+        env['wsgi.input'].write(
+            b'--xyz\r\nContent-Disposition: form-data; name="title"\r\n\r\nhello\r\n'
+            b'--xyz\r\nContent-Disposition: form-data; name="upload"; filename="a.txt"\r\n\r\ndata\r\n'
+            b'--xyz--\r\n'
+        )
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        self.assertEqual(request.form, {'title': 'hello'})
+        upload = request.files['upload']
+        self.addCleanup(upload.close)
+        self.assertEqual(upload.read(), b'data')
+
+    def test_malformed_multipart_raises_400(self):
+        env = mock_env()
+        env['CONTENT_TYPE'] = 'multipart/form-data; boundary=xyz'
+        env['wsgi.input'].write(b'--xyz\r\nContent-Disposition: form-data\r\n\r\nhello\r\n--xyz--\r\n')
+        env['wsgi.input'].seek(0)
+        request = Request(env)
+        with self.assertRaises(Response) as context:
+            request.form
+        self.assertEqual(context.exception.status, 400)
+
+    def test_form_is_empty_for_other_content_types(self):
+        env = mock_env()
+        env['CONTENT_TYPE'] = 'application/json'
+        request = Request(env)
+        self.assertEqual(request.form, {})
+
     def test_headers(self):
         env = mock_env()
         env['HTTP_AUTH'] = 'token'
@@ -129,6 +303,85 @@ class RequestTestCase(TestCase):
         request = Request(env)
         self.assertEqual(request.ip, '203.0.113.195')
 
+    def test_url_properties_are_memoized(self):
+        env = mock_env()
+        env['PATH_INFO'] = '/a'
+        request = Request(env)
+        url = request.url
+        env['PATH_INFO'] = '/b'
+        self.assertIs(request.url, url)
+        self.assertIs(request.ip, request.ip)
+
+    def test_forwarded_headers_are_ignored_without_trusted_proxies(self):
+        env = mock_env()
+        env['HTTP_X_FORWARDED_PROTO'] = 'https'
+        env['HTTP_X_FORWARDED_HOST'] = 'example.com'
+        request = Request(env)
+        self.assertEqual(request.base_url, 'http://localhost:8000')
+
+    def test_trusted_proxy_resolves_x_forwarded_headers(self):
+        env = mock_env()
+        env['REMOTE_ADDR'] = '10.0.0.2'
+        env['HTTP_X_FORWARDED_FOR'] = '198.51.100.7, 203.0.113.195, 10.0.0.1'
+        env['HTTP_X_FORWARDED_PROTO'] = 'https'
+        env['HTTP_X_FORWARDED_HOST'] = 'example.com'
+        with patch.object(Request, 'trusted_proxies', ['10.0.0.0/8']):
+            request = Request(env)
+            self.assertEqual(request.ip, '203.0.113.195')
+            self.assertEqual(request.url, 'https://example.com')
+
+    def test_trusted_proxy_resolves_forwarded_header(self):
+        env = mock_env()
+        env['REMOTE_ADDR'] = '127.0.0.1'
+        env['HTTP_FORWARDED'] = 'for="[2001:db8::1]:4711";proto=https;host=example.com, for=10.0.0.1'
+        with patch.object(Request, 'trusted_proxies', ['127.0.0.1', '10.0.0.0/8']):
+            request = Request(env)
+            self.assertEqual(request.ip, '2001:db8::1')
+            self.assertEqual(request.base_url, 'https://example.com')
+
+    def test_client_cannot_spoof_host_and_proto_in_the_forwarded_header(self):
+        env = mock_env()
+        env['REMOTE_ADDR'] = '10.0.0.2'
+        env['HTTP_FORWARDED'] = 'for=6.6.6.6;proto=http;host=evil.com, for=198.51.100.7;proto=https;host=app.example.com'
+        with patch.object(Request, 'trusted_proxies', ['10.0.0.0/8']):
+            request = Request(env)
+            self.assertEqual(request.ip, '198.51.100.7')
+            self.assertEqual(request.base_url, 'https://app.example.com')
+
+    def test_client_cannot_spoof_x_forwarded_host_and_proto(self):
+        env = mock_env()
+        env['REMOTE_ADDR'] = '10.0.0.2'
+        env['HTTP_X_FORWARDED_FOR'] = '6.6.6.6, 198.51.100.7'
+        env['HTTP_X_FORWARDED_PROTO'] = 'http, https'
+        env['HTTP_X_FORWARDED_HOST'] = 'evil.com, app.example.com'
+        with patch.object(Request, 'trusted_proxies', ['10.0.0.0/8']):
+            request = Request(env)
+            self.assertEqual(request.ip, '198.51.100.7')
+            self.assertEqual(request.base_url, 'https://app.example.com')
+
+    def test_untrusted_peer_cannot_spoof_forwarded_headers(self):
+        env = mock_env()
+        env['REMOTE_ADDR'] = '198.51.100.7'
+        env['HTTP_X_FORWARDED_FOR'] = '203.0.113.195'
+        env['HTTP_X_FORWARDED_PROTO'] = 'https'
+        with patch.object(Request, 'trusted_proxies', ['10.0.0.0/8']):
+            request = Request(env)
+            self.assertEqual(request.ip, '198.51.100.7')
+            self.assertEqual(request.scheme, 'http')
+
+    def test_copy_shares_the_environment_but_not_the_params(self):
+        request = Request(mock_env())
+        request.params = {'id': '1'}
+        copy = request.copy()
+        copy.params['id'] = '2'
+        self.assertIs(copy.env, request.env)
+        self.assertEqual(copy.url, request.url)
+        self.assertEqual(request.params, {'id': '1'})
+
+    def test_request_has_no_instance_dict(self):
+        with self.assertRaises(AttributeError):
+            Request(mock_env()).foo = 'bar'
+
     def test_referer(self):
         env = mock_env()
         env['HTTP_REFERER'] = 'http://localhost:8000/app/hello'
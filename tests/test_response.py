@@ -1,3 +1,4 @@
+import json
 import os.path
 from datetime import datetime
 from http.cookies import CookieError
@@ -6,8 +7,9 @@ from types import GeneratorType
 
 from unittest import TestCase
 from unittest.mock import Mock
+import asyncio
 
-from vertx import Response
+from vertx import Node, Request, Response
 
 
 class BasicResponseTestCase(TestCase):
@@ -40,11 +42,49 @@ class BasicResponseTestCase(TestCase):
         response.body = {'foo': 'bar'}
         self.assertEqual(response.body, b"{'foo': 'bar'}")
 
+    def test_iterators_are_kept_as_streamed_bodies(self):
+        response = Response()
+        chunks = iter([b'a', b'b'])
+        response.body = chunks
+        self.assertIs(response.body, chunks)
+
+    def test_lists_and_tuples_of_chunks_are_streamed_bodies(self):
+        for chunks in ([b'a', 'b'], (b'a', 'b')):
+            response = Response()
+            response.body = chunks
+            self.assertIs(response.body, chunks)
+            self.assertTrue(response.streamed)
+            self.assertEqual(list(response.wsgi(Mock())), [b'a', b'b'])
+
+    def test_setting_bytes_after_stream_replaces_it(self):
+        response = Response()
+        response.body = iter([b'a'])
+        response.body = 'hello'
+        self.assertEqual(response.body, b'hello')
+
+    def test_json_sets_bytes_body_and_content_type(self):
+        response = Response()
+        self.assertIs(response.json({'foo': ['bar', 1]}), response)
+        self.assertEqual(response.headers['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.body), {'foo': ['bar', 1]})
+
+    def test_json_stream_streams_an_array(self):
+        response = Response()
+        response.json_stream(iter([1, {'a': 2}]))
+        self.assertEqual(response.headers['Content-Type'], 'application/json')
+        self.assertEqual(b''.join(response.wsgi(Mock())), b'[1,{"a":2}]')
+
     def test_header_keys_are_case_insensitive(self):
         response = Response()
         response.headers['foo'] = 'bar'
         self.assertEqual(response.headers['FOO'], 'bar')
 
+    def test_halt_flags_the_response_and_returns_it(self):
+        response = Response()
+        self.assertFalse(response.halted)
+        self.assertIs(response.halt(), response)
+        self.assertTrue(response.halted)
+
     def test_response_object_can_be_raised(self):
         response = Response()
         with self.assertRaises(Response):
@@ -98,6 +138,207 @@ class ResponseWsgiTestCase(TestCase):
         self.assertEqual(response._wsgi_body(), (b'hello world',))
 
 
+class ResponseStreamTestCase(TestCase):
+
+    def test_generator_body_is_passed_through_chunk_by_chunk(self):
+        response = Response()
+        response.body = (str(number) for number in range(3))
+        self.assertEqual(list(response.wsgi(Mock())), [b'0', b'1', b'2'])
+
+    def test_streamed_body_does_not_set_content_length(self):
+        response = Response()
+        response.body = iter([b'a'])
+        start_response = Mock()
+        list(response.wsgi(start_response))
+        self.assertEqual(start_response.call_args[0][1], [])
+
+    def test_streamed_body_is_closed_after_iteration(self):
+        closed = []
+        def rows():
+            try:
+                yield b'a'
+                yield b'b'
+            finally:
+                closed.append(True)
+        response = Response()
+        response.body = rows()
+        body = response.wsgi(Mock())
+        next(body)
+        body.close()
+        self.assertEqual(closed, [True])
+
+    def test_async_iterator_body_is_sent_through_asgi(self):
+        async def rows():
+            yield 'a'
+            yield b'b'
+        response = Response()
+        response.body = rows()
+        messages = []
+        async def send(message):
+            messages.append(message)
+        asyncio.run(response.asgi(send))
+        self.assertEqual([message.get('body') for message in messages[1:]], [b'a', b'b', b''])
+
+    def test_sync_iterator_body_is_sent_through_asgi(self):
+        response = Response()
+        response.body = iter([b'a', 'b'])
+        messages = []
+        async def send(message):
+            messages.append(message)
+        asyncio.run(response.asgi(send))
+        self.assertEqual([message.get('body') for message in messages[1:]], [b'a', b'b', b''])
+
+
+class ResponseAsgiTestCase(TestCase):
+
+    def send_asgi(self, response):
+        messages = []
+        async def send(message):
+            messages.append(message)
+        asyncio.run(response.asgi(send))
+        return messages
+
+    def test_asgi_for_filled_response(self):
+        response = Response()
+        response.status = 200
+        response.headers['Content-Type'] = 'text/plain'
+        response.set_cookie('token', 'abc')
+        response.body = 'hello'
+        self.assertEqual(self.send_asgi(response), [
+            {'type': 'http.response.start', 'status': 200, 'headers': [
+                (b'Content-Type', b'text/plain'),
+                (b'Set-Cookie', b'token=abc; HttpOnly; SameSite=Strict'),
+            ]},
+            {'type': 'http.response.body', 'body': b'hello'},
+        ])
+
+    def test_asgi_file_is_sent_in_chunks(self):
+        response = Response()
+        with NamedTemporaryFile() as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.seek(0)
+            response.file(tmpfile.name)
+            messages = self.send_asgi(response)
+        self.assertEqual(messages[1], {'type': 'http.response.body', 'body': b'hello world', 'more_body': True})
+        self.assertEqual(messages[2], {'type': 'http.response.body', 'body': b''})
+
+
+class FrozenResponseTestCase(TestCase):
+
+    def frozen(self):
+        response = Response()
+        response.status = 200
+        response.headers['Content-Type'] = 'application/json'
+        response.set_cookie('token', 'abc')
+        response.body = '{"ok": true}'
+        return response.freeze()
+
+    def test_wsgi_hands_out_precomputed_objects(self):
+        response = self.frozen()
+        calls = []
+        body = response.wsgi(lambda status, headers: calls.append((status, headers)))
+        self.assertEqual(calls[0][0], '200 OK')
+        self.assertEqual(calls[0][1], [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', '12'),
+            ('Set-Cookie', 'token=abc; HttpOnly; SameSite=Strict'),
+        ])
+        self.assertEqual(body, (b'{"ok": true}',))
+        response.wsgi(lambda status, headers: calls.append((status, headers)))
+        self.assertIs(calls[0][0], calls[1][0])
+        self.assertIsNot(calls[0][1], calls[1][1])
+
+    def test_middleware_changing_the_header_list_does_not_leak_across_requests(self):
+        response = self.frozen()
+        node = Node()
+        node.handle = lambda request, r: response
+        sent = []
+        def middleware(env, start_response):
+            def start(status, headers):
+                headers.append(('X-Request-Id', env['id']))
+                sent.append(headers)
+                return start_response(status, headers)
+            return node(env, start)
+        middleware({'id': '1'}, Mock())
+        middleware({'id': '2'}, Mock())
+        self.assertEqual([name for name, value in sent[1]].count('X-Request-Id'), 1)
+        self.assertIn(('X-Request-Id', '2'), sent[1])
+        self.assertNotIn(('X-Request-Id', '1'), sent[1])
+
+    def test_asgi_sends_precomputed_messages(self):
+        messages = []
+        async def send(message):
+            messages.append(message)
+        asyncio.run(self.frozen().asgi(send))
+        self.assertEqual(messages[0]['headers'][1], (b'Content-Length', b'12'))
+        self.assertEqual(messages[1], {'type': 'http.response.body', 'body': b'{"ok": true}'})
+
+    def test_frozen_response_cannot_be_changed(self):
+        response = self.frozen()
+        with self.assertRaises(TypeError):
+            response.status = 500
+        with self.assertRaises(TypeError):
+            response.body = 'changed'
+        with self.assertRaises(TypeError):
+            response.headers['X-Changed'] = '1'
+        with self.assertRaises(TypeError):
+            response.set_cookie('a', 'b')
+
+    def test_copy_returns_a_mutable_response(self):
+        response = self.frozen()
+        copy = response.copy()
+        copy.headers['X-Changed'] = '1'
+        copy.body = 'changed'
+        self.assertFalse(copy.frozen)
+        self.assertEqual(copy.status, 200)
+        self.assertEqual(copy.cookies, ['token=abc; HttpOnly; SameSite=Strict'])
+        self.assertNotIn('X-Changed', response.headers)
+        self.assertEqual(response.body, b'{"ok": true}')
+
+    def test_frozen_response_can_be_raised_and_returned_by_handles(self):
+        response = self.frozen()
+        node = Node()
+        node.handle = lambda request, r: response
+        self.assertIs(node.submit(Request({})), response)
+        def bounce(request, r):
+            raise response
+        node.handle = bounce
+        self.assertIs(node.submit(Request({})), response)
+
+    def test_frozen_response_can_be_halted(self):
+        response = self.frozen()
+        root, child = Node(), Node()
+        root.link(child)
+        root.handle = lambda request, r: response.halt()
+        child.handle = Mock(return_value=Response())
+        result = root.submit(Request({}))
+        self.assertIs(result, response)
+        self.assertFalse(result.halted)
+        self.assertEqual(child.handle.call_count, 0)
+        self.assertTrue(response.halt().halted)
+        self.assertEqual(response.halt().wsgi(Mock()), response.wsgi(Mock()))
+
+    def test_raised_frozen_response_does_not_keep_the_traceback(self):
+        response = self.frozen()
+        node = Node()
+        def bounce(request, r):
+            raise response
+        node.handle = bounce
+        node.submit(Request({}))
+        self.assertIsNone(response.__traceback__)
+
+    def test_streamed_responses_cannot_be_frozen(self):
+        response = Response()
+        response.body = iter([b'a'])
+        with self.assertRaises(ValueError):
+            response.freeze()
+
+    def test_not_modified_response_does_not_get_content_length(self):
+        response = Response()
+        response.status = 304
+        self.assertEqual(response.freeze()._wsgi_headers(), [])
+
+
 class ResponseFileTestCase(TestCase):
 
     def test_file_gets_returned_as_generator_to_wsgi(self):
@@ -122,6 +363,28 @@ class ResponseFileTestCase(TestCase):
                 contents += chunk
             self.assertEqual(contents, b'hello world')
 
+    def test_file_is_handed_to_the_server_file_wrapper_when_available(self):
+        response = Response()
+        file_wrapper = Mock()
+        with NamedTemporaryFile() as tmpfile:
+            response.file(tmpfile.name)
+            body = response.wsgi(Mock(), {'wsgi.file_wrapper': file_wrapper})
+            f, chunk_size = file_wrapper.call_args[0]
+            f.close()
+        self.assertIs(body, file_wrapper.return_value)
+        self.assertEqual(f.name, tmpfile.name)
+        self.assertEqual(chunk_size, Response.file_chunk_size)
+
+    def test_file_is_yielded_in_configurable_chunks(self):
+        response = Response()
+        response.file_chunk_size = 4
+        with NamedTemporaryFile() as tmpfile:
+            tmpfile.write(b'hello world')
+            tmpfile.seek(0)
+            response.file(tmpfile.name)
+            chunks = list(response.wsgi(Mock()))
+        self.assertEqual(chunks, [b'hell', b'o wo', b'rld'])
+
     def test_setting_file_with_specified_mime_type(self):
         response = Response()
         with NamedTemporaryFile() as tmpfile:
@@ -180,6 +443,118 @@ class ResponseFileTestCase(TestCase):
             response.file('foobar.file')
 
 
+class ResponseFileConditionalTestCase(TestCase):
+
+    def setUp(self):
+        self.tmpfile = NamedTemporaryFile(suffix='.txt')
+        self.tmpfile.write(b'0123456789')
+        self.tmpfile.flush()
+
+    def tearDown(self):
+        self.tmpfile.close()
+
+    def file_response(self, **env):
+        response = Response()
+        response.file(self.tmpfile.name, request=Request(env))
+        return response
+
+    def body(self, response):
+        return b''.join(response.wsgi(Mock()))
+
+    def test_file_sets_validators(self):
+        response = Response()
+        response.file(self.tmpfile.name)
+        stat = os.stat(self.tmpfile.name)
+        self.assertEqual(response.headers['ETag'], '"{:x}-{:x}"'.format(stat.st_mtime_ns, stat.st_size))
+        self.assertTrue(response.headers['Last-Modified'].endswith(' GMT'))
+        self.assertEqual(response.headers['Accept-Ranges'], 'bytes')
+
+    def test_file_with_request_is_sent_whole_with_200(self):
+        response = self.file_response()
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.body(response), b'0123456789')
+
+    def test_matching_if_none_match_gives_bodyless_304(self):
+        etag = self.file_response().headers['ETag']
+        response = self.file_response(HTTP_IF_NONE_MATCH='"other", ' + etag)
+        self.assertEqual(response.status, 304)
+        self.assertNotIn('Content-Length', response.headers)
+        self.assertEqual(self.body(response), b'')
+
+    def test_different_if_none_match_sends_the_file(self):
+        response = self.file_response(HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(response.status, 200)
+
+    def test_if_modified_since_after_mtime_gives_304(self):
+        response = self.file_response(HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status, 304)
+
+    def test_if_modified_since_before_mtime_sends_the_file(self):
+        response = self.file_response(HTTP_IF_MODIFIED_SINCE='Thu, 01 Jan 1970 00:00:00 GMT')
+        self.assertEqual(response.status, 200)
+
+    def test_invalid_if_modified_since_is_ignored(self):
+        response = self.file_response(HTTP_IF_MODIFIED_SINCE='yesterday')
+        self.assertEqual(response.status, 200)
+
+    def test_single_range(self):
+        response = self.file_response(HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status, 206)
+        self.assertEqual(response.headers['Content-Range'], 'bytes 2-5/10')
+        self.assertEqual(response.headers['Content-Length'], '4')
+        self.assertEqual(self.body(response), b'2345')
+
+    def test_open_ended_and_suffix_ranges(self):
+        self.assertEqual(self.body(self.file_response(HTTP_RANGE='bytes=7-')), b'789')
+        self.assertEqual(self.body(self.file_response(HTTP_RANGE='bytes=-3')), b'789')
+        self.assertEqual(self.body(self.file_response(HTTP_RANGE='bytes=8-100')), b'89')
+
+    def test_ranges_are_not_handed_to_the_file_wrapper(self):
+        response = self.file_response(HTTP_RANGE='bytes=0-1')
+        body = response.wsgi(Mock(), {'wsgi.file_wrapper': Mock()})
+        self.assertEqual(b''.join(body), b'01')
+
+    def test_multiple_ranges_are_sent_as_multipart(self):
+        response = self.file_response(HTTP_RANGE='bytes=0-1, 5-6')
+        self.assertEqual(response.status, 206)
+        content_type = response.headers['Content-Type']
+        self.assertTrue(content_type.startswith('multipart/byteranges; boundary='))
+        boundary = content_type.split('=')[1]
+        body = self.body(response)
+        self.assertEqual(len(body), int(response.headers['Content-Length']))
+        self.assertEqual(body, (
+            '\r\n--{0}\r\nContent-Type: text/plain\r\nContent-Range: bytes 0-1/10\r\n\r\n01'
+            '\r\n--{0}\r\nContent-Type: text/plain\r\nContent-Range: bytes 5-6/10\r\n\r\n56'
+            '\r\n--{0}--\r\n'
+        ).format(boundary).encode('latin-1'))
+
+    def test_unsatisfiable_range_gives_416(self):
+        response = self.file_response(HTTP_RANGE='bytes=20-30')
+        self.assertEqual(response.status, 416)
+        self.assertEqual(response.headers['Content-Range'], 'bytes */10')
+        self.assertEqual(self.body(response), b'')
+
+    def test_open_ended_range_past_the_end_gives_416(self):
+        for header in ('bytes=10-', 'bytes=1000-'):
+            response = self.file_response(HTTP_RANGE=header)
+            self.assertEqual(response.status, 416)
+            self.assertEqual(response.headers['Content-Range'], 'bytes */10')
+
+    def test_malformed_range_is_ignored(self):
+        response = self.file_response(HTTP_RANGE='bytes=5-2')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.body(response), b'0123456789')
+
+    def test_stale_if_range_sends_the_whole_file(self):
+        response = self.file_response(HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status, 200)
+
+    def test_matching_if_range_sends_the_range(self):
+        etag = self.file_response().headers['ETag']
+        response = self.file_response(HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status, 206)
+
+
 class ResponseCookiesTestCase(TestCase):
 
     def test_set_cookie_with_default_configs(self):
@@ -0,0 +1,118 @@
+from unittest import TestCase
+
+from vertx import Node
+from vertx.router import Router
+
+
+def route(method=None, path=None):
+    node = Node()
+    node.http_method = method
+    node.http_path = path
+    return node
+
+
+class RouterTestCase(TestCase):
+
+    def test_unrouted_nodes_always_match(self):
+        a, b = Node(), Node()
+        router = Router([a, b])
+        self.assertEqual(router.match('GET', '/'), [(a, None), (b, None)])
+
+    def test_static_path_matches_method_and_path(self):
+        home, about = route('get', '/'), route('get', '/about')
+        router = Router([home, about])
+        self.assertEqual(router.match('GET', '/about'), [(about, {})])
+
+    def test_static_path_does_not_match_other_methods(self):
+        node = route('post', '/users')
+        router = Router([node])
+        self.assertEqual(router.match('GET', '/users'), [])
+
+    def test_route_without_method_matches_any_method(self):
+        node = route(path='/users')
+        router = Router([node])
+        self.assertEqual(router.match('DELETE', '/users'), [(node, {})])
+
+    def test_route_without_path_matches_any_path(self):
+        node = route(method='get')
+        router = Router([node])
+        self.assertEqual(router.match('GET', '/anything'), [(node, None)])
+        self.assertEqual(router.match('POST', '/anything'), [])
+
+    def test_parameterized_path_captures_params(self):
+        node = route('get', '/users/{id}/posts/{post}')
+        router = Router([node])
+        self.assertEqual(router.match('GET', '/users/7/posts/42'), [(node, {'id': '7', 'post': '42'})])
+
+    def test_parameterized_path_does_not_match_empty_segment(self):
+        node = route('get', '/users/{id}')
+        router = Router([node])
+        self.assertEqual(router.match('GET', '/users/'), [])
+
+    def test_static_and_parameterized_matches_keep_link_order(self):
+        middleware, param, static = Node(), route('get', '/users/{id}'), route('get', '/users/me')
+        router = Router([middleware, param, static])
+        self.assertEqual(router.match('GET', '/users/me'), [(middleware, None), (param, {'id': 'me'}), (static, {})])
+
+    def test_head_requests_match_get_routes(self):
+        get, head, post = route('get', '/'), route('head', '/'), route('post', '/')
+        param = route('get', '/users/{id}')
+        router = Router([get, head, post, param])
+        self.assertEqual(router.match('HEAD', '/'), [(get, {}), (head, {})])
+        self.assertEqual(router.match('HEAD', '/users/7'), [(param, {'id': '7'})])
+        self.assertEqual(router.match('GET', '/'), [(get, {})])
+
+    def test_missing_path_matches_no_parameterized_route(self):
+        any_path, param = route('get'), route('get', '/users/{id}')
+        router = Router([any_path, param])
+        self.assertEqual(router.match('GET', None), [(any_path, None)])
+
+
+class NodeRoutingTestCase(TestCase):
+
+    def test_submit_only_visits_matching_sub_nodes(self):
+        root, users, posts = Node(), route('get', '/users'), route('get', '/posts')
+        root.link(users)
+        root.link(posts)
+        visited = []
+        users.handle = lambda request, response: visited.append('users') or response
+        posts.handle = lambda request, response: visited.append('posts') or response
+        env = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/posts'}
+        root(env, lambda status, headers: None)
+        self.assertEqual(visited, ['posts'])
+
+    def test_route_params_are_set_on_request(self):
+        root, user = Node(), route('get', '/users/{id}')
+        root.link(user)
+        params = []
+        user.handle = lambda request, response: params.append(request.params) or response
+        root({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/users/7'}, lambda status, headers: None)
+        self.assertEqual(params, [{'id': '7'}])
+
+    def test_routed_root_does_not_handle_unmatched_requests(self):
+        root = route('get', '/')
+        root.handle = lambda request, response: self.fail('root should not be handled')
+        statuses = []
+        root({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/missing'}, lambda status, headers: statuses.append(status))
+        self.assertEqual(statuses, ['404 Not Found'])
+
+    def test_route_params_are_not_shared_between_requests(self):
+        root, static, param = Node(), route('get', '/a'), route('get', '/users/{id}')
+        root.link(static)
+        root.link(param)
+        seen = []
+        def handle(request, response):
+            request.params['seen'] = request.params.get('seen', 0) + 1
+            seen.append(dict(request.params))
+            return response
+        static.handle = param.handle = handle
+        for path in ('/a', '/a', '/users/7', '/users/7'):
+            root({'REQUEST_METHOD': 'GET', 'PATH_INFO': path}, lambda status, headers: None)
+        self.assertEqual(seen, [{'seen': 1}, {'seen': 1}, {'id': '7', 'seen': 1}, {'id': '7', 'seen': 1}])
+
+    def test_request_without_path_info_reaches_a_routed_graph(self):
+        root, user = Node(), route('get', '/users/{id}')
+        root.link(user)
+        statuses = []
+        root({}, lambda status, headers: statuses.append(status))
+        self.assertEqual(statuses, ['404 Not Found'])
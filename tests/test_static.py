@@ -0,0 +1,141 @@
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+import gzip
+import os
+
+from vertx import Node, Request
+from vertx.static import StaticFiles
+
+
+def get(node, path, method='GET', **env):
+    env.update({'REQUEST_METHOD': method, 'PATH_INFO': path})
+    return node.submit(Request(env))
+
+
+def body(response):
+    return b''.join(response.chunks())
+
+
+class StaticFilesTestCase(TestCase):
+
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, 'public')
+        os.makedirs(os.path.join(self.directory, 'css'))
+        self.write('css/site.css', b'body { color: red }')
+        self.write('index.html', b'<h1>home</h1>')
+        with open(os.path.join(self.tmp.name, 'secret.txt'), 'wb') as f:
+            f.write(b'secret')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_serves_files_under_the_prefix(self):
+        static = StaticFiles(self.directory, prefix='/static')
+        response = get(static, '/static/css/site.css')
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.headers['Content-Type'], 'text/css')
+        self.assertEqual(response.headers['Content-Length'], '19')
+        self.assertIn('ETag', response.headers)
+        self.assertEqual(body(response), b'body { color: red }')
+
+    def test_directories_serve_their_index(self):
+        self.assertEqual(body(get(StaticFiles(self.directory), '/')), b'<h1>home</h1>')
+
+    def test_other_paths_and_methods_are_left_alone(self):
+        static = StaticFiles(self.directory, prefix='/static')
+        self.assertEqual(get(static, '/css/site.css').status, 404)
+        self.assertEqual(get(static, '/static/css/site.css', 'POST').status, 404)
+        self.assertEqual(get(static, '/static/missing.css').status, 404)
+
+    def test_head_requests_get_headers_only(self):
+        response = get(StaticFiles(self.directory), '/css/site.css', 'HEAD')
+        self.assertEqual(response.headers['Content-Length'], '19')
+        self.assertEqual(body(response), b'')
+
+    def test_path_traversal_is_rejected(self):
+        static = StaticFiles(self.directory)
+        for path in ('/../secret.txt', '/css/../../secret.txt', '/..%2fsecret.txt', '/css\\..\\..\\secret.txt', '/a\0b'):
+            self.assertEqual(get(static, path).status, 404, path)
+
+    def test_symlinks_leaving_the_directory_are_rejected(self):
+        os.symlink(os.path.join(self.tmp.name, 'secret.txt'), os.path.join(self.directory, 'link.txt'))
+        self.assertEqual(get(StaticFiles(self.directory), '/link.txt').status, 404)
+
+    def test_small_files_are_cached_in_memory(self):
+        static = StaticFiles(self.directory)
+        get(static, '/css/site.css')
+        with patch('vertx.static.os.stat') as stat, patch('vertx.static.mimetypes.guess_type') as guess_type:
+            response = get(static, '/css/site.css')
+        stat.assert_not_called()
+        guess_type.assert_not_called()
+        self.assertEqual(response.body, b'body { color: red }')
+        self.assertEqual(static.size, 19)
+
+    def test_large_files_are_streamed_from_disk(self):
+        self.write('big.bin', b'x' * 1000)
+        static = StaticFiles(self.directory, max_size=100)
+        response = get(static, '/big.bin')
+        self.assertTrue(response.streamed)
+        self.assertEqual(body(response), b'x' * 1000)
+        self.assertEqual(static.size, 0)
+
+    def test_cache_is_bounded(self):
+        static = StaticFiles(self.directory, cache_size=20)
+        get(static, '/css/site.css')
+        get(static, '/index.html')
+        self.assertEqual(list(static._entries), ['index.html'])
+        self.assertEqual(static.size, 13)
+
+    def test_conditional_requests_get_not_modified(self):
+        static = StaticFiles(self.directory)
+        etag = get(static, '/css/site.css').headers['ETag']
+        response = get(static, '/css/site.css', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status, 304)
+        self.assertEqual(response.body, b'')
+
+    def test_ranges_are_served(self):
+        response = get(StaticFiles(self.directory), '/css/site.css', HTTP_RANGE='bytes=0-3')
+        self.assertEqual(response.status, 206)
+        self.assertEqual(body(response), b'body')
+
+    def test_precompressed_variants_are_served_when_accepted(self):
+        self.write('css/site.css.gz', gzip.compress(b'body { color: red }'))
+        static = StaticFiles(self.directory)
+        response = get(static, '/css/site.css', HTTP_ACCEPT_ENCODING='br, gzip')
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(response.headers['Content-Type'], 'text/css')
+        self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(body(response)), b'body { color: red }')
+        identity = get(static, '/css/site.css', HTTP_ACCEPT_ENCODING='identity')
+        self.assertNotIn('Content-Encoding', identity.headers)
+        self.assertEqual(identity.headers['Vary'], 'Accept-Encoding')
+        self.assertNotEqual(identity.headers['ETag'], response.headers['ETag'])
+
+    def test_changed_files_are_reloaded_when_watching(self):
+        static = StaticFiles(self.directory, check_interval=0)
+        get(static, '/index.html')
+        path = self.write('index.html', b'<h1>changed</h1>')
+        os.utime(path, ns=(0, 10 ** 18))
+        self.assertEqual(body(get(static, '/index.html')), b'<h1>changed</h1>')
+
+    def test_files_are_cached_until_checked_when_not_watching(self):
+        static = StaticFiles(self.directory)
+        get(static, '/index.html')
+        os.unlink(os.path.join(self.directory, 'index.html'))
+        self.assertEqual(body(get(static, '/index.html')), b'<h1>home</h1>')
+
+    def test_works_as_a_sub_node(self):
+        root = Node()
+        root.link(StaticFiles(self.directory, prefix='/static/'))
+        statuses = []
+        chunks = root({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/static/index.html'}, lambda status, headers: statuses.append(status))
+        self.assertEqual(statuses, ['200 OK'])
+        self.assertEqual(b''.join(chunks), b'<h1>home</h1>')
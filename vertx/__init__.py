@@ -1,3 +1,4 @@
 from .node import Node
 from .request import Request
+from .asgi_request import AsgiRequest
 from .response import Response
@@ -0,0 +1,220 @@
+from collections import deque
+from threading import Thread, Lock, Event
+from time import perf_counter, time, gmtime
+import atexit
+import json
+import os
+import random
+import socket
+import weakref
+
+from .node import Node
+from .response import Response
+from .cookies import MONTHS
+
+
+class AccessLog(Node):
+
+    def __init__(self, output, format='common', max_queue=10000, batch_size=256, flush_interval=1.0, sample=1.0):
+        super().__init__()
+        self.writer = writer(output)
+        self.format = FORMATS[format]
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample = sample
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self._records = deque()
+        self._wake = Event()
+        self._stop = False
+        self._thread = None
+        self._lock = Lock()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=partial_reset(self))
+
+    def submit(self, request, response=None):
+        started = perf_counter()
+        try:
+            response = super().submit(request, response)
+        except Response as r:
+            self.log(request, r, perf_counter() - started)
+            raise
+        except Exception:
+            self.log(request, None, perf_counter() - started)
+            raise
+        self.log(request, response, perf_counter() - started)
+        return response
+
+    async def submit_async(self, request, response=None):
+        started = perf_counter()
+        try:
+            response = await super().submit_async(request, response)
+        except Response as r:
+            self.log(request, r, perf_counter() - started)
+            raise
+        except Exception:
+            self.log(request, None, perf_counter() - started)
+            raise
+        self.log(request, response, perf_counter() - started)
+        return response
+
+    def log(self, request, response, seconds):
+        if self.sample < 1.0 and random.random() >= self.sample:
+            return
+        if self._thread is None:
+            self.start()
+        env = request.env
+        record = (
+            time(), env.get('REMOTE_ADDR'), env.get('REQUEST_METHOD'), env.get('PATH_INFO'),
+            env.get('QUERY_STRING'), env.get('SERVER_PROTOCOL'), 500 if response is None else response.status,
+            None if response is None else body_size(response), seconds, env.get('HTTP_REFERER'),
+            env.get('HTTP_USER_AGENT'),
+        )
+        records = self._records
+        if len(records) >= self.max_queue:
+            self.dropped += 1
+            return
+        records.append(record)
+        if len(records) == self.batch_size:
+            self._wake.set()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop = False
+            self._thread = Thread(target=self._run, name='vertx-access-log', daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def close(self):
+        thread = self._thread
+        if thread is not None:
+            self._stop = True
+            self._wake.set()
+            thread.join()
+            self._thread = None
+        close = getattr(self.writer, 'close', None)
+        if close is not None:
+            close()
+
+    def _run(self):
+        records = self._records
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            stop = self._stop
+            while records:
+                batch = []
+                while records and len(batch) < self.batch_size:
+                    batch.append(records.popleft())
+                try:
+                    self.writer.write_lines([self.format(record) for record in batch])
+                    self.written += len(batch)
+                except Exception:
+                    self.errors += len(batch)
+            if stop:
+                return
+
+    def _reset(self):
+        self._records = deque()
+        self._wake = Event()
+        self._thread = None
+        self._lock = Lock()
+
+
+class StreamWriter(object):
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write_lines(self, lines):
+        self.stream.write('\n'.join(lines) + '\n')
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+class FileWriter(StreamWriter):
+
+    def __init__(self, path):
+        super().__init__(open(path, 'a', encoding='utf-8'))
+
+    def close(self):
+        self.stream.close()
+
+
+class SyslogWriter(object):
+
+    def __init__(self, address='/dev/log', facility=16, tag='vertx'):
+        self.address = address
+        self.prefix = '<{}>{}: '.format(facility * 8 + 6, tag)
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.socket = socket.socket(family, socket.SOCK_DGRAM)
+
+    def write_lines(self, lines):
+        for line in lines:
+            self.socket.sendto((self.prefix + line).encode('utf-8'), self.address)
+
+    def close(self):
+        self.socket.close()
+
+
+def partial_reset(log):
+    ref = weakref.ref(log)
+    def reset():
+        log = ref()
+        if log is not None:
+            log._reset()
+    return reset
+
+
+def writer(output):
+    if isinstance(output, str):
+        return FileWriter(output)
+    if hasattr(output, 'write_lines'):
+        return output
+    return StreamWriter(output)
+
+
+def body_size(response):
+    length = response.headers.get('Content-Length')
+    if length is not None:
+        return int(length)
+    if response.streamed:
+        return None
+    return len(response.body)
+
+
+def format_common(record):
+    timestamp, ip, method, path, query, protocol, status, size, seconds, referer, user_agent = record
+    if query:
+        path += '?' + query
+    return '{} - - [{}] "{} {} {}" {} {}'.format(
+        ip or '-', format_time(timestamp), method, path, protocol or 'HTTP/1.1', status, '-' if size is None else size)
+
+
+def format_combined(record):
+    referer, user_agent = record[9], record[10]
+    return '{} "{}" "{}"'.format(format_common(record), referer or '-', user_agent or '-')
+
+
+def format_json(record):
+    timestamp, ip, method, path, query, protocol, status, size, seconds, referer, user_agent = record
+    return json.dumps({
+        'time': timestamp, 'ip': ip, 'method': method, 'path': path, 'query': query, 'protocol': protocol,
+        'status': status, 'bytes': size, 'duration_ms': round(seconds * 1e3, 3), 'referer': referer,
+        'user_agent': user_agent,
+    }, separators=(',', ':'))
+
+
+def format_time(timestamp):
+    t = gmtime(timestamp)
+    return '{:02d}/{}/{:04d}:{:02d}:{:02d}:{:02d} +0000'.format(
+        t.tm_mday, MONTHS[t.tm_mon - 1], t.tm_year, t.tm_hour, t.tm_min, t.tm_sec)
+
+
+FORMATS = {'common': format_common, 'combined': format_combined, 'json': format_json}
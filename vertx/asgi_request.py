@@ -0,0 +1,69 @@
+from .request import Request, check_body_size
+from .exceptions import BodyNotRead
+
+
+class AsgiRequest(Request):
+
+    __slots__ = ('scope', 'receive')
+
+    def __init__(self, scope, receive):
+        super().__init__(scope_to_env(scope))
+        self.scope = scope
+        self.receive = receive
+
+    @property
+    def body(self):
+        if self._body is None:
+            raise BodyNotRead('Asgi request body must be read with "await request.read()" first.')
+        return self._body
+
+    def _chunks(self, max_body_size=None):
+        return (self.body,)
+
+    async def read(self, max_body_size=None):
+        if self._body is None:
+            self._body = b''.join([chunk async for chunk in self.stream(max_body_size=max_body_size)])
+        return self._body
+
+    async def stream(self, chunk_size=None, max_body_size=None):
+        if self._body is not None:
+            yield self._body
+            return
+        max_body_size = self.max_body_size if max_body_size is None else max_body_size
+        check_body_size(self.content_length, max_body_size)
+        received = 0
+        more_body = True
+        while more_body:
+            message = await self.receive()
+            if message['type'] == 'http.disconnect':
+                return
+            chunk = message.get('body', b'')
+            received += len(chunk)
+            check_body_size(received, max_body_size)
+            yield chunk
+            more_body = message.get('more_body', False)
+
+
+def scope_to_env(scope):
+    env = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', ''),
+        'PATH_INFO': scope['path'],
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_PROTOCOL': 'HTTP/' + scope.get('http_version', '1.1'),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'asgi.scope': scope,
+    }
+    if scope.get('client'):
+        env['REMOTE_ADDR'], env['REMOTE_PORT'] = scope['client'][0], str(scope['client'][1])
+    if scope.get('server'):
+        env['SERVER_NAME'], env['SERVER_PORT'] = scope['server'][0], str(scope['server'][1])
+    for name, value in scope.get('headers', ()):
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = 'HTTP_' + key
+        value = value.decode('latin-1')
+        if key in env:
+            value = env[key] + ('; ' if key == 'HTTP_COOKIE' else ',') + value
+        env[key] = value
+    return env
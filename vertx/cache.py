@@ -0,0 +1,183 @@
+from collections import OrderedDict
+from hashlib import sha1
+from threading import Event, Lock
+from time import time
+import asyncio
+import os
+import pickle
+import tempfile
+
+from .node import Node
+from .response import Response
+
+
+class Cache(Node):
+
+    methods = ('GET', 'HEAD')
+    statuses = (200,)
+
+    def __init__(self, backend=None, ttl=60, vary=()):
+        super().__init__()
+        self.backend = MemoryBackend() if backend is None else backend
+        self.ttl = ttl
+        self.vary = tuple(vary)
+        self._varied = frozenset(header.lower() for header in self.vary)
+        self._guard = Lock()
+        self._pending = {}
+        self._async_pending = {}
+
+    def key(self, request):
+        env = request.env
+        method = env.get('REQUEST_METHOD')
+        if method not in self.methods:
+            return None
+        key = (method, env.get('HTTP_HOST', ''), env.get('PATH_INFO', ''), env.get('QUERY_STRING', ''))
+        if self.vary:
+            key += tuple(request.headers.get(header, '') for header in self.vary)
+        return key
+
+    def submit(self, request, response=None):
+        key = self.key(request)
+        if key is None:
+            return super().submit(request, response)
+        entry = self.backend.get(key)
+        if entry is None:
+            with self._guard:
+                pending = self._pending.get(key)
+                if pending is None:
+                    event = self._pending[key] = Event()
+            if pending is not None:
+                pending.wait()
+                entry = self.backend.get(key)
+            if entry is None:
+                try:
+                    response = super().submit(request, response)
+                    self.store(key, response)
+                finally:
+                    if pending is None:
+                        with self._guard:
+                            del self._pending[key]
+                        event.set()
+                return response
+        raise restore(entry)
+
+    async def submit_async(self, request, response=None):
+        key = self.key(request)
+        if key is None:
+            return await super().submit_async(request, response)
+        entry = self.backend.get(key)
+        if entry is None:
+            pending = self._async_pending.get(key)
+            if pending is not None:
+                await asyncio.shield(pending)
+                entry = self.backend.get(key)
+            else:
+                future = self._async_pending[key] = asyncio.get_running_loop().create_future()
+            if entry is None:
+                try:
+                    response = await super().submit_async(request, response)
+                    self.store(key, response)
+                finally:
+                    if pending is None:
+                        del self._async_pending[key]
+                        future.set_result(None)
+                return response
+        raise restore(entry)
+
+    def store(self, key, response):
+        if response.status not in self.statuses or response.streamed or response.cookies:
+            return
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if 'no-store' in cache_control or 'private' in cache_control:
+            return
+        varied = {header.strip().lower() for header in response.headers.get('Vary', '').split(',') if header.strip()}
+        if not varied <= self._varied:
+            return
+        entry = (response.status, list(response.headers.list()), response.body)
+        self.backend.set(key, entry, self.ttl)
+
+
+class MemoryBackend(object):
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 ** 2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires, size, entry = item
+            if expires < time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry, ttl):
+        size = entry_size(entry)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time() + ttl, size, entry)
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        expires, size, entry = self._entries.pop(key)
+        self.size -= size
+
+
+class FileBackend(object):
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key):
+        return os.path.join(self.directory, sha1(repr(key).encode('utf-8')).hexdigest() + '.cache')
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                stored_key, expires, entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if stored_key != key:
+            return None
+        if expires < time():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+        return entry
+
+    def set(self, key, entry, ttl):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((key, time() + ttl, entry), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path(key))
+
+
+def entry_size(entry):
+    status, headers, body = entry
+    return len(body) + sum(len(name) + len(value) for name, value in headers)
+
+
+def restore(entry):
+    status, headers, body = entry
+    response = Response()
+    response.status = status
+    for name, value in headers:
+        response.headers.add(name, value)
+    response.body = body
+    return response
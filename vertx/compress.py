@@ -0,0 +1,149 @@
+from weakref import WeakKeyDictionary
+import zlib
+
+from .node import Node
+from .response import encode_chunk
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+UNCOMPRESSIBLE_TYPES = (
+    'image/', 'video/', 'audio/', 'font/woff', 'application/zip', 'application/gzip', 'application/x-gzip',
+    'application/x-bzip2', 'application/x-xz', 'application/x-7z-compressed', 'application/x-rar-compressed',
+    'application/octet-stream', 'multipart/byteranges',
+)
+
+COMPRESSIBLE_IMAGES = ('image/svg+xml', 'image/x-icon')
+
+
+class Compress(Node):
+
+    def __init__(self, level=6, minimum_size=500):
+        super().__init__()
+        self.level = level
+        self.minimum_size = minimum_size
+        self.encodings = ('br', 'gzip', 'deflate') if brotli else ('gzip', 'deflate')
+        self._frozen = WeakKeyDictionary()
+
+    def handle(self, request, response):
+        if not self._compressible(request, response):
+            return response
+        if response.frozen:
+            return self._handle_frozen(request, response)
+        vary(response, 'Accept-Encoding')
+        encoding = self.negotiate(request.env.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        body = response.body
+        compressor = self.compressor(encoding)
+        if hasattr(body, '__anext__'):
+            response.body = compress_async(body, compressor)
+            response.headers.pop('Content-Length', None)
+        elif response.streamed:
+            response.body = compress(response.chunks(), compressor)
+            response.headers.pop('Content-Length', None)
+        else:
+            response.body = compressor.compress(body) + compressor.flush()
+            response.headers['Content-Length'] = str(len(response.body))
+        response.headers['Content-Encoding'] = encoding
+        response.headers.pop('Accept-Ranges', None)
+        etag = response.headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            response.headers['ETag'] = 'W/' + etag
+        return response
+
+    def _handle_frozen(self, request, response):
+        encoding = self.negotiate(request.env.get('HTTP_ACCEPT_ENCODING', ''))
+        variants = self._frozen.get(response)
+        if variants is None:
+            variants = self._frozen.setdefault(response, {})
+        if encoding not in variants:
+            variants[encoding] = self.handle(request, response.copy()).freeze()
+        return variants[encoding]
+
+    def _compressible(self, request, response):
+        if response.status < 200 or response.status in (204, 206, 304):
+            return False
+        if request.env.get('REQUEST_METHOD') == 'HEAD' or not (response.streamed or response.body):
+            return False
+        if 'Content-Encoding' in response.headers or 'Content-Range' in response.headers:
+            return False
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type.startswith(UNCOMPRESSIBLE_TYPES) and content_type not in COMPRESSIBLE_IMAGES:
+            return False
+        if 'Content-Length' in response.headers:
+            return int(response.headers['Content-Length']) >= self.minimum_size
+        return response.streamed or len(response.body) >= self.minimum_size
+
+    def negotiate(self, accept_encoding):
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in self.encodings:
+            if accepted.get(encoding, accepted.get('*', 0)) > 0:
+                return encoding
+        return None
+
+    def compressor(self, encoding):
+        if encoding == 'br':
+            return BrotliCompressor(self.level)
+        if encoding == 'gzip':
+            return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return zlib.compressobj(self.level)
+
+
+class BrotliCompressor(object):
+
+    def __init__(self, level):
+        self._compressor = brotli.Compressor(quality=min(level, 11))
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.finish()
+
+
+def parse_accept_encoding(accept_encoding):
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    return accepted
+
+
+def vary(response, header):
+    current = response.headers.get('Vary')
+    if not current:
+        response.headers['Vary'] = header
+    elif header.lower() not in [value.strip().lower() for value in current.split(',')]:
+        response.headers['Vary'] = current + ', ' + header
+
+
+def compress(chunks, compressor):
+    try:
+        for chunk in chunks:
+            chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+        yield compressor.flush()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+async def compress_async(chunks, compressor):
+    async for chunk in chunks:
+        chunk = compressor.compress(encode_chunk(chunk))
+        if chunk:
+            yield chunk
+    yield compressor.flush()
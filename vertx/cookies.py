@@ -0,0 +1,62 @@
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+from functools import lru_cache
+from http.cookies import Morsel, SimpleCookie
+import binascii
+import hashlib
+import hmac
+import re
+import time
+
+
+SAFE_COOKIE = re.compile(r"[\w!#$%&'*+\-.^`|~:]+", re.ASCII).fullmatch
+
+WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+def serialize(key, value):
+    value = str(value)
+    if SAFE_COOKIE(key) and SAFE_COOKIE(value) and key.lower() not in Morsel._reserved:
+        return key + '=' + value
+    return SimpleCookie({key: value}).get(key).OutputString()
+
+
+@lru_cache(maxsize=256)
+def format_expires(expires):
+    return '{}, {:02d} {} {:04d} {:02d}:{:02d}:{:02d} GMT'.format(
+        WEEKDAYS[expires.weekday()], expires.day, MONTHS[expires.month - 1], expires.year,
+        expires.hour, expires.minute, expires.second)
+
+
+def sign(value, secret, timestamp=None):
+    if timestamp is None:
+        timestamp = int(time.time())
+    payload = encode(value.encode('utf-8')) + '.' + format(timestamp, 'x')
+    return payload + '.' + signature(payload, secret)
+
+
+def unsign(signed, secret, max_age=None):
+    try:
+        data, timestamp, digest = signed.split('.')
+        if not hmac.compare_digest(digest, signature(data + '.' + timestamp, secret)):
+            return None
+        if max_age is not None and int(timestamp, 16) + max_age < time.time():
+            return None
+        return decode(data).decode('utf-8')
+    except (ValueError, binascii.Error):
+        return None
+
+
+def signature(payload, secret):
+    if isinstance(secret, str):
+        secret = secret.encode('utf-8')
+    return encode(hmac.new(secret, payload.encode('utf-8'), hashlib.sha256).digest())
+
+
+def encode(data):
+    return urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def decode(data):
+    return urlsafe_b64decode(data + '=' * (-len(data) % 4))
@@ -4,3 +4,7 @@ class BadLink(Exception):
 
 class BadHandle(Exception):
     pass
+
+
+class BodyNotRead(Exception):
+    pass
@@ -0,0 +1,143 @@
+from time import perf_counter
+
+from .exceptions import BadLink
+from .router import split_path, is_param
+
+
+WHITE, GRAY, BLACK = 0, 1, 2
+
+GRAPH_ATTRIBUTES = ('nodes', '_router', 'frozen', '_routed', 'instrumentation', 'graph', 'pool', '_plans', '_async_plans', '_route', '_index')
+
+
+class Graph(object):
+
+    def __init__(self, root):
+        start = perf_counter()
+        self.root = root
+        self.nodes = []
+        self.order = []
+        self.edges = 0
+        self.depth = 0
+        self.fan_out = 0
+        self.unreachable = []
+        self.deduped = 0
+        self._children = {}
+        self._walk()
+        self.seconds = perf_counter() - start
+
+    def _walk(self):
+        colors = {id(self.root): GRAY}
+        heights = {}
+        self.nodes.append(self.root)
+        self._children[id(self.root)] = []
+        stack = [(self.root, iter(self.root.nodes))]
+        while stack:
+            node, links = stack[-1]
+            child = next(links, None)
+            children = self._children[id(node)]
+            if child is None:
+                stack.pop()
+                colors[id(node)] = BLACK
+                self.order.append(node)
+                heights[id(node)] = 1 + max((heights[id(c)] for c in children), default=0)
+                self.fan_out = max(self.fan_out, len(children))
+                continue
+            if not reachable(node, child):
+                self.unreachable.append((node, child))
+                continue
+            self.edges += 1
+            children.append(child)
+            color = colors.get(id(child), WHITE)
+            if color == GRAY:
+                raise BadLink('A node link must not form a path to itself.')
+            if color == WHITE:
+                colors[id(child)] = GRAY
+                self.nodes.append(child)
+                self._children[id(child)] = []
+                stack.append((child, iter(child.nodes)))
+        self.depth = heights[id(self.root)]
+
+    def prune(self):
+        pruned = set(id(node) for node, child in self.unreachable)
+        for node in self.nodes:
+            if id(node) in pruned:
+                node.nodes[:] = self._children[id(node)]
+                node._router = None
+        return self.unreachable
+
+    def shared_handles(self):
+        groups = {}
+        for node in self.nodes:
+            groups.setdefault(handle_function(node), []).append(node)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def dedupe(self):
+        replacements = {}
+        for group in self.shared_handles():
+            canonical = []
+            for node in group:
+                if node.nodes or node is self.root:
+                    continue
+                for other in canonical:
+                    if equivalent(node, other):
+                        replacements[id(node)] = other
+                        break
+                else:
+                    canonical.append(node)
+        if not replacements:
+            return 0
+        for node in self.nodes:
+            if any(id(child) in replacements for child in node.nodes):
+                node.nodes[:] = [replacements.get(id(child), child) for child in node.nodes]
+                node._router = None
+        self.nodes = [node for node in self.nodes if id(node) not in replacements]
+        self.order = [node for node in self.order if id(node) not in replacements]
+        self.deduped += len(replacements)
+        return len(replacements)
+
+    def summary(self):
+        return {
+            'nodes': len(self.nodes),
+            'edges': self.edges,
+            'depth': self.depth,
+            'fan_out': self.fan_out,
+            'routes': sum(1 for node in self.nodes if node.http_method or node.http_path),
+            'unreachable': len(self.unreachable),
+            'shared_handles': len(self.shared_handles()),
+            'deduped': self.deduped,
+            'seconds': self.seconds,
+        }
+
+
+def reachable(parent, child):
+    if parent.http_method and child.http_method:
+        methods = {parent.http_method.upper(), child.http_method.upper()}
+        if len(methods) > 1 and methods != {'GET', 'HEAD'}:
+            return False
+    if parent.http_path is None or child.http_path is None:
+        return True
+    parent_segments, child_segments = split_path(parent.http_path), split_path(child.http_path)
+    if len(parent_segments) != len(child_segments):
+        return False
+    for a, b in zip(parent_segments, child_segments):
+        if a != b and not (is_param(a) and b) and not (is_param(b) and a):
+            return False
+    return True
+
+
+def handle_function(node):
+    handle = node.handle
+    return getattr(handle, '__func__', handle)
+
+
+def state(node):
+    return {key: value for key, value in vars(node).items() if key not in GRAPH_ATTRIBUTES}
+
+
+def equivalent(node, other):
+    if type(node) is not type(other):
+        return False
+    try:
+        return bool(state(node) == state(other))
+    except Exception:
+        return False
@@ -0,0 +1,190 @@
+from collections.abc import MutableMapping
+
+
+class Headers(object):
+
+    __slots__ = ('_items', '_values')
+
+    def __init__(self, data=None, **kwargs):
+        self._items = []
+        self._values = {}
+        if data is not None or kwargs:
+            self.update(data or (), **kwargs)
+
+    def __setitem__(self, key, value):
+        lower = key.lower()
+        if lower in self._values:
+            self._items = [item for item in self._items if item[0].lower() != lower]
+        self._items.append((key, value))
+        self._values[lower] = value
+
+    def __getitem__(self, key):
+        return self._values[key.lower()]
+
+    def __delitem__(self, key):
+        lower = key.lower()
+        del self._values[lower]
+        self._items = [item for item in self._items if item[0].lower() != lower]
+
+    def __contains__(self, key):
+        return key.lower() in self._values
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self._values)
+
+    def __eq__(self, data):
+        if isinstance(data, (Headers, EnvironHeaders)):
+            return self.to_normalized_dict() == data.to_normalized_dict()
+        return self.to_dict() == data
+
+    def __repr__(self):
+        return str(self.to_dict())
+
+    def add(self, key, value):
+        self._items.append((key, value))
+        self._values.setdefault(key.lower(), value)
+
+    def get(self, key, default=None):
+        return self._values.get(key.lower(), default)
+
+    def get_all(self, key):
+        lower = key.lower()
+        return [value for name, value in self._items if name.lower() == lower]
+
+    def pop(self, key, *default):
+        lower = key.lower()
+        if lower not in self._values:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self._values[lower]
+        del self[key]
+        return value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, data=(), **kwargs):
+        if hasattr(data, 'keys'):
+            data = [(key, data[key]) for key in data.keys()]
+        for key, value in data:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def list(self):
+        return self._items
+
+    def copy(self):
+        headers = Headers()
+        headers._items = list(self._items)
+        headers._values = dict(self._values)
+        return headers
+
+    def to_dict(self):
+        data = {}
+        for name, value in self._items:
+            data.setdefault(name, value)
+        return data
+
+    def to_normalized_dict(self):
+        return dict(self._values)
+
+
+class EnvironHeaders(object):
+
+    __slots__ = ('env',)
+
+    def __init__(self, env):
+        self.env = env
+
+    def __getitem__(self, key):
+        return self.env[environ_key(key)]
+
+    def __setitem__(self, key, value):
+        self.env[environ_key(key)] = value
+
+    def __delitem__(self, key):
+        del self.env[environ_key(key)]
+
+    def __contains__(self, key):
+        return environ_key(key) in self.env
+
+    def __iter__(self):
+        for key in self.env:
+            if key.startswith('HTTP_') or key in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                yield header_name(key)
+
+    def __len__(self):
+        return sum(1 for key in self)
+
+    def __eq__(self, data):
+        if isinstance(data, (Headers, EnvironHeaders)):
+            return self.to_normalized_dict() == data.to_normalized_dict()
+        return self.to_dict() == data
+
+    def __repr__(self):
+        return str(self.to_dict())
+
+    def get(self, key, default=None):
+        return self.env.get(environ_key(key), default)
+
+    def get_all(self, key):
+        value = self.env.get(environ_key(key))
+        if value is None:
+            return []
+        return [item.strip() for item in value.split(',')]
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def to_dict(self):
+        return {name: self.env[environ_key(name)] for name in self}
+
+    def to_normalized_dict(self):
+        return self.to_dict()
+
+
+MutableMapping.register(Headers)
+MutableMapping.register(EnvironHeaders)
+
+ENVIRON_KEYS = {}
+
+
+def environ_key(key):
+    try:
+        return ENVIRON_KEYS[key]
+    except KeyError:
+        pass
+    environ = key.upper().replace('-', '_')
+    if environ not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+        environ = 'HTTP_' + environ
+    if len(ENVIRON_KEYS) < 1024:
+        ENVIRON_KEYS[key] = environ
+    return environ
+
+
+def header_name(key):
+    if key.startswith('HTTP_'):
+        key = key[5:]
+    return key.lower().replace('_', '-')
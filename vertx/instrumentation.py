@@ -0,0 +1,130 @@
+from threading import Lock
+from time import perf_counter
+
+from .node import Node
+from .response import Response
+
+
+class Instrumentation(object):
+
+    def __init__(self, sink, trace=False):
+        self.sink = sink
+        self.trace = trace
+
+    def wrap(self, node, call, awaited):
+        name = type(node).__name__
+        record = self.record
+        if awaited:
+            async def timed(request, response):
+                started = perf_counter()
+                outcome = 'return'
+                try:
+                    response = await call(request, response)
+                    if getattr(response, 'halted', False):
+                        outcome = 'bounce'
+                    return response
+                except Response:
+                    outcome = 'bounce'
+                    raise
+                except Exception:
+                    outcome = 'error'
+                    raise
+                finally:
+                    record(request, name, perf_counter() - started, outcome)
+            return timed
+        def timed(request, response):
+            started = perf_counter()
+            outcome = 'return'
+            try:
+                response = call(request, response)
+                if getattr(response, 'halted', False):
+                    outcome = 'bounce'
+                return response
+            except Response:
+                outcome = 'bounce'
+                raise
+            except Exception:
+                outcome = 'error'
+                raise
+            finally:
+                record(request, name, perf_counter() - started, outcome)
+        return timed
+
+    def record(self, request, name, seconds, outcome):
+        self.sink(name, seconds, outcome)
+        if self.trace:
+            request.env.setdefault('vertx.trace', []).append((name, seconds, outcome))
+
+
+class NodeStats(object):
+
+    def __init__(self, buckets):
+        self.calls = 0
+        self.bounces = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+
+    def record(self, seconds, outcome):
+        self.calls += 1
+        self.seconds += seconds
+        if outcome == 'bounce':
+            self.bounces += 1
+        elif outcome == 'error':
+            self.errors += 1
+        for index, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.bucket_counts[index] += 1
+                break
+
+
+class Registry(object):
+
+    buckets = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    def __init__(self):
+        self.stats = {}
+        self._lock = Lock()
+
+    def __call__(self, name, seconds, outcome):
+        with self._lock:
+            stats = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = NodeStats(self.buckets)
+            stats.record(seconds, outcome)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            stats = sorted(self.stats.items())
+            for metric, attribute in (('calls', 'calls'), ('bounces', 'bounces'), ('errors', 'errors')):
+                lines.append('# TYPE vertx_node_{}_total counter'.format(metric))
+                for name, node_stats in stats:
+                    lines.append('vertx_node_{}_total{{node="{}"}} {}'.format(metric, name, getattr(node_stats, attribute)))
+            lines.append('# TYPE vertx_node_seconds histogram')
+            for name, node_stats in stats:
+                cumulative = 0
+                for bound, count in zip(node_stats.buckets, node_stats.bucket_counts):
+                    cumulative += count
+                    lines.append('vertx_node_seconds_bucket{{node="{}",le="{}"}} {}'.format(name, bound, cumulative))
+                lines.append('vertx_node_seconds_bucket{{node="{}",le="+Inf"}} {}'.format(name, node_stats.calls))
+                lines.append('vertx_node_seconds_sum{{node="{}"}} {}'.format(name, node_stats.seconds))
+                lines.append('vertx_node_seconds_count{{node="{}"}} {}'.format(name, node_stats.calls))
+        return '\n'.join(lines) + '\n'
+
+
+class Metrics(Node):
+
+    http_method = 'get'
+    http_path = '/metrics'
+
+    def __init__(self, registry):
+        super().__init__()
+        self.registry = registry
+
+    def handle(self, request, response):
+        response.status = 200
+        response.headers['Content-Type'] = 'text/plain; version=0.0.4'
+        response.body = self.registry.render()
+        return response
@@ -0,0 +1,42 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def std_dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def std_loads(data):
+    return json.loads(data)
+
+
+if orjson is not None:
+    dumps, loads = orjson.dumps, orjson.loads
+else:
+    dumps, loads = std_dumps, std_loads
+
+
+def use(dumps=None, loads=None):
+    module = globals()
+    if dumps is not None:
+        module['dumps'] = dumps
+    if loads is not None:
+        module['loads'] = loads
+
+
+def iter_array(items, chunk_size=64 * 1024):
+    buffer = bytearray(b'[')
+    separator = b''
+    for item in items:
+        buffer += separator
+        buffer += dumps(item)
+        separator = b','
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b']'
+    yield bytes(buffer)
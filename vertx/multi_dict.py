@@ -0,0 +1,27 @@
+class MultiDict(dict):
+
+    __slots__ = ('_lists',)
+
+    def __init__(self, pairs=()):
+        super().__init__()
+        self._lists = {}
+        for key, value in pairs:
+            self.add(key, value)
+
+    def add(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._lists.setdefault(key, []).append(value)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        self._lists[key] = [value]
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        del self._lists[key]
+
+    def get_all(self, key):
+        return list(self._lists.get(key, ()))
+
+    def lists(self):
+        return [(key, list(values)) for key, values in self._lists.items()]
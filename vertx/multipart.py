@@ -0,0 +1,176 @@
+from tempfile import TemporaryFile
+import re
+import shutil
+
+from .multi_dict import MultiDict
+
+
+HEADER_PARAM = re.compile(r';\s*([^=;\s]+)\s*=\s*("(?:[^"\\]|\\.)*"|[^;]*)')
+
+
+class UploadedFile(object):
+
+    def __init__(self, name, filename, content_type):
+        self.name = name
+        self.filename = filename
+        self.content_type = content_type
+        self.file = TemporaryFile()
+        self.size = 0
+
+    def __repr__(self):
+        return '<{}:{}:{}b>'.format(type(self).__name__, self.filename, self.size)
+
+    def write(self, data):
+        self.file.write(data)
+        self.size += len(data)
+
+    def read(self, *args):
+        return self.file.read(*args)
+
+    def seek(self, *args):
+        return self.file.seek(*args)
+
+    def save(self, path):
+        self.file.seek(0)
+        with open(path, 'wb') as f:
+            shutil.copyfileobj(self.file, f)
+        self.file.seek(0)
+
+    def close(self):
+        self.file.close()
+
+
+class MultipartError(ValueError):
+    pass
+
+
+class MultipartLimit(MultipartError):
+    pass
+
+
+class MultipartParser(object):
+
+    max_header_size = 8 * 1024
+
+    def __init__(self, boundary, max_fields=1000, max_memory_size=1024 ** 2):
+        self.delimiter = b'\r\n--' + boundary.encode('latin-1')
+        self.max_fields = max_fields
+        self.max_memory_size = max_memory_size
+        self.form = MultiDict()
+        self.files = MultiDict()
+        self._fields = 0
+        self._memory_size = 0
+        self._buffer = bytearray(b'\r\n')
+        self._state = 'preamble'
+        self._part = None
+
+    def parse(self, chunks):
+        try:
+            for chunk in chunks:
+                self.feed(chunk)
+                if self._state == 'done':
+                    break
+            if self._state != 'done':
+                raise MultipartError('Multipart body ended before the closing boundary.')
+        except BaseException:
+            self.close()
+            raise
+        for name, files in self.files.lists():
+            for file in files:
+                file.seek(0)
+        return self.form, self.files
+
+    def close(self):
+        if isinstance(self._part, UploadedFile):
+            self._part.close()
+        for name, files in self.files.lists():
+            for file in files:
+                file.close()
+
+    def feed(self, chunk):
+        buffer = self._buffer
+        buffer += chunk
+        delimiter = self.delimiter
+        while True:
+            if self._state == 'preamble':
+                index = buffer.find(delimiter)
+                if index < 0:
+                    del buffer[:max(len(buffer) - len(delimiter), 0)]
+                    return
+                del buffer[:index + len(delimiter)]
+                self._state = 'delimiter'
+            if self._state == 'delimiter':
+                if len(buffer) < 2:
+                    return
+                if buffer[:2] == b'--':
+                    self._state = 'done'
+                    return
+                if buffer[:2] != b'\r\n':
+                    raise MultipartError('Invalid multipart boundary.')
+                del buffer[:2]
+                self._state = 'headers'
+            if self._state == 'headers':
+                index = buffer.find(b'\r\n\r\n')
+                if index < 0:
+                    if len(buffer) > self.max_header_size:
+                        raise MultipartLimit('Multipart part headers are too large.')
+                    return
+                self._start_part(bytes(buffer[:index]).decode('utf-8', 'replace'))
+                del buffer[:index + 4]
+                self._state = 'body'
+            if self._state == 'body':
+                index = buffer.find(delimiter)
+                if index < 0:
+                    safe = len(buffer) - len(delimiter) + 1
+                    if safe > 0:
+                        self._write(bytes(buffer[:safe]))
+                        del buffer[:safe]
+                    return
+                self._write(bytes(buffer[:index]))
+                self._finish_part()
+                del buffer[:index + len(delimiter)]
+                self._state = 'delimiter'
+
+    def _start_part(self, head):
+        headers = {}
+        for line in head.split('\r\n'):
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        disposition, params = parse_header(headers.get('content-disposition', ''))
+        if disposition != 'form-data' or 'name' not in params:
+            raise MultipartError('Multipart part without a form-data name.')
+        self._fields += 1
+        if self._fields > self.max_fields:
+            raise MultipartLimit('Too many multipart fields.')
+        if 'filename' in params:
+            self._part = UploadedFile(params['name'], params['filename'], headers.get('content-type', 'application/octet-stream'))
+        else:
+            self._part = (params['name'], bytearray())
+
+    def _write(self, data):
+        if isinstance(self._part, UploadedFile):
+            self._part.write(data)
+            return
+        self._memory_size += len(data)
+        if self._memory_size > self.max_memory_size:
+            raise MultipartLimit('Multipart fields are too large.')
+        self._part[1].extend(data)
+
+    def _finish_part(self):
+        if isinstance(self._part, UploadedFile):
+            self.files.add(self._part.name, self._part)
+        else:
+            name, value = self._part
+            self.form.add(name, value.decode('utf-8', 'replace'))
+        self._part = None
+
+
+def parse_header(value):
+    main = value.split(';', 1)[0]
+    params = {}
+    for match in HEADER_PARAM.finditer(value):
+        param = match.group(2).strip()
+        if len(param) >= 2 and param[0] == param[-1] == '"':
+            param = re.sub(r'\\(.)', r'\1', param[1:-1])
+        params[match.group(1).lower()] = param
+    return main.strip().lower(), params
@@ -1,46 +1,221 @@
+from inspect import iscoroutinefunction
+
 from .request import Request
+from .asgi_request import AsgiRequest
 from .response import Response
+from .router import Router, RouteIndex, param_positions, bind_params
+from .graph import Graph
+from .pool import Pool
 from .exceptions import BadLink, BadHandle
 
 
 class Node(object):
 
+    http_method = None
+    http_path = None
+    plan_cache_size = 1024
+    dedupe_nodes = False
+    pool_size = 0
+
     def __init__(self):
         self.nodes = []
+        self._router = None
+        self.frozen = False
+        self.graph = None
+        self.pool = None
+        self._routed = True
+        self.instrumentation = None
+        self._plans = {}
+        self._async_plans = {}
 
     def __call__(self, env, start_response):
-        request = Request(env)
-        response = self.submit(request)
-        return response.wsgi(start_response)
+        if not self.frozen:
+            self.compile()
+        pool = self.pool
+        request = Request(env) if pool is None else pool.request(env)
+        response = Response() if pool is None else pool.response()
+        for node, params in self._route.match(env.get('REQUEST_METHOD'), env.get('PATH_INFO')):
+            if params is not None:
+                request.params = dict(params)
+            try:
+                response = self.submit(request, response)
+            except Response as r:
+                response = r.with_traceback(None)
+        body = response.wsgi(start_response, env)
+        if pool is not None:
+            pool.release(request, response)
+        return body
+
+    async def asgi(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] == 'websocket':
+            return await self._reject_websocket(receive, send)
+        if scope['type'] != 'http':
+            return
+        if not self.frozen:
+            self.compile()
+        request = AsgiRequest(scope, receive)
+        response = Response()
+        for node, params in self._route.match(scope['method'], scope['path']):
+            if params is not None:
+                request.params = dict(params)
+            try:
+                response = await self.submit_async(request, response)
+            except Response as r:
+                response = r.with_traceback(None)
+        await response.asgi(send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.compile()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _reject_websocket(self, receive, send):
+        message = await receive()
+        if message['type'] == 'websocket.connect':
+            await send({'type': 'websocket.close', 'code': 1000})
 
     def link(self, node):
         if not isinstance(node, Node):
             raise TypeError('A node can only link to node instances.')
         if node is self:
             raise BadLink('A node cannot link to itself.')
+        if self.frozen:
+            raise BadLink('A compiled node cannot link to other nodes.')
         self.nodes.append(node)
-        self._validate_path(self)
+        self._router = None
 
-    def _validate_path(self, start_node):
+    @property
+    def router(self):
+        if self._router is None:
+            self._router = Router(self.nodes)
+        return self._router
+
+    def compile(self):
+        if not self.frozen:
+            self.graph = Graph(self)
+            self.graph.prune()
+            if self.dedupe_nodes:
+                self.graph.dedupe()
+            if self.pool_size:
+                self.pool = Pool(self.pool_size)
+            index = RouteIndex(node.http_path for node in self.graph.nodes if node.http_path is not None)
+            for node in self.graph.order:
+                node._freeze(index)
+        return self
+
+    def _freeze(self, index):
+        if not self.frozen:
+            self._index = index
+            self._routed = self.router.routed or any(node._routed for node in self.nodes)
+            self._route = Router([self])
+            self._plans = {}
+            self._async_plans = {}
+            self.frozen = True
+
+    def instrument(self, instrumentation):
+        self.instrumentation = instrumentation
+        self._plans = {}
+        self._async_plans = {}
         for node in self.nodes:
-            if node is start_node:
-                raise BadLink('A node link must not form a path to itself.')
-            node._validate_path(start_node)
+            node.instrument(instrumentation)
+
+    def plan(self, method, path, asynchronous=False):
+        steps = []
+        self._extend_plan(steps, None, method, path, asynchronous, False)
+        return steps
+
+    def _extend_plan(self, steps, params, method, path, asynchronous, opaque=True):
+        position = len(steps)
+        steps.append(None)
+        cls = type(self)
+        if opaque and asynchronous and cls.submit_async is not Node.submit_async:
+            call, awaited, end = self.submit_async, True, position + 1
+        elif opaque and cls.submit is not Node.submit:
+            call, awaited, end = self.submit, False, position + 1
+        else:
+            for node, node_params in self.router.match(method, path):
+                binder = None if node_params is None else param_positions(node.http_path)
+                node._extend_plan(steps, binder, method, path, asynchronous)
+            call, awaited, end = self.handle, iscoroutinefunction(self.handle), len(steps)
+            if awaited and not asynchronous:
+                raise BadHandle('Async node handles can only run through the asgi entry point.')
+        if self.instrumentation is not None:
+            call = self.instrumentation.wrap(self, call, awaited)
+        steps[position] = (call, params, position + 1, end, awaited)
+
+    def _cached_plan(self, request, asynchronous):
+        method = request.env.get('REQUEST_METHOD')
+        path = request.env.get('PATH_INFO')
+        if not self.frozen:
+            return self.plan(method, path, asynchronous)
+        plans = self._async_plans if asynchronous else self._plans
+        key = (method, self._index.key(path)) if self._routed else None
+        plan = plans.get(key)
+        if plan is None:
+            plan = self.plan(method, path, asynchronous)
+            if len(plans) < self.plan_cache_size:
+                plans[key] = plan
+        return plan
 
     def submit(self, request, response=None):
         if response is None:
             response = Response()
-        try:
-            response = self.handle(request, response)
-            bounce = False
-        except Response as r:
-            response = r
-            bounce = True
-        if not isinstance(response, Response):
-            raise BadHandle('Node handle did not return or raise a response.')
-        if not bounce:
-            for node in self.nodes:
-                response = node.submit(request, response)
+        return self._walk(self._cached_plan(request, False), 0, request, response)
+
+    def _walk(self, plan, index, request, response):
+        end = len(plan)
+        while index < end:
+            call, params, success, bounce, awaited = plan[index]
+            if params is not None:
+                request.params = bind_params(params, request.env.get('PATH_INFO'))
+            try:
+                response = call(request, response)
+            except Response as r:
+                response = r.with_traceback(None)
+                index = bounce
+                continue
+            if not isinstance(response, Response):
+                raise BadHandle('Node handle did not return or raise a response.')
+            if response.halted:
+                response = response._resume()
+                index = bounce
+                continue
+            index = success
+        return response
+
+    async def submit_async(self, request, response=None):
+        if response is None:
+            response = Response()
+        return await self._walk_async(self._cached_plan(request, True), 0, request, response)
+
+    async def _walk_async(self, plan, index, request, response):
+        end = len(plan)
+        while index < end:
+            call, params, success, bounce, awaited = plan[index]
+            if params is not None:
+                request.params = bind_params(params, request.env.get('PATH_INFO'))
+            try:
+                response = call(request, response)
+                if awaited:
+                    response = await response
+            except Response as r:
+                response = r.with_traceback(None)
+                index = bounce
+                continue
+            if not isinstance(response, Response):
+                raise BadHandle('Node handle did not return or raise a response.')
+            if response.halted:
+                response = response._resume()
+                index = bounce
+                continue
+            index = success
         return response
 
     def handle(self, request, response):
@@ -0,0 +1,158 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+import asyncio
+
+from .node import Node
+from .response import Response
+from .exceptions import BadHandle
+
+
+class Parallel(Node):
+
+    def __init__(self, merge=None, timeout=None, max_workers=None, executor=None):
+        super().__init__()
+        self.merge = merge or merge_responses
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self._executor = executor
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='vertx-parallel')
+        return self._executor
+
+    def submit(self, request, response=None):
+        if response is None:
+            response = Response()
+        response = checked(self.handle(request, response))
+        children = self._children(request)
+        if children and has_unread_body(request):
+            request.body
+        futures = [self.executor.submit(self._run, node, params, request, response.copy()) for node, params in children]
+        done, pending = wait(futures, self.timeout, FIRST_EXCEPTION)
+        return self._join(response, done, pending, [future.result for future in futures])
+
+    async def submit_async(self, request, response=None):
+        if response is None:
+            response = Response()
+        response = self.handle(request, response)
+        if asyncio.iscoroutine(response):
+            response = await response
+        response = checked(response)
+        children = self._children(request)
+        if children and has_unread_body(request):
+            await request.read()
+        tasks = [asyncio.ensure_future(self._run_async(node, params, request, response.copy())) for node, params in children]
+        done, pending = set(), set()
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=self.timeout, return_when=asyncio.FIRST_EXCEPTION)
+        return self._join(response, done, pending, [task.result for task in tasks])
+
+    def _children(self, request):
+        return self.router.match(request.env.get('REQUEST_METHOD'), request.env.get('PATH_INFO'))
+
+    def _join(self, response, done, pending, results):
+        for future in pending:
+            future.cancel()
+        errors = [future.exception() for future in done if future.exception() is not None]
+        for error in errors:
+            if isinstance(error, Bounce):
+                raise error.response
+        if errors:
+            raise errors[0]
+        if pending:
+            raise timeout_response()
+        return self.merge(response, [result() for result in results])
+
+    def _run(self, node, params, request, response):
+        request = request.copy()
+        if params is not None:
+            request.params = dict(params)
+        try:
+            if type(node).submit is not Node.submit:
+                return bounced(node.submit(request, response))
+        except Response as r:
+            raise Bounce(r)
+        plan = node._cached_plan(request, False)
+        try:
+            response = plan[0][0](request, response)
+        except Response as r:
+            raise Bounce(r)
+        return node._walk(plan, 1, request, bounced(response))
+
+    async def _run_async(self, node, params, request, response):
+        request = request.copy()
+        if params is not None:
+            request.params = dict(params)
+        cls = type(node)
+        try:
+            if cls.submit_async is not Node.submit_async:
+                return bounced(await node.submit_async(request, response))
+            if cls.submit is not Node.submit:
+                return bounced(node.submit(request, response))
+        except Response as r:
+            raise Bounce(r)
+        plan = node._cached_plan(request, True)
+        call, _, _, _, awaited = plan[0]
+        try:
+            response = call(request, response)
+            if awaited:
+                response = await response
+        except Response as r:
+            raise Bounce(r)
+        return await node._walk_async(plan, 1, request, bounced(response))
+
+
+class Bounce(Exception):
+
+    def __init__(self, response):
+        super().__init__(response)
+        self.response = response
+
+
+def has_unread_body(request):
+    return request._body is None and bool(request.content_length or 'HTTP_TRANSFER_ENCODING' in request.env)
+
+
+def checked(response):
+    if not isinstance(response, Response):
+        raise BadHandle('Node handle did not return or raise a response.')
+    if response.halted:
+        raise response._resume()
+    return response
+
+
+def bounced(response):
+    try:
+        return checked(response)
+    except Response as r:
+        raise Bounce(r)
+
+
+def timeout_response():
+    response = Response()
+    response.status = 504
+    return response
+
+
+def merge_responses(response, results):
+    if response.frozen:
+        response = response.copy()
+    status = response.status
+    body = body_state(response)
+    headers = response.headers.to_normalized_dict()
+    cookies = len(response.cookies)
+    for result in results:
+        if result.status != status:
+            response.status = result.status
+        if any(a is not b for a, b in zip(body_state(result), body)):
+            response._body, response._stream, response._file, response._file_parts = body_state(result)
+        for name, value in result.headers.list():
+            if headers.get(name.lower()) != value:
+                response.headers[name] = value
+        response.cookies.extend(result.cookies[cookies:])
+    return response
+
+
+def body_state(response):
+    return (response._body, response._stream, response._file, response._file_parts)
@@ -0,0 +1,50 @@
+from sys import getrefcount
+
+from .request import Request
+from .response import Response
+
+
+class Pool(object):
+
+    def __init__(self, size):
+        self.size = size
+        self.requests = []
+        self.responses = []
+        self.reused = 0
+        self.discarded = 0
+        self.references = calibrate(self)
+
+    def request(self, env):
+        try:
+            request = self.requests.pop()
+        except IndexError:
+            return Request(env)
+        request.env = env
+        self.reused += 1
+        return request
+
+    def response(self):
+        try:
+            return self.responses.pop()
+        except IndexError:
+            return Response()
+
+    def release(self, request, response):
+        response.with_traceback(None)
+        if type(request) is Request and getrefcount(request) <= self.references and len(self.requests) < self.size:
+            request.__init__(None)
+            self.requests.append(request)
+        else:
+            self.discarded += 1
+        if type(response) is Response and getrefcount(response) <= self.references and len(self.responses) < self.size:
+            response.__init__()
+            response.__context__ = None
+            self.responses.append(response)
+
+    def _references(self, request, response):
+        return getrefcount(request)
+
+
+def calibrate(pool):
+    request = Request(None)
+    return pool._references(request, None)
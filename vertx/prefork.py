@@ -0,0 +1,85 @@
+from time import perf_counter
+import gc
+import mimetypes
+import os
+
+from .node import Node
+from .request import Request
+from .response import Response
+from .router import is_static
+from .exceptions import BadHandle
+
+
+def warm_up(app, freeze=True):
+    start = perf_counter()
+    plans = 0
+    if isinstance(app, Node):
+        app.compile()
+        plans = warm_plans(app)
+    mimetypes.init()
+    request = Request({
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': '/', 'QUERY_STRING': 'a=1', 'wsgi.url_scheme': 'http',
+        'HTTP_HOST': 'localhost', 'HTTP_COOKIE': 'vertx=1',
+    })
+    request.cookies, request.query, request.headers.get('Accept'), request.url
+    response = Response()
+    response.status = 200
+    response.set_cookie('vertx', '1')
+    response.json({})
+    response.wsgi(lambda status, headers: None)
+    gc.collect()
+    if freeze:
+        gc.freeze()
+    return {'seconds': perf_counter() - start, 'plans': plans, 'frozen': gc.get_freeze_count(), 'memory': memory()}
+
+
+def warm_plans(app):
+    count = 0
+    for node in app.graph.nodes:
+        if node.http_path is None or not is_static(node.http_path):
+            continue
+        method = (node.http_method or 'GET').upper()
+        try:
+            app._cached_plan(Request({'REQUEST_METHOD': method, 'PATH_INFO': node.http_path}), False)
+        except BadHandle:
+            continue
+        count += 1
+    return count
+
+
+def memory():
+    usage = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                if name in ('Rss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty'):
+                    usage[name.lower()] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    if 'rss' not in usage:
+        try:
+            import resource
+        except ImportError:
+            return usage
+        usage['max_rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return usage
+
+
+def format_memory(usage):
+    return ', '.join('{} {:.1f}MB'.format(name, value / 1024 ** 2) for name, value in sorted(usage.items()))
+
+
+def when_ready(server):
+    report = warm_up(server.app.wsgi())
+    server.log.info('vertx warm up: %.1fms, %d plans, %d objects frozen, %s', report['seconds'] * 1e3,
+                    report['plans'], report['frozen'], format_memory(report['memory']))
+
+
+def post_fork(server, worker):
+    worker.vertx_forked = perf_counter()
+
+
+def post_worker_init(worker):
+    boot = perf_counter() - getattr(worker, 'vertx_forked', perf_counter())
+    worker.log.info('vertx worker %d booted in %.1fms, %s', os.getpid(), boot * 1e3, format_memory(memory()))
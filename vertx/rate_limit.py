@@ -0,0 +1,104 @@
+from functools import lru_cache
+from hashlib import blake2b
+from math import ceil
+from struct import Struct
+from tempfile import TemporaryFile
+from threading import Lock
+from time import time
+import mmap
+import os
+
+from .node import Node
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+SLOT = Struct('<Qdd')
+
+
+class RateLimit(Node):
+
+    def __init__(self, rate, per=1.0, burst=None, key=None, table=None):
+        super().__init__()
+        self.rate = rate / per
+        self.burst = burst or rate
+        self.key = key or client_ip
+        self.table = table or SharedTable()
+
+    def handle(self, request, response):
+        retry_after = self.table.take(self.key(request), self.rate, self.burst)
+        if retry_after:
+            response.status = 429
+            response.headers['Retry-After'] = str(max(1, ceil(retry_after)))
+            raise response
+        return response
+
+
+class SharedTable(object):
+
+    def __init__(self, slots=65536, path=None, probes=8):
+        self.slots = slots
+        self.probes = min(probes, slots)
+        size = slots * SLOT.size
+        if path is None:
+            self.file = TemporaryFile()
+        else:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            self.file = os.fdopen(fd, 'r+b')
+        if os.fstat(self.file.fileno()).st_size < size:
+            self.file.truncate(size)
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self._fd = self.file.fileno()
+        self._window = self.probes * SLOT.size
+        self._lock = Lock()
+
+    def take(self, key, rate, burst, cost=1):
+        digest = key_digest(key)
+        start = digest % (self.slots - self.probes + 1) * SLOT.size
+        now = time()
+        with self._lock:
+            if fcntl is not None:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, self._window, start)
+            try:
+                offset, tokens = self._find(digest, start, burst, rate, now)
+                if tokens >= cost:
+                    SLOT.pack_into(self.map, offset, digest, tokens - cost, now)
+                    return 0
+                SLOT.pack_into(self.map, offset, digest, tokens, now)
+                return (cost - tokens) / rate
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN, self._window, start)
+
+    def _find(self, digest, start, burst, rate, now):
+        oldest, oldest_offset = None, start
+        for offset in range(start, start + self._window, SLOT.size):
+            slot_digest, tokens, updated = SLOT.unpack_from(self.map, offset)
+            if slot_digest == digest:
+                return offset, min(burst, tokens + max(0.0, now - updated) * rate)
+            if slot_digest == 0:
+                return offset, burst
+            if oldest is None or updated < oldest:
+                oldest, oldest_offset = updated, offset
+        return oldest_offset, burst
+
+    def clear(self):
+        with self._lock:
+            self.map[:] = bytes(len(self.map))
+
+    def close(self):
+        with self._lock:
+            self.map.close()
+            self.file.close()
+
+
+@lru_cache(maxsize=4096)
+def key_digest(key):
+    return int.from_bytes(blake2b(str(key).encode('utf-8'), digest_size=8).digest(), 'little') or 1
+
+
+def client_ip(request):
+    return request.ip
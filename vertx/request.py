@@ -1,17 +1,58 @@
+from functools import lru_cache
 from http.cookies import SimpleCookie
+from ipaddress import ip_address, ip_network
+from tempfile import SpooledTemporaryFile
 from urllib.parse import parse_qsl
 
-from .case_insensitive_dict import CaseInsensitiveDict
+from . import json_codec
+from .cookies import unsign
+from .headers import EnvironHeaders
+from .multi_dict import MultiDict
+from .multipart import MultipartParser, MultipartError, MultipartLimit, parse_header
+from .response import Response
+
+
+UNSET = object()
 
 
 class Request(object):
 
+    __slots__ = (
+        'env', 'params', '_headers', '_body', '_spool', '_query', '_form', '_files', '_json', '_cookies',
+        '_forwarded', '_scheme', '_host', '_url', '_base_url', '_ip',
+    )
+
+    max_body_size = None
+    body_chunk_size = 64 * 1024
+    spool_size = 1024 ** 2
+    max_form_fields = 1000
+    max_form_memory_size = 1024 ** 2
+    trusted_proxies = None
+
     def __init__(self, env):
         self.env = env
+        self.params = {}
         self._headers = None
         self._body = None
+        self._spool = None
         self._query = None
+        self._form = None
+        self._files = None
+        self._json = UNSET
         self._cookies = None
+        self._forwarded = None
+        self._scheme = None
+        self._host = None
+        self._url = None
+        self._base_url = None
+        self._ip = None
+
+    def copy(self):
+        request = type(self).__new__(type(self))
+        for name in slot_names(type(self)):
+            setattr(request, name, getattr(self, name))
+        request.params = dict(self.params)
+        return request
 
     def __str__(self):
         return self.to_str()
@@ -31,22 +72,39 @@ class Request(object):
 
     @property
     def url(self):
-        url = self.scheme + '://' + self.host + self.path
-        if self.query_string:
-            url += '?' + self.query_string
-        return url
+        if self._url is None:
+            url = self.base_url + self.path
+            if self.query_string:
+                url += '?' + self.query_string
+            self._url = url
+        return self._url
 
     @property
     def base_url(self):
-        return self.scheme + '://' + self.host
+        if self._base_url is None:
+            self._base_url = self.scheme + '://' + self.host
+        return self._base_url
 
     @property
     def scheme(self):
-        return self.env['wsgi.url_scheme']
+        if self._scheme is None:
+            self._scheme = self.forwarded.get('proto') or self.env['wsgi.url_scheme']
+        return self._scheme
 
     @property
     def host(self):
-        return self.env['HTTP_HOST']
+        if self._host is None:
+            self._host = self.forwarded.get('host') or self.env['HTTP_HOST']
+        return self._host
+
+    @property
+    def forwarded(self):
+        if self._forwarded is None:
+            if self.trusted_proxies is None:
+                self._forwarded = {}
+            else:
+                self._forwarded = resolve_forwarded(self.env, self.trusted_proxies)
+        return self._forwarded
 
     @property
     def path(self):
@@ -59,17 +117,44 @@ class Request(object):
     @property
     def query(self):
         if self._query is None:
-            self._query = dict(parse_qsl(self.query_string, keep_blank_values=True))
+            self._query = parse_pairs(self.query_string, self.max_form_fields)
         return self._query
 
+    @property
+    def form(self):
+        if self._form is None:
+            self._parse_form()
+        return self._form
+
+    @property
+    def files(self):
+        if self._files is None:
+            self._parse_form()
+        return self._files
+
+    def _parse_form(self):
+        content_type, params = parse_header(self.env.get('CONTENT_TYPE', ''))
+        self._form, self._files = MultiDict(), MultiDict()
+        if content_type == 'application/x-www-form-urlencoded':
+            body = bytearray()
+            for chunk in self._chunks():
+                body += chunk
+                if len(body) > self.max_form_memory_size:
+                    raise status_response(413)
+            self._form = parse_pairs(body.decode('utf-8', 'replace'), self.max_form_fields)
+        elif content_type == 'multipart/form-data' and params.get('boundary'):
+            parser = MultipartParser(params['boundary'], self.max_form_fields, self.max_form_memory_size)
+            try:
+                self._form, self._files = parser.parse(self._chunks())
+            except MultipartLimit:
+                raise status_response(413)
+            except MultipartError:
+                raise status_response(400)
+
     @property
     def headers(self):
         if self._headers is None:
-            self._headers = CaseInsensitiveDict()
-            for key, value in self.env.items():
-                if key.startswith('HTTP_'):
-                    new_key = key[5:].lower().replace('_', '-')
-                    self._headers[new_key] = value
+            self._headers = EnvironHeaders(self.env)
         return self._headers
 
     @property
@@ -84,18 +169,86 @@ class Request(object):
                 self._cookies = {}
         return self._cookies
 
+    def signed_cookie(self, key, secret, max_age=None):
+        value = self.cookies.get(key)
+        if value is None:
+            return None
+        return unsign(value, secret, max_age)
+
     @property
     def body(self):
         if self._body is None:
-            self._body = self.env['wsgi.input'].read()
+            self._body = b''.join(self.stream())
         return self._body
 
     @property
-    def ip(self):
+    def json(self):
+        if self._json is UNSET:
+            try:
+                self._json = json_codec.loads(self.body)
+            except ValueError:
+                raise status_response(400)
+        return self._json
+
+    @property
+    def content_length(self):
+        length = self.env.get('CONTENT_LENGTH')
+        if not length:
+            return None
         try:
-            return self.env['HTTP_X_FORWARDED_FOR'].split(',')[0].strip()
-        except KeyError:
-            return self.env['REMOTE_ADDR']
+            return int(length)
+        except ValueError:
+            raise status_response(400)
+
+    def stream(self, chunk_size=None, max_body_size=None):
+        if self._body is not None:
+            yield self._body
+            return
+        chunk_size = chunk_size or self.body_chunk_size
+        max_body_size = self.max_body_size if max_body_size is None else max_body_size
+        length = self.content_length
+        check_body_size(length, max_body_size)
+        input = self.env['wsgi.input']
+        if length is None:
+            received = 0
+            while True:
+                chunk = input.read(chunk_size)
+                if not chunk:
+                    return
+                received += len(chunk)
+                check_body_size(received, max_body_size)
+                yield chunk
+        while length > 0:
+            chunk = input.read(min(chunk_size, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+    def _chunks(self, max_body_size=None):
+        return self.stream(max_body_size=max_body_size)
+
+    def spool(self, spool_size=None, max_body_size=None):
+        if self._spool is None:
+            spool = SpooledTemporaryFile(max_size=self.spool_size if spool_size is None else spool_size)
+            try:
+                for chunk in self._chunks(max_body_size):
+                    spool.write(chunk)
+            except BaseException:
+                spool.close()
+                raise
+            spool.seek(0)
+            self._spool = spool
+        return self._spool
+
+    @property
+    def ip(self):
+        if self._ip is None:
+            if self.trusted_proxies is None and 'HTTP_X_FORWARDED_FOR' in self.env:
+                self._ip = self.env['HTTP_X_FORWARDED_FOR'].split(',')[0].strip()
+            else:
+                self._ip = self.forwarded.get('for') or self.env['REMOTE_ADDR']
+        return self._ip
 
     @property
     def referer(self):
@@ -104,3 +257,78 @@ class Request(object):
     @property
     def user_agent(self):
         return self.env.get('HTTP_USER_AGENT')
+
+
+@lru_cache(maxsize=None)
+def slot_names(cls):
+    return tuple(name for klass in cls.__mro__ for name in getattr(klass, '__slots__', ()))
+
+
+def parse_pairs(string, max_fields):
+    try:
+        return MultiDict(parse_qsl(string, keep_blank_values=True, max_num_fields=max_fields))
+    except ValueError:
+        raise status_response(400)
+
+
+def check_body_size(size, max_body_size):
+    if max_body_size is not None and size is not None and size > max_body_size:
+        raise status_response(413)
+
+
+def resolve_forwarded(env, trusted_proxies):
+    if not is_trusted(env.get('REMOTE_ADDR'), trusted_proxies):
+        return {}
+    if 'HTTP_FORWARDED' in env:
+        hops = parse_forwarded_header(env['HTTP_FORWARDED'])
+    else:
+        hops = [{'for': address.strip()} for address in env.get('HTTP_X_FORWARDED_FOR', '').split(',') if address.strip()]
+    edge = {}
+    for edge in reversed(hops):
+        if not is_trusted(edge.get('for'), trusted_proxies):
+            break
+    forwarded = {key: edge[key] for key in ('proto', 'host') if key in edge}
+    if 'for' in edge and not is_trusted(edge['for'], trusted_proxies):
+        forwarded['for'] = edge['for']
+    if 'HTTP_FORWARDED' not in env:
+        for key in ('proto', 'host'):
+            value = env.get('HTTP_X_FORWARDED_' + key.upper(), '').split(',')[-1].strip()
+            if value:
+                forwarded[key] = value
+    return forwarded
+
+
+def parse_forwarded_header(header):
+    hops = []
+    for element in header.split(','):
+        hop = {}
+        for pair in element.split(';'):
+            key, _, value = pair.strip().partition('=')
+            value = value.strip().strip('"')
+            if key.lower() == 'for' and value.startswith('['):
+                value = value[1:value.find(']')]
+            elif key.lower() == 'for' and value.count(':') == 1:
+                value = value.split(':')[0]
+            if value:
+                hop[key.lower()] = value
+        hops.append(hop)
+    return hops
+
+
+def is_trusted(address, trusted_proxies):
+    try:
+        address = ip_address(address)
+    except ValueError:
+        return False
+    return any(address in network for network in proxy_networks(tuple(trusted_proxies)))
+
+
+@lru_cache(maxsize=16)
+def proxy_networks(proxies):
+    return tuple(ip_network(proxy, strict=False) for proxy in proxies)
+
+
+def status_response(status):
+    response = Response()
+    response.status = status
+    return response
@@ -1,20 +1,34 @@
-from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
+import asyncio
 from http.client import responses as STATUS_MESSAGES
-from http.cookies import SimpleCookie
 import mimetypes
 import os
+import uuid
 
-from .case_insensitive_dict import CaseInsensitiveDict
+from . import json_codec
+from .cookies import serialize, format_expires, sign
+from .headers import Headers
+
+
+STATUS_LINES = {status: '{} {}'.format(status, message) for status, message in STATUS_MESSAGES.items()}
+
+UNSET_EXPIRES = '=; Expires=Thu, 01 Jan 1970 00:00:00 GMT'
 
 
 class Response(BaseException):
 
+    file_chunk_size = 1024 ** 2
+    frozen = False
+
     def __init__(self):
         self.status = 404
-        self.headers = CaseInsensitiveDict()
+        self.halted = False
+        self.headers = Headers()
         self.cookies = []
         self._body = b''
+        self._stream = None
         self._file = None
+        self._file_parts = None
 
     def __str__(self):
         return self.to_str()
@@ -28,29 +42,125 @@ class Response(BaseException):
         bytes = len(self._body)
         return '<{}:{}h:{}b>'.format(cls, headers, bytes)
 
+    def copy(self):
+        response = type(self).__new__(type(self))
+        response.__dict__.update(self.__dict__)
+        response.headers = self.headers.copy()
+        response.cookies = list(self.cookies)
+        return response
+
+    def halt(self):
+        self.halted = True
+        return self
+
+    def _resume(self):
+        self.halted = False
+        return self
+
+    def freeze(self):
+        return FrozenResponse(self)
+
     @property
     def body(self):
+        if self._stream is not None:
+            return self._stream
         return self._body
 
     @body.setter
     def body(self, value):
+        self._file = None
+        self._file_parts = None
+        if is_stream(value):
+            self._stream = value
+            self._body = b''
+            return
         if type(value) is not bytes:
             value = str(value).encode('utf-8')
+        self._stream = None
         self._body = value
 
-    def file(self, path, type=None, download=False, name=None):
+    @property
+    def streamed(self):
+        return self._stream is not None or self._file is not None
+
+    def json(self, value):
+        self.headers['Content-Type'] = 'application/json'
+        self.body = json_codec.dumps(value)
+        return self
+
+    def json_stream(self, items):
+        self.headers['Content-Type'] = 'application/json'
+        self.body = json_codec.iter_array(items)
+        return self
+
+    def chunks(self):
+        if self._file:
+            return read_file(self._file, self._file_parts, self.file_chunk_size)
+        if self._stream is not None:
+            return encode_stream(self._stream)
+        return iter((self._body,))
+
+    def file(self, path, type=None, download=False, name=None, request=None):
+        stat = os.stat(path)
         self._file = path
+        self._file_parts = None
         if type is None:
             type, _ = mimetypes.guess_type(path)
-        self.headers['Content-Type'] = type or 'application/octet-stream'
+        type = type or 'application/octet-stream'
+        etag = '"{:x}-{:x}"'.format(stat.st_mtime_ns, stat.st_size)
+        last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.headers['Content-Type'] = type
         self.headers['Content-Disposition'] = 'attachment' if download else 'inline'
         self.headers['Content-Disposition'] += '; filename="{}"'.format(name or os.path.basename(path))
-        self.headers['Content-Length'] = str(os.stat(path).st_size)
+        self.headers['Content-Length'] = str(stat.st_size)
+        self.headers['ETag'] = etag
+        self.headers['Last-Modified'] = last_modified
+        self.headers['Accept-Ranges'] = 'bytes'
+        if request is None:
+            return
+        self.status = 200
+        if not_modified(request.env, etag, stat.st_mtime):
+            self.status = 304
+            self._file = None
+            self._body = b''
+            del self.headers['Content-Length']
+            return
+        range_header = request.env.get('HTTP_RANGE')
+        if_range = request.env.get('HTTP_IF_RANGE')
+        if range_header and (not if_range or if_range in (etag, last_modified)):
+            ranges = parse_ranges(range_header, stat.st_size)
+            if ranges is not None:
+                self._set_ranges(ranges, type, stat.st_size)
+
+    def _set_ranges(self, ranges, type, size):
+        if not ranges:
+            self.status = 416
+            self._file = None
+            self._body = b''
+            self.headers['Content-Range'] = 'bytes */{}'.format(size)
+            del self.headers['Content-Length']
+            return
+        self.status = 206
+        if len(ranges) == 1:
+            start, stop = ranges[0]
+            self._file_parts = [(b'', start, stop)]
+            self.headers['Content-Range'] = 'bytes {}-{}/{}'.format(start, stop - 1, size)
+            self.headers['Content-Length'] = str(stop - start)
+            return
+        boundary = uuid.uuid4().hex
+        self._file_parts = []
+        for start, stop in ranges:
+            head = '\r\n--{}\r\nContent-Type: {}\r\nContent-Range: bytes {}-{}/{}\r\n\r\n'
+            head = head.format(boundary, type, start, stop - 1, size).encode('latin-1')
+            self._file_parts.append((head, start, stop))
+        self._file_parts.append(('\r\n--{}--\r\n'.format(boundary).encode('latin-1'), 0, 0))
+        self.headers['Content-Type'] = 'multipart/byteranges; boundary=' + boundary
+        self.headers['Content-Length'] = str(sum(len(head) + stop - start for head, start, stop in self._file_parts))
 
     def set_cookie(self, key, value, expires=None, domain=None, path=None, secure=False, http_only=True, same_site=True):
-        cookie = SimpleCookie({key: value}).get(key).OutputString()
+        cookie = serialize(key, value)
         if expires:
-            cookie += '; Expires=' + expires.strftime('%a, %d %b %Y %T') + ' GMT'
+            cookie += '; Expires=' + format_expires(expires)
         if domain:
             cookie += '; Domain=' + domain
         if path:
@@ -63,25 +173,68 @@ class Response(BaseException):
             cookie += '; SameSite=Strict'
         self.cookies.append(cookie)
 
+    def set_signed_cookie(self, key, value, secret, **kwargs):
+        self.set_cookie(key, sign(value, secret), **kwargs)
+
     def unset_cookie(self, key, domain=None, path=None):
-        cookie = key + '=; Expires=' + datetime(1970, 1, 1).strftime('%a, %d %b %Y %T') + ' GMT'
+        cookie = key + UNSET_EXPIRES
         if domain:
             cookie += '; Domain=' + domain
         if path:
             cookie += '; Path=' + path
         self.cookies.append(cookie)
 
-    def wsgi(self, start_respose):
+    def wsgi(self, start_respose, env=None):
         start_respose(self._wsgi_status(), self._wsgi_headers())
         if self._file:
-            return self._wsgi_file()
+            if env and 'wsgi.file_wrapper' in env and self._file_parts is None:
+                return env['wsgi.file_wrapper'](open(self._file, 'rb'), self.file_chunk_size)
+            return read_file(self._file, self._file_parts, self.file_chunk_size)
+        if self._stream is not None:
+            return encode_stream(self._stream)
         return self._wsgi_body()
 
+    async def asgi(self, send):
+        await send({'type': 'http.response.start', 'status': self.status, 'headers': self._asgi_headers()})
+        if self._file:
+            await self._asgi_file(send)
+        elif self._stream is not None:
+            await self._asgi_stream(send)
+        else:
+            await send({'type': 'http.response.body', 'body': self.body})
+
+    def _asgi_headers(self):
+        return [(key.encode('latin-1'), value.encode('latin-1')) for key, value in self._wsgi_headers()]
+
+    async def _asgi_file(self, send):
+        loop = asyncio.get_running_loop()
+        chunks = read_file(self._file, self._file_parts, self.file_chunk_size)
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                break
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def _asgi_stream(self, send):
+        if hasattr(self._stream, '__anext__'):
+            async for chunk in self._stream:
+                await send({'type': 'http.response.body', 'body': encode_chunk(chunk), 'more_body': True})
+        else:
+            for chunk in encode_stream(self._stream):
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
     def _wsgi_status(self):
-        return str(self.status) + ' ' + STATUS_MESSAGES.get(self.status, '')
+        try:
+            return STATUS_LINES[self.status]
+        except KeyError:
+            return str(self.status) + ' ' + STATUS_MESSAGES.get(self.status, '')
 
     def _wsgi_headers(self):
-        headers = list(self.headers.items())
+        if not self.cookies:
+            return self.headers.list()
+        headers = list(self.headers.list())
         for cookie in self.cookies:
             headers.append(('Set-Cookie', cookie))
         return headers
@@ -89,11 +242,183 @@ class Response(BaseException):
     def _wsgi_body(self):
         return (self.body,)
 
-    def _wsgi_file(self):
-        with open(self._file, 'rb') as f:
-            mbyte = 1024 ** 2
+
+class FrozenResponse(Response):
+
+    frozen = True
+
+    def __init__(self, response):
+        if response.streamed:
+            raise ValueError('Streamed responses cannot be frozen.')
+        state = vars(self)
+        state.update(vars(response))
+        state['halted'] = False
+        state['headers'] = FrozenHeaders(response.headers)
+        state['cookies'] = tuple(response.cookies)
+        header_list = list(self.headers.list())
+        if self.status >= 200 and self.status not in (204, 304) and 'Content-Length' not in self.headers:
+            header_list.append(('Content-Length', str(len(self._body))))
+        header_list.extend(('Set-Cookie', cookie) for cookie in self.cookies)
+        state['_status_line'] = Response._wsgi_status(self)
+        state['_header_list'] = header_list
+        state['_body_chunks'] = (self._body,)
+        state['_asgi_start'] = {'type': 'http.response.start', 'status': self.status, 'headers': self._asgi_headers()}
+        state['_asgi_body'] = {'type': 'http.response.body', 'body': self._body}
+        state['_resumed'] = self
+        halted = FrozenResponse.__new__(FrozenResponse)
+        vars(halted).update(state, halted=True)
+        state['_halted'] = vars(halted)['_halted'] = halted
+
+    def __setattr__(self, name, value):
+        raise TypeError('A frozen response cannot be changed, copy() it first.')
+
+    def copy(self):
+        response = Response()
+        response.status = self.status
+        response.headers = self.headers.copy()
+        response.cookies = list(self.cookies)
+        response.body = self._body
+        return response
+
+    def freeze(self):
+        return self
+
+    def halt(self):
+        return self._halted
+
+    def _resume(self):
+        return self._resumed
+
+    def set_cookie(self, *args, **kwargs):
+        raise TypeError('A frozen response cannot be changed, copy() it first.')
+
+    def set_signed_cookie(self, *args, **kwargs):
+        raise TypeError('A frozen response cannot be changed, copy() it first.')
+
+    def unset_cookie(self, *args, **kwargs):
+        raise TypeError('A frozen response cannot be changed, copy() it first.')
+
+    def wsgi(self, start_respose, env=None):
+        start_respose(self._status_line, list(self._header_list))
+        return self._body_chunks
+
+    async def asgi(self, send):
+        await send(self._asgi_start)
+        await send(self._asgi_body)
+
+    def _wsgi_status(self):
+        return self._status_line
+
+    def _wsgi_headers(self):
+        return list(self._header_list)
+
+
+class FrozenHeaders(Headers):
+
+    __slots__ = ()
+
+    def __init__(self, headers):
+        self._items = list(headers.list())
+        self._values = headers.to_normalized_dict()
+
+    def __setitem__(self, key, value):
+        raise TypeError('Frozen headers cannot be changed.')
+
+    def __delitem__(self, key):
+        raise TypeError('Frozen headers cannot be changed.')
+
+    def add(self, key, value):
+        raise TypeError('Frozen headers cannot be changed.')
+
+    def pop(self, key, *default):
+        raise TypeError('Frozen headers cannot be changed.')
+
+    def setdefault(self, key, default=None):
+        raise TypeError('Frozen headers cannot be changed.')
+
+    def update(self, data=(), **kwargs):
+        raise TypeError('Frozen headers cannot be changed.')
+
+
+def encode_chunk(chunk):
+    if type(chunk) is bytes:
+        return chunk
+    return str(chunk).encode('utf-8')
+
+
+def is_stream(value):
+    if isinstance(value, (str, bytes, bytearray, memoryview, dict)):
+        return False
+    return hasattr(value, '__iter__') or hasattr(value, '__anext__')
+
+
+def encode_stream(stream):
+    try:
+        for chunk in stream:
+            yield encode_chunk(chunk)
+    finally:
+        close = getattr(stream, 'close', None)
+        if close is not None:
+            close()
+
+
+def read_file(path, parts, chunk_size):
+    with open(path, 'rb', buffering=0) as f:
+        if parts is None:
             while True:
-                chunk = f.read(mbyte)
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+            return
+        for head, start, stop in parts:
+            if head:
+                yield head
+            f.seek(start)
+            remaining = stop - start
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
                 if not chunk:
                     break
+                remaining -= len(chunk)
                 yield chunk
+
+
+def not_modified(env, etag, mtime):
+    if_none_match = env.get('HTTP_IF_NONE_MATCH')
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or etag in tags or 'W/' + etag in tags
+    if_modified_since = env.get('HTTP_IF_MODIFIED_SINCE')
+    if if_modified_since is not None:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def parse_ranges(header, size):
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes':
+        return None
+    ranges = []
+    for part in spec.split(','):
+        first, dash, last = part.strip().partition('-')
+        if not dash:
+            return None
+        try:
+            if first:
+                start = int(first)
+                if last and int(last) < start:
+                    return None
+                stop = int(last) + 1 if last else size
+            else:
+                start = max(size - int(last), 0)
+                stop = size if int(last) else 0
+        except ValueError:
+            return None
+        stop = min(stop, size)
+        if start < stop:
+            ranges.append((start, stop))
+    return ranges
@@ -0,0 +1,121 @@
+from functools import lru_cache
+
+
+class Router(object):
+
+    def __init__(self, nodes):
+        self.nodes = [(node, None) for node in nodes]
+        self.routed = False
+        self.any_path = {}
+        self.static = {}
+        self.tree = RouteTree()
+        for index, node in enumerate(nodes):
+            method = node.http_method.upper() if node.http_method else None
+            path = node.http_path
+            if method is not None or path is not None:
+                self.routed = True
+            if path is None:
+                self.any_path.setdefault(method, []).append((index, node, None))
+            elif is_static(path):
+                self.static.setdefault((method, path), []).append((index, node, {}))
+            else:
+                self.tree.insert(split_path(path), (index, node, method, param_names(path)))
+
+    def match(self, method, path):
+        if not self.routed:
+            return self.nodes
+        path = path or ''
+        methods = ('HEAD', 'GET', None) if method == 'HEAD' else (method, None)
+        matches = []
+        for key in methods:
+            matches.extend(self.any_path.get(key, ()))
+            matches.extend(self.static.get((key, path), ()))
+        if not self.tree.empty():
+            for (index, node, node_method, names), values in self.tree.search(split_path(path)):
+                if node_method in methods:
+                    matches.append((index, node, dict(zip(names, values))))
+        matches.sort(key=lambda match: match[0])
+        return [(node, params) for index, node, params in matches]
+
+
+class RouteIndex(object):
+
+    key_cache_size = 4096
+
+    def __init__(self, paths):
+        self.key = lru_cache(self.key_cache_size)(self._key)
+        self.static = set()
+        self.tree = RouteTree()
+        for path in set(paths):
+            if is_static(path):
+                self.static.add(path)
+            else:
+                self.tree.insert(split_path(path), path)
+
+    def _key(self, path):
+        path = path or ''
+        static = path if path in self.static else None
+        if self.tree.empty():
+            return (static,)
+        return (static,) + tuple(sorted(pattern for pattern, values in self.tree.search(split_path(path))))
+
+
+class RouteTree(object):
+
+    def __init__(self):
+        self.children = {}
+        self.param = None
+        self.entries = []
+
+    def empty(self):
+        return not self.children and self.param is None
+
+    def insert(self, segments, entry):
+        tree = self
+        for segment in segments:
+            if is_param(segment):
+                if tree.param is None:
+                    tree.param = RouteTree()
+                tree = tree.param
+            else:
+                tree = tree.children.setdefault(segment, RouteTree())
+        tree.entries.append(entry)
+
+    def search(self, segments, position=0, values=()):
+        if position == len(segments):
+            return [(entry, values) for entry in self.entries]
+        found = []
+        segment = segments[position]
+        child = self.children.get(segment)
+        if child is not None:
+            found.extend(child.search(segments, position + 1, values))
+        if self.param is not None and segment:
+            found.extend(self.param.search(segments, position + 1, values + (segment,)))
+        return found
+
+
+def split_path(path):
+    return path.split('/')
+
+
+def is_param(segment):
+    return segment.startswith('{') and segment.endswith('}')
+
+
+def is_static(path):
+    return not any(is_param(segment) for segment in split_path(path))
+
+
+def param_names(path):
+    return [segment[1:-1] for segment in split_path(path) if is_param(segment)]
+
+
+def param_positions(path):
+    return tuple((segment[1:-1], position) for position, segment in enumerate(split_path(path)) if is_param(segment))
+
+
+def bind_params(params, path):
+    if not params:
+        return {}
+    segments = split_path(path or '')
+    return {name: segments[position] for name, position in params}
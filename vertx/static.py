@@ -0,0 +1,171 @@
+from collections import OrderedDict
+from email.utils import formatdate
+from threading import Lock
+from time import monotonic
+import mimetypes
+import os
+
+from .node import Node
+from .compress import parse_accept_encoding, vary
+from .response import not_modified
+
+
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+
+class StaticFiles(Node):
+
+    def __init__(self, directory, prefix='/', index='index.html', max_size=256 * 1024, cache_size=32 * 1024 ** 2,
+                 max_entries=4096, check_interval=None):
+        super().__init__()
+        self.directory = os.path.realpath(directory)
+        self.prefix = prefix if prefix.endswith('/') else prefix + '/'
+        self.index = index
+        self.max_size = max_size
+        self.cache_size = cache_size
+        self.max_entries = max_entries
+        self.check_interval = check_interval
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def handle(self, request, response):
+        method = request.env.get('REQUEST_METHOD')
+        path = request.env.get('PATH_INFO', '')
+        if method not in ('GET', 'HEAD') or not path.startswith(self.prefix):
+            return response
+        entry = self.lookup(path[len(self.prefix):])
+        if entry is None:
+            return response
+        variant = entry
+        if entry.variants and 'HTTP_RANGE' not in request.env:
+            accepted = parse_accept_encoding(request.env.get('HTTP_ACCEPT_ENCODING', ''))
+            for encoding, candidate in entry.variants:
+                if accepted.get(encoding, accepted.get('*', 0)) > 0:
+                    variant = candidate
+                    break
+        response.headers.update(variant.headers)
+        if entry.variants:
+            vary(response, 'Accept-Encoding')
+        if not_modified(request.env, variant.etag, entry.mtime):
+            response.status = 304
+            del response.headers['Content-Length']
+            return response
+        if variant is entry and 'HTTP_RANGE' in request.env:
+            response.file(entry.path, entry.type, request=request)
+            del response.headers['Content-Disposition']
+        else:
+            response.status = 200
+            if method == 'HEAD':
+                response.body = b''
+            elif variant.body is not None:
+                response.body = variant.body
+            else:
+                response.body = b''
+                response._file = variant.path
+        return response
+
+    def lookup(self, relative):
+        with self._lock:
+            entry = self._entries.get(relative)
+            if entry is not None:
+                self._entries.move_to_end(relative)
+        if entry is not None and (self.check_interval is None or monotonic() - entry.checked < self.check_interval):
+            return entry
+        path = self.resolve(relative)
+        if path is None:
+            self._remove(relative)
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._remove(relative)
+            return None
+        if entry is not None and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+            entry.checked = monotonic()
+            return entry
+        entry = self._load(path, stat)
+        self._store(relative, entry)
+        return entry
+
+    def resolve(self, relative):
+        if '\0' in relative or '\\' in relative or '..' in relative.split('/'):
+            return None
+        path = os.path.realpath(os.path.join(self.directory, relative))
+        if path != self.directory and not path.startswith(self.directory + os.sep):
+            return None
+        if os.path.isdir(path):
+            if not self.index:
+                return None
+            path = os.path.join(path, self.index)
+        if not os.path.isfile(path):
+            return None
+        return path
+
+    def _load(self, path, stat):
+        type, _ = mimetypes.guess_type(path)
+        entry = StaticFile(path, stat, type or 'application/octet-stream', None, self._read(path, stat))
+        for encoding, suffix in PRECOMPRESSED:
+            try:
+                variant_stat = os.stat(path + suffix)
+            except OSError:
+                continue
+            if variant_stat.st_mtime_ns >= stat.st_mtime_ns:
+                body = self._read(path + suffix, variant_stat)
+                entry.variants.append((encoding, StaticFile(path + suffix, variant_stat, entry.type, encoding, body, stat)))
+        return entry
+
+    def _read(self, path, stat):
+        if stat.st_size > self.max_size:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, relative, entry):
+        with self._lock:
+            old = self._entries.pop(relative, None)
+            if old is not None:
+                self.size -= old.cached_size
+            self._entries[relative] = entry
+            self.size += entry.cached_size
+            while len(self._entries) > self.max_entries or (self.size > self.cache_size and len(self._entries) > 1):
+                key, old = self._entries.popitem(last=False)
+                self.size -= old.cached_size
+
+    def _remove(self, relative):
+        with self._lock:
+            old = self._entries.pop(relative, None)
+            if old is not None:
+                self.size -= old.cached_size
+
+
+class StaticFile(object):
+
+    def __init__(self, path, stat, type, encoding, body, original_stat=None):
+        original_stat = original_stat or stat
+        self.path = path
+        self.type = type
+        self.body = body
+        self.mtime = original_stat.st_mtime
+        self.mtime_ns = original_stat.st_mtime_ns
+        self.size = original_stat.st_size
+        self.checked = monotonic()
+        self.variants = []
+        self.etag = '"{:x}-{:x}"'.format(stat.st_mtime_ns, stat.st_size)
+        self.headers = [
+            ('Content-Type', type),
+            ('Content-Length', str(stat.st_size)),
+            ('ETag', self.etag),
+            ('Last-Modified', formatdate(original_stat.st_mtime, usegmt=True)),
+        ]
+        if encoding is None:
+            self.headers.append(('Accept-Ranges', 'bytes'))
+        else:
+            self.headers.append(('Content-Encoding', encoding))
+
+    @property
+    def cached_size(self):
+        return len(self.body or b'') + sum(len(variant.body or b'') for encoding, variant in self.variants)